@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+AlteronOS AOSFS Metadata Catalog
+SQLite (WAL) mirror of AOSFS metadata with indexed queries
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+DEFAULT_CATALOG_PATH = Path.home() / '.alteronos' / 'cache' / 'aosfs_catalog.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path      TEXT PRIMARY KEY,
+    parent    TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    type      TEXT NOT NULL,
+    size      INTEGER NOT NULL DEFAULT 0,
+    mtime     REAL NOT NULL,
+    owner     TEXT NOT NULL,
+    extension TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_entries_parent ON entries(parent);
+CREATE INDEX IF NOT EXISTS idx_entries_ext_size ON entries(extension, size);
+CREATE INDEX IF NOT EXISTS idx_entries_mtime ON entries(mtime);
+CREATE INDEX IF NOT EXISTS idx_entries_owner ON entries(owner);
+"""
+
+COLUMNS = ('path', 'parent', 'name', 'type', 'size', 'mtime', 'owner', 'extension')
+
+ORDERINGS = {
+    'path': 'path',
+    'size': 'size DESC',
+    'mtime': 'mtime DESC',
+    'name': 'name'
+}
+
+
+def normalize_path(path: str) -> str:
+    """Normalize an AOSFS path to A:\\... form without a trailing separator"""
+    path = path.replace('/', '\\')
+    if len(path) > 3:
+        path = path.rstrip('\\')
+    return path
+
+
+def split_path(path: str):
+    """Return (parent, name) for a normalized AOSFS path"""
+    if '\\' not in path:
+        return '', path
+    parent, name = path.rsplit('\\', 1)
+    if parent.endswith(':'):
+        parent += '\\'
+    return parent, name
+
+
+class AOSFSCatalog:
+    def __init__(self, catalog_path=None):
+        self.catalog_path = str(catalog_path or DEFAULT_CATALOG_PATH)
+        if self.catalog_path != ':memory:':
+            Path(self.catalog_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.catalog_path, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.in_transaction = False
+
+    @contextmanager
+    def transaction(self):
+        """Run catalog updates atomically with the mutation they mirror"""
+        with self.lock:
+            if self.in_transaction:
+                # Nested use joins the outer transaction
+                yield self
+                return
+
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.in_transaction = True
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            finally:
+                self.in_transaction = False
+
+    def record(self, path: str, entry_type: str = 'file', size: int = 0,
+               mtime: Optional[float] = None, owner: str = 'system') -> Dict[str, Any]:
+        """Insert or update a single entry"""
+        path = normalize_path(path)
+        parent, name = split_path(path)
+        extension = os.path.splitext(name)[1].lower() if entry_type == 'file' else ''
+        row = (path, parent, name, entry_type, size,
+               time.time() if mtime is None else mtime, owner, extension)
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO entries (path, parent, name, type, size, mtime, owner, extension) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET size=excluded.size, mtime=excluded.mtime, "
+                "owner=excluded.owner, type=excluded.type, extension=excluded.extension",
+                row
+            )
+        return dict(zip(COLUMNS, row))
+
+    def remove(self, path: str, recursive: bool = False) -> int:
+        """Remove an entry (and optionally everything below it)"""
+        path = normalize_path(path)
+        with self.lock:
+            count = self.conn.execute("DELETE FROM entries WHERE path = ?", (path,)).rowcount
+            if recursive:
+                low, high = self.subtree_bounds(path)
+                count += self.conn.execute(
+                    "DELETE FROM entries WHERE path >= ? AND path < ?", (low, high)
+                ).rowcount
+        return count
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Look up a single entry by path"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM entries WHERE path = ?", (normalize_path(path),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def subtree_bounds(self, path: str):
+        """Primary-key range covering everything below path"""
+        prefix = path if path.endswith('\\') else path + '\\'
+        # ']' sorts right after '\\', so [prefix, prefix[:-1] + ']') is the subtree
+        return prefix, prefix[:-1] + ']'
+
+    def query(self, under: Optional[str] = None, parent: Optional[str] = None,
+              extension: Optional[str] = None, entry_type: Optional[str] = None,
+              min_size: Optional[int] = None, max_size: Optional[int] = None,
+              modified_after: Optional[float] = None, modified_before: Optional[float] = None,
+              owner: Optional[str] = None, name_like: Optional[str] = None,
+              order_by: str = 'path', limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Query catalog entries using the secondary indexes"""
+        clauses = []
+        params = []
+
+        if under:
+            low, high = self.subtree_bounds(normalize_path(under))
+            clauses.append("path >= ? AND path < ?")
+            params.extend([low, high])
+        if parent:
+            clauses.append("parent = ?")
+            params.append(normalize_path(parent))
+        if extension:
+            ext = extension.lower()
+            clauses.append("extension = ?")
+            params.append(ext if ext.startswith('.') else '.' + ext)
+        if entry_type:
+            clauses.append("type = ?")
+            params.append(entry_type)
+        if min_size is not None:
+            clauses.append("size >= ?")
+            params.append(min_size)
+        if max_size is not None:
+            clauses.append("size <= ?")
+            params.append(max_size)
+        if modified_after is not None:
+            clauses.append("mtime >= ?")
+            params.append(modified_after)
+        if modified_before is not None:
+            clauses.append("mtime < ?")
+            params.append(modified_before)
+        if owner:
+            clauses.append("owner = ?")
+            params.append(owner)
+        if name_like:
+            clauses.append("name LIKE ?")
+            params.append(name_like.replace('*', '%').replace('?', '_'))
+
+        sql = "SELECT * FROM entries"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY " + ORDERINGS.get(order_by, 'path')
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get catalog statistics"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE type = 'file'"
+            ).fetchone()
+            dirs = self.conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE type = 'dir'"
+            ).fetchone()[0]
+        return {
+            "catalog_path": self.catalog_path,
+            "files": row[0],
+            "directories": dirs,
+            "total_size": row[1]
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# Shell helpers for `query key=value ...`
+SIZE_UNITS = {'': 1, 'b': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+AGE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes like 512, 4K, 1M, 2G"""
+    text = text.strip().lower()
+    unit = text[-1] if text and text[-1] in SIZE_UNITS else ''
+    number = text[:-1] if unit else text
+    return int(float(number) * SIZE_UNITS[unit])
+
+
+def parse_age(text: str) -> float:
+    """Parse ages like 30m, 12h, 7d, 1w into seconds"""
+    text = text.strip().lower()
+    unit = text[-1] if text and text[-1] in AGE_UNITS else 's'
+    number = text[:-1] if text[-1:] in AGE_UNITS else text
+    return float(number) * AGE_UNITS[unit]
+
+
+def parse_query_args(args: List[str]) -> Dict[str, Any]:
+    """Turn shell `key=value` arguments into query() keyword arguments"""
+    now = time.time()
+    options = {}
+
+    for arg in args:
+        if '=' not in arg:
+            raise ValueError(f"Expected key=value, got: {arg}")
+        key, value = arg.split('=', 1)
+
+        if key == 'under':
+            options['under'] = value
+        elif key == 'in':
+            options['parent'] = value
+        elif key in ('ext', 'extension'):
+            options['extension'] = value
+        elif key == 'type':
+            options['entry_type'] = value
+        elif key == 'min_size':
+            options['min_size'] = parse_size(value)
+        elif key == 'max_size':
+            options['max_size'] = parse_size(value)
+        elif key == 'since':
+            options['modified_after'] = now - parse_age(value)
+        elif key == 'before':
+            options['modified_before'] = now - parse_age(value)
+        elif key == 'owner':
+            options['owner'] = value
+        elif key == 'name':
+            options['name_like'] = value
+        elif key == 'sort':
+            options['order_by'] = value
+        elif key == 'limit':
+            options['limit'] = int(value)
+        else:
+            raise ValueError(f"Unknown query option: {key}")
+
+    return options
@@ -7,18 +7,38 @@ With universal .txt support and native workers
 import ctypes
 import os
 import sys
+import time
 from pathlib import Path
 from typing import List, Dict, Any
+from fs_catalog import AOSFSCatalog, parse_query_args
+from native_workers import NativeWorkerManager
+
+# Kernel metrics registry when running under the kernel
+try:
+    from metrics import REGISTRY
+    AOSFS_OPS = REGISTRY.counter('alteron_aosfs_ops_total', 'AOSFS operations by type and outcome',
+                                 ('op', 'result'))
+except ImportError:
+    AOSFS_OPS = None
+
+def count_op(op: str, success: bool = True):
+    if AOSFS_OPS is not None:
+        AOSFS_OPS.labels(op, 'ok' if success else 'error').inc()
 
 class EnhancedAOSFSManager:
-    def __init__(self):
+    def __init__(self, catalog_path=None, workers=None):
         self.mounted = False
-        self.native_workers = {}
+        # Shared with the kernel so its health checks and reloads cover AOSFS workers too
+        self.workers = workers if workers is not None else NativeWorkerManager()
         self.txt_files_supported = True
         self.protected_paths = [
             "A:\\Alteron\\System.dir",
             "A:\\Alteron\\Config.dir"
         ]
+        self.owner = os.getenv('USER', 'alteron')
+        
+        # Metadata catalog mirrors every mutation
+        self.catalog = AOSFSCatalog(catalog_path)
         
         self.load_workers()
         self.initialize_filesystem()
@@ -35,13 +55,12 @@ class EnhancedAOSFSManager:
         }
         
         for name, (lib_path, init_func) in workers.items():
-            try:
-                worker_lib = ctypes.CDLL(lib_path)
-                getattr(worker_lib, init_func)()
-                self.native_workers[name] = worker_lib
-                print(f"  ✅ {name} worker loaded")
-            except Exception as e:
-                print(f"  ⚠️ {name} worker failed: {e}")
+            worker = self.workers.register(f'aosfs_{name}', lib_path, init=init_func,
+                                           restypes={'read_text_file': ctypes.c_void_p})
+            if worker.state == 'healthy':
+                print(f"  ✅ {name} worker loaded ({worker.version})")
+            else:
+                print(f"  ⚠️ {name} worker failed: {worker.last_error}")
                 
     def initialize_filesystem(self):
         """Initialize enhanced AOSFS"""
@@ -61,11 +80,9 @@ class EnhancedAOSFSManager:
         print(f"  📌 Mounting at {mount_point}")
         
         # Use C worker for low-level mounting
-        if 'c' in self.native_workers:
-            result = self.native_workers['c'].mount_aosfs(mount_point.encode())
-            return result == 0
-            
-        return True  # Fallback
+        result = self.workers.call('aosfs_c', 'mount_aosfs', mount_point.encode(),
+                                   fallback=lambda: 0, ok=lambda code: code == 0)
+        return result == 0
         
     def create_system_structure(self):
         """Create protected system structure"""
@@ -133,15 +150,19 @@ App Launcher: Universal Launcher"""
             
         print(f"  ✏️ Creating: {filepath}")
         
-        # Use Rust worker for safe file creation
-        if 'rust' in self.native_workers:
-            result = self.native_workers['rust'].create_text_file(
-                filepath.encode(), content.encode()
-            )
-            return result == 0
-            
-        print(f"    Content: {content[:50]}{'...' if len(content) > 50 else ''}")
-        return True
+        with self.catalog.transaction():
+            # Use Rust worker for safe file creation
+            result = self.workers.call('aosfs_rust', 'create_text_file',
+                                       filepath.encode(), content.encode(),
+                                       fallback=lambda: self.fallback_write("Content", content),
+                                       ok=lambda code: code == 0)
+            success = result == 0
+                
+            if success:
+                self.catalog.record(filepath, 'file', len(content.encode()), owner=self.owner)
+                
+        count_op('create', success)
+        return success
         
     def read_text_file(self, filepath: str) -> str:
         """Read text file with error handling"""
@@ -149,14 +170,14 @@ App Launcher: Universal Launcher"""
             filepath += '.txt'
             
         print(f"  📖 Reading: {filepath}")
+        count_op('read')
         
         # Use Rust worker for safe reading
-        if 'rust' in self.native_workers:
-            content_ptr = self.native_workers['rust'].read_text_file(filepath.encode())
-            if content_ptr:
-                content = ctypes.string_at(content_ptr).decode()
-                return content
-                
+        content = self.workers.call('aosfs_rust', 'read_text_file', filepath.encode(),
+                                    ok=bool, convert=lambda ptr: ctypes.string_at(ptr).decode())
+        if content is not None:
+            return content
+            
         # Fallback content
         fallback_content = {
             "readme.txt": "Welcome to AlteronOS!",
@@ -174,20 +195,30 @@ App Launcher: Universal Launcher"""
             
         print(f"  📝 Editing: {filepath}")
         
-        # Use Rust worker for safe writing
-        if 'rust' in self.native_workers:
-            result = self.native_workers['rust'].write_text_file(
-                filepath.encode(), new_content.encode()
-            )
-            return result == 0
-            
-        print(f"    New content: {new_content[:50]}{'...' if len(new_content) > 50 else ''}")
-        return True
+        with self.catalog.transaction():
+            # Use Rust worker for safe writing
+            result = self.workers.call('aosfs_rust', 'write_text_file',
+                                       filepath.encode(), new_content.encode(),
+                                       fallback=lambda: self.fallback_write("New content", new_content),
+                                       ok=lambda code: code == 0)
+            success = result == 0
+                
+            if success:
+                self.catalog.record(filepath, 'file', len(new_content.encode()), owner=self.owner)
+                
+        count_op('edit', success)
+        return success
+        
+    def fallback_write(self, label: str, content: str) -> int:
+        """Python path when the Rust worker is missing or unhealthy"""
+        print(f"    {label}: {content[:50]}{'...' if len(content) > 50 else ''}")
+        return 0
         
     # Enhanced filesystem operations
     def ls(self, path: str = "A:\\Alteron") -> List[str]:
         """Enhanced directory listing"""
         print(f"Enhanced AOSFS: ls {path}")
+        count_op('ls')
         
         items = [
             "System.dir/",
@@ -207,14 +238,19 @@ App Launcher: Universal Launcher"""
         """Create directory with protection check"""
         if not path.endswith('.dir'):
             print(f"❌ Error: Folders must have .dir extension: {path}")
+            count_op('mkdir', False)
             return False
             
         # Check if path is protected
         if any(path.startswith(protected) for protected in self.protected_paths):
             print(f"❌ Error: Cannot modify protected system path: {path}")
+            count_op('mkdir', False)
             return False
             
         print(f"  📁 Creating: {path}")
+        with self.catalog.transaction():
+            self.catalog.record(path, 'dir', owner=self.owner)
+        count_op('mkdir')
         return True
         
     def cat(self, filepath: str) -> str:
@@ -224,6 +260,7 @@ App Launcher: Universal Launcher"""
     def find(self, pattern: str) -> List[str]:
         """Find files with .txt support"""
         print(f"Enhanced AOSFS: find {pattern}")
+        count_op('find')
         
         all_files = [
             "System.dir/version.txt",
@@ -234,6 +271,11 @@ App Launcher: Universal Launcher"""
         
         return [f for f in all_files if pattern in f]
         
+    def query(self, **filters) -> List[Dict[str, Any]]:
+        """Indexed metadata query (see AOSFSCatalog.query for filters)"""
+        count_op('query')
+        return self.catalog.query(**filters)
+        
     def get_fs_info(self) -> Dict[str, Any]:
         """Get filesystem information"""
         return {
@@ -241,8 +283,9 @@ App Launcher: Universal Launcher"""
             "mounted": self.mounted,
             "txt_support": self.txt_files_supported,
             "protected_paths": self.protected_paths,
-            "native_workers": list(self.native_workers.keys()),
-            "features": ["txt_auto_extension", "protected_system", "native_performance"]
+            "native_workers": self.workers.status(),
+            "catalog": self.catalog.stats(),
+            "features": ["txt_auto_extension", "protected_system", "native_performance", "metadata_catalog"]
         }
 
 # Enhanced shell with .txt support
@@ -287,6 +330,7 @@ class EnhancedAlteronShell:
             'find': lambda: print('\n'.join(self.fs.find(args[0]))) if args else print("Usage: find <pattern>"),
             'edit': lambda: self.edit_file(args),
             'create': lambda: self.create_text_file(args),
+            'query': lambda: self.query_catalog(args),
             'fsinfo': lambda: self.show_fs_info(),
             'help': self.show_enhanced_help,
             'exit': lambda: setattr(self, 'running', False)
@@ -329,6 +373,22 @@ class EnhancedAlteronShell:
         content = ' '.join(args[1:]) if len(args) > 1 else ""
         self.fs.create_text_file(filename, content)
         
+    def query_catalog(self, args):
+        """Query the metadata catalog"""
+        try:
+            filters = parse_query_args(args)
+        except ValueError as e:
+            print(f"❌ {e}")
+            print("Usage: query [under=<dir>] [in=<dir>] [ext=.txt] [type=file|dir] [min_size=1M] "
+                  "[max_size=..] [since=7d] [before=..] [owner=..] [name=*.txt] [sort=path|size|mtime] [limit=N]")
+            return
+            
+        results = self.fs.query(**filters)
+        for entry in results:
+            modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['mtime']))
+            print(f"  {entry['type']:4} {entry['size']:>10} {modified} {entry['owner']:10} {entry['path']}")
+        print(f"{len(results)} result(s)")
+        
     def show_fs_info(self):
         """Show filesystem information"""
         info = self.fs.get_fs_info()
@@ -347,6 +407,8 @@ Enhanced AlteronOS Shell Commands:
   edit <file>    - Edit .txt file content
   create <file> [content] - Create .txt with content
   find <pattern> - Find files
+  query [key=value ...] - Indexed metadata query, e.g.
+                   query under=A:\\Alteron\\Users.dir ext=.txt min_size=1M since=7d
   pwd           - Print working directory
   fsinfo        - Show filesystem information
   help          - Show this help
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Native Workers
+Health-tracked ctypes workers with hot reload and Python fallbacks
+"""
+
+import ctypes
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional
+
+try:
+    from _ctypes import dlclose
+except ImportError:
+    dlclose = None
+
+SHADOW_DIR = Path.home() / '.alteronos' / 'cache' / 'workers'
+
+# Optional exports a worker may provide
+VERSION_SYMBOL = 'worker_version'
+HEALTH_SYMBOL = 'worker_health'
+
+
+def file_stamp(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class NativeWorker:
+    def __init__(self, name: str, lib_path: str, init_symbols=(), restypes=None,
+                 window: int = 50, min_calls: int = 10, max_error_rate: float = 0.5):
+        self.name = name
+        self.lib_path = os.path.abspath(lib_path)
+        self.init_symbols = list(init_symbols)
+        self.restypes = dict(restypes or {})
+        self.min_calls = min_calls
+        self.max_error_rate = max_error_rate
+
+        self.lib = None
+        self.shadow_path = None
+        self.stamp = None
+        self.failed_stamp = None
+        self.version = None
+        self.generation = 0
+        self.state = 'unloaded'
+        self.unhealthy_since = None
+        self.last_error = None
+        self.functions: Dict[str, Any] = {}
+
+        self.calls = 0
+        self.errors = 0
+        self.fallbacks = 0
+        self.outcomes = deque(maxlen=window)
+        self.inflight = 0
+        self.cond = threading.Condition()
+
+    # Loading
+    def open_library(self):
+        """dlopen a private copy so a rebuilt file never aliases the mapped one"""
+        stamp = file_stamp(self.lib_path)
+        if stamp is None:
+            raise OSError(f"{self.lib_path} not found")
+        SHADOW_DIR.mkdir(parents=True, exist_ok=True)
+        # Unique per worker and generation: overwriting a mapped library crashes the process
+        shadow = SHADOW_DIR / f"{self.name}.{os.getpid()}.{self.generation + 1}.so"
+        shutil.copy2(self.lib_path, shadow)
+        lib = None
+        try:
+            lib = ctypes.CDLL(str(shadow))
+            for symbol in self.init_symbols:
+                getattr(lib, symbol)()
+        except Exception:
+            if lib is not None:
+                self.release(lib, None)
+            shadow.unlink(missing_ok=True)
+            raise
+        return lib, str(shadow), stamp
+
+    def read_version(self, lib, stamp) -> str:
+        func = getattr(lib, VERSION_SYMBOL, None)
+        if func is not None:
+            func.restype = ctypes.c_char_p
+            value = func()
+            if value:
+                return value.decode(errors='replace')
+        return time.strftime('build-%Y%m%d-%H%M%S', time.localtime(stamp[3] / 1e9))
+
+    def load(self) -> bool:
+        """Load or hot-swap the library; in-flight calls drain first"""
+        try:
+            lib, shadow, stamp = self.open_library()
+        except Exception as e:
+            self.last_error = str(e)
+            # check() leaves this build alone until the file changes again
+            self.failed_stamp = file_stamp(self.lib_path)
+            if self.lib is None:
+                self.state = 'unavailable'
+            return False
+
+        with self.cond:
+            previous_state = self.state
+            # New calls take the fallback while the old library drains
+            self.state = 'draining'
+            while self.inflight:
+                self.cond.wait()
+            old_lib, old_shadow = self.lib, self.shadow_path
+            self.lib, self.shadow_path, self.stamp = lib, shadow, stamp
+            self.functions = {}
+            self.generation += 1
+            self.version = self.read_version(lib, stamp)
+            self.outcomes.clear()
+            self.last_error = None
+            self.state = 'healthy'
+
+        if old_lib is not None:
+            self.release(old_lib, old_shadow)
+            print(f"🔁 {self.name} worker reloaded (generation {self.generation}, {self.version})")
+        elif previous_state == 'unavailable':
+            print(f"✅ {self.name} worker loaded")
+        return True
+
+    def release(self, lib, shadow):
+        if dlclose is not None:
+            try:
+                dlclose(lib._handle)
+            except OSError:
+                pass
+        if shadow:
+            Path(shadow).unlink(missing_ok=True)
+
+    def add_init(self, symbol: str) -> bool:
+        """Run an extra init export now and after every reload"""
+        if symbol in self.init_symbols:
+            return True
+        self.init_symbols.append(symbol)
+        if self.lib is None:
+            return False
+        try:
+            getattr(self.lib, symbol)()
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+
+    def stale(self) -> bool:
+        """The file on disk differs from the loaded build"""
+        stamp = file_stamp(self.lib_path)
+        return stamp is not None and stamp != self.stamp
+
+    def needs_load(self) -> bool:
+        """A build is on disk that is neither loaded nor known to fail"""
+        stamp = file_stamp(self.lib_path)
+        return stamp is not None and stamp != self.stamp and stamp != self.failed_stamp
+
+    # Calls
+    def function(self, symbol: str):
+        func = self.functions.get(symbol)
+        if func is None:
+            func = getattr(self.lib, symbol)
+            if symbol in self.restypes:
+                func.restype = self.restypes[symbol]
+            self.functions[symbol] = func
+        return func
+
+    def call(self, symbol: str, *args, fallback: Optional[Callable[[], Any]] = None,
+             ok: Optional[Callable[[Any], bool]] = None, convert: Optional[Callable[[Any], Any]] = None):
+        """Call a native export, or the fallback if the worker is unhealthy or the call fails"""
+        with self.cond:
+            if self.state != 'healthy':
+                self.fallbacks += 1
+                return fallback() if fallback else None
+            self.inflight += 1
+            self.calls += 1
+
+        try:
+            result = self.function(symbol)(*args)
+            success = ok(result) if ok else True
+            if success and convert:
+                # Runs before the drain completes, so returned pointers stay mapped
+                result = convert(result)
+        except Exception as e:
+            success = False
+            self.last_error = f"{symbol}: {e}"
+        finally:
+            with self.cond:
+                self.inflight -= 1
+                if not self.inflight:
+                    self.cond.notify_all()
+
+        self.record(success)
+        if success:
+            return result
+        with self.cond:
+            self.fallbacks += 1
+        return fallback() if fallback else None
+
+    def record(self, success: bool):
+        with self.cond:
+            self.outcomes.append(success)
+            if not success:
+                self.errors += 1
+                if (self.state == 'healthy' and len(self.outcomes) >= self.min_calls
+                        and self.error_rate() > self.max_error_rate):
+                    self.mark_unhealthy()
+                    print(f"⚠️ {self.name} worker unhealthy, using Python fallback")
+
+    def mark_unhealthy(self):
+        self.state = 'unhealthy'
+        self.unhealthy_since = time.monotonic()
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    # Health
+    def probe(self) -> bool:
+        """Worker's own health export if it has one, else symbol resolution"""
+        if self.lib is None:
+            return False
+        try:
+            health = getattr(self.lib, HEALTH_SYMBOL, None)
+            if health is not None:
+                return health() == 0
+            return all(hasattr(self.lib, symbol) for symbol in self.init_symbols)
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'path': self.lib_path,
+            'state': self.state,
+            'version': self.version,
+            'generation': self.generation,
+            'calls': self.calls,
+            'errors': self.errors,
+            'fallbacks': self.fallbacks,
+            'error_rate': self.error_rate(),
+            'inflight': self.inflight,
+            'stale': self.lib is not None and self.stale(),
+            'last_error': self.last_error
+        }
+
+
+class NativeWorkerManager:
+    def __init__(self, auto_reload: bool = True, retry_after: float = 30.0):
+        self.workers: Dict[str, NativeWorker] = {}
+        self.auto_reload = auto_reload
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.remove_orphan_shadows()
+
+    def remove_orphan_shadows(self):
+        """Delete library copies left behind by kernels that are no longer running"""
+        if not SHADOW_DIR.is_dir():
+            return
+        for shadow in SHADOW_DIR.glob('*.so'):
+            try:
+                pid = int(shadow.name.split('.')[-3])
+                os.kill(pid, 0)
+            except (ValueError, IndexError, ProcessLookupError):
+                shadow.unlink(missing_ok=True)
+            except PermissionError:
+                pass
+
+    def register(self, name: str, lib_path: str, init: Optional[str] = None, restypes=None) -> NativeWorker:
+        """Add and load a worker; registering a loaded name adds its init export"""
+        with self.lock:
+            worker = self.workers.get(name)
+            if worker is None:
+                worker = NativeWorker(name, lib_path, [init] if init else [], restypes)
+                self.workers[name] = worker
+                worker.load()
+                return worker
+        worker.restypes.update(restypes or {})
+        if init:
+            worker.add_init(init)
+        return worker
+
+    def available(self, name: str) -> bool:
+        worker = self.workers.get(name)
+        return worker is not None and worker.state == 'healthy'
+
+    def call(self, name: str, symbol: str, *args, fallback=None, ok=None, convert=None):
+        worker = self.workers.get(name)
+        if worker is None:
+            return fallback() if fallback else None
+        return worker.call(symbol, *args, fallback=fallback, ok=ok, convert=convert)
+
+    def reload(self, name: str) -> bool:
+        worker = self.workers.get(name)
+        return worker.load() if worker else False
+
+    def check(self):
+        """Probe every worker: pick up rebuilt or newly built libraries, recover unhealthy ones"""
+        for worker in list(self.workers.values()):
+            if ((worker.state == 'unavailable' or (self.auto_reload and worker.lib is not None))
+                    and worker.needs_load()):
+                worker.load()
+                continue
+            if worker.lib is None:
+                continue
+            healthy = worker.probe()
+            with worker.cond:
+                if worker.state == 'healthy' and not healthy:
+                    worker.mark_unhealthy()
+                    print(f"⚠️ {worker.name} worker failed health probe, using Python fallback")
+                elif (worker.state == 'unhealthy' and healthy
+                      and time.monotonic() - worker.unhealthy_since >= self.retry_after):
+                    # Give it another chance; the error window trips it again if it still fails
+                    worker.outcomes.clear()
+                    worker.state = 'healthy'
+                    print(f"✅ {worker.name} worker healthy again")
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [worker.to_dict() for worker in list(self.workers.values())]
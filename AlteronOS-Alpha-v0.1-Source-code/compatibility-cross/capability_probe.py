@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Capability Probe
+Parallel runtime checks (Wine, Darling, Proton, ...) cached across processes
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+DEFAULT_CACHE_PATH = Path.home() / '.alteronos' / 'cache' / 'capabilities.json'
+CACHE_VERSION = 1
+# A failed check (timeout, exec error) may be a slow cold start, not a missing runtime
+ERROR_TTL = 30.0
+
+PROTON_PATHS = [
+    '/usr/share/steam/compatibilitytools.d/',
+    '~/.steam/steam/compatibilitytools.d/',
+    '~/.local/share/Steam/compatibilitytools.d/'
+]
+
+
+def default_checks() -> Dict[str, tuple]:
+    """name -> ('command', argv) or ('paths', directories)"""
+    return {
+        'wine': ('command', [os.environ.get('ALTERON_WINE', 'wine'), '--version']),
+        'darling': ('command', ['darling', '--version']),
+        'proton': ('paths', PROTON_PATHS),
+        'node': ('command', ['node', '--version']),
+        'java': ('command', ['java', '-version'])
+    }
+
+
+class CapabilityProbe:
+    def __init__(self, cache_path=None, timeout: float = 5.0, max_workers: int = 8):
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.executor = None
+        self.probes_run = 0
+        self.load()
+
+    def load(self):
+        try:
+            data = json.loads(self.cache_path.read_text())
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Atomic rewrite so concurrent processes never read a partial file"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            with self.lock:
+                data = {'version': CACHE_VERSION, 'entries': dict(self.entries)}
+            tmp.write_text(json.dumps(data, indent=1))
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Capability cache not saved: {e}")
+
+    # Cache keys: anything that would change the answer
+    def key(self, spec) -> list:
+        kind, value = spec
+        if kind == 'command':
+            path = shutil.which(value[0])
+            if path is None:
+                return ['missing', value[0], os.environ.get('PATH', '')]
+            st = os.stat(path)
+            return [path, st.st_mtime_ns, st.st_size, os.environ.get('PATH', '')] + list(value[1:])
+        key = []
+        for directory in value:
+            expanded = os.path.expanduser(directory)
+            try:
+                key.append([expanded, os.stat(expanded).st_mtime_ns])
+            except OSError:
+                key.append([expanded, None])
+        return key
+
+    # Checks
+    def run_command(self, argv) -> Dict[str, Any]:
+        path = shutil.which(argv[0])
+        if path is None:
+            return {'available': False, 'error': f"{argv[0]} not found"}
+        try:
+            result = subprocess.run(argv, capture_output=True, text=True, stdin=subprocess.DEVNULL,
+                                    timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            return {'available': False, 'path': path, 'error': f"timed out after {self.timeout}s"}
+        except OSError as e:
+            return {'available': False, 'path': path, 'error': str(e)}
+        # Java prints its version on stderr
+        lines = (result.stdout.strip() or result.stderr.strip()).splitlines()
+        return {'available': result.returncode == 0, 'path': path, 'version': lines[0] if lines else None}
+
+    def scan_paths(self, directories) -> Dict[str, Any]:
+        for directory in directories:
+            expanded = Path(directory).expanduser()
+            if expanded.exists():
+                return {'available': True, 'path': str(expanded)}
+        return {'available': False}
+
+    def run_check(self, name, key, spec):
+        kind, value = spec
+        result = self.run_command(value) if kind == 'command' else self.scan_paths(value)
+        entry = {'key': key, 'result': result}
+        if result.get('error'):
+            entry['expires'] = time.time() + ERROR_TTL
+        with self.lock:
+            self.entries[name] = entry
+            self.inflight.pop(name, None)
+            self.probes_run += 1
+        return result
+
+    def probe(self, checks: Optional[Dict[str, tuple]] = None, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Results for every check; stale or missing ones run in parallel, the rest come from the cache"""
+        checks = default_checks() if checks is None else checks
+        futures = {}
+        with self.lock:
+            for name, spec in checks.items():
+                key = self.key(spec)
+                entry = self.entries.get(name)
+                if (not refresh and entry is not None and entry['key'] == key
+                        and entry.get('expires', float('inf')) > time.time()):
+                    continue
+                running = self.inflight.get(name)
+                if running is not None and running[0] == key:
+                    # Another caller is already probing this; share its answer
+                    futures[name] = running[1]
+                    continue
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                       thread_name_prefix='alteron-probe')
+                future = self.executor.submit(self.run_check, name, key, spec)
+                self.inflight[name] = (key, future)
+                futures[name] = future
+
+        for future in futures.values():
+            future.result()
+        if futures:
+            self.save()
+        return {name: self.entries[name]['result'] for name in checks}
+
+    def check(self, name: str, argv=None) -> Dict[str, Any]:
+        """One capability; argv overrides the default command (e.g. a custom wine binary)"""
+        spec = default_checks()[name]
+        if argv and list(argv) != spec[1]:
+            spec, name = ('command', list(argv)), f"{name}:{argv[0]}"
+        return self.probe({name: spec})[name]
+
+    def probe_in_background(self):
+        threading.Thread(target=self.probe, name="alteron-probe-all", daemon=True).start()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {name: entry['result'] for name, entry in self.entries.items()}
+
+
+# One per process: every compat layer instance shares its results
+PROBE = CapabilityProbe()
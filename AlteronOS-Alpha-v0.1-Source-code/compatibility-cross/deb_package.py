@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Deb Packages
+Streaming .deb installs: ar container and data.tar decompressed straight to their destinations
+"""
+
+import bz2
+import fcntl
+import json
+import lzma
+import os
+import re
+import shutil
+import stat
+import subprocess
+import tarfile
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+AR_MAGIC = b'!<arch>\n'
+AR_HEADER_SIZE = 60
+CHUNK_SIZE = 1 << 20
+DEFAULT_ROOT = '/usr/local'
+DEFAULT_DB_DIR = Path.home() / '.alteronos' / 'packages'
+# Debian policy 5.6.1; the name also becomes the lock and manifest file names
+PACKAGE_NAME = re.compile(r'^[a-z0-9][a-z0-9+.-]+$')
+
+
+class DebError(Exception):
+    pass
+
+
+def ar_members(f) -> Iterator[Tuple[str, int, int]]:
+    """(name, data offset, size) for each member of an ar archive"""
+    if f.read(len(AR_MAGIC)) != AR_MAGIC:
+        raise DebError("not an ar archive")
+    offset = len(AR_MAGIC)
+    while True:
+        f.seek(offset)
+        header = f.read(AR_HEADER_SIZE)
+        if not header:
+            return
+        if len(header) < AR_HEADER_SIZE or header[58:60] != b'`\n':
+            raise DebError(f"corrupt ar header at offset {offset}")
+        name = header[:16].decode('ascii', 'replace').rstrip().rstrip('/')
+        size = int(header[48:58])
+        yield name, offset + AR_HEADER_SIZE, size
+        # Members are 2-byte aligned
+        offset += AR_HEADER_SIZE + size + (size & 1)
+
+
+def decompressor(name: str):
+    """Incremental decompressor for an ar member, by extension; None for a plain .tar"""
+    suffix = name.rsplit('.', 1)[-1]
+    if suffix == 'tar':
+        return None
+    if suffix == 'gz':
+        return zlib.decompressobj(zlib.MAX_WBITS | 16)
+    if suffix in ('xz', 'lzma'):
+        return lzma.LZMADecompressor()
+    if suffix == 'bz2':
+        return bz2.BZ2Decompressor()
+    if suffix == 'zst':
+        if zstandard is not None:
+            return zstandard.ZstdDecompressor().decompressobj()
+        if shutil.which('zstd') is None:
+            raise DebError(f"{name} needs the zstandard module or the zstd command")
+        return None  # MemberStream pipes it through zstd -dc
+    raise DebError(f"unsupported compression: {name}")
+
+
+def zstd_command(f, name: str, size: int) -> Iterator[bytes]:
+    """Decompress the next size bytes of f with the zstd command, for when zstandard isn't installed"""
+    process = subprocess.Popen(['zstd', '-dcq'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE)
+
+    def feed():
+        # A thread of its own, or zstd's full stdout pipe and our full stdin pipe deadlock
+        try:
+            remaining = size
+            while remaining:
+                data = f.read(min(CHUNK_SIZE, remaining))
+                if not data:
+                    break  # zstd reports the truncated frame
+                remaining -= len(data)
+                process.stdin.write(data)
+        except (OSError, ValueError):
+            pass  # zstd quit early; its exit status says why
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    writer = threading.Thread(target=feed, name="alteron-zstd-feed", daemon=True)
+    writer.start()
+    try:
+        while True:
+            chunk = process.stdout.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+        writer.join()
+        if process.wait() != 0:
+            error = process.stderr.read().decode(errors='replace').strip()
+            raise DebError(f"decompression failed: {name}: {error or 'zstd exited ' + str(process.returncode)}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+        writer.join()
+        process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def inflate(d, data: bytes) -> Iterator[bytes]:
+    """Output for one input block, in chunks of at most CHUNK_SIZE where the codec allows it"""
+    if isinstance(d, (lzma.LZMADecompressor, bz2.BZ2Decompressor)):
+        yield d.decompress(data, CHUNK_SIZE)
+        while not d.eof and not d.needs_input:
+            yield d.decompress(b'', CHUNK_SIZE)
+    elif hasattr(d, 'unconsumed_tail'):
+        yield d.decompress(data, CHUNK_SIZE)
+        while d.unconsumed_tail:
+            yield d.decompress(d.unconsumed_tail, CHUNK_SIZE)
+    else:
+        yield d.decompress(data)
+
+
+class MemberStream:
+    """Read-only, forward-seekable file over an ar member, decompressed as it is read.
+
+    Only about one CHUNK_SIZE of output is held at a time, so a package never
+    has to fit in memory. Forward seeks are enough for tarfile's regular
+    (non-stream) reader, which avoids the re-buffering its stream mode does
+    on every read.
+    """
+
+    def __init__(self, path, name: str, offset: int, size: int):
+        decompressor(name)  # unsupported formats fail here, before any reading
+        self.chunks = self.produce(path, name, offset, size)
+        self.pending = deque()
+        self.offset = 0  # into pending[0]
+        self.position = 0
+        self.finished = False
+
+    def produce(self, path, name, offset, size) -> Iterator[bytes]:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            d = decompressor(name)
+            if d is None and name.endswith('.zst'):
+                yield from zstd_command(f, name, size)
+                return
+            remaining = size
+            while remaining:
+                data = f.read(min(CHUNK_SIZE, remaining))
+                if not data:
+                    raise DebError(f"{name} is truncated")
+                remaining -= len(data)
+                while data:
+                    if d is None:
+                        yield data
+                        break
+                    yield from inflate(d, data)
+                    data = b''
+                    # Concatenated streams (pigz, pxz) continue with a fresh decompressor
+                    if getattr(d, 'eof', False) and d.unused_data:
+                        data, d = d.unused_data, decompressor(name)
+
+    def fill(self) -> bool:
+        """Queue one more decompressed chunk; False at the end of the member"""
+        while not self.finished:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.finished = True
+            except DebError:
+                self.finished = True
+                raise
+            except Exception as e:
+                # zlib.error, LZMAError, OSError from bz2, ZstdError: all mean a corrupt member
+                self.finished = True
+                raise DebError(f"decompression failed: {e}") from e
+            else:
+                if chunk:
+                    self.pending.append(chunk)
+                    return True
+        return False
+
+    def read(self, size: int = -1) -> bytes:
+        parts = []
+        while size != 0:
+            if not self.pending and not self.fill():
+                break
+            chunk = self.pending[0]
+            take = len(chunk) - self.offset if size < 0 else min(size, len(chunk) - self.offset)
+            parts.append(chunk[self.offset:self.offset + take] if take != len(chunk) else chunk)
+            self.offset += take
+            if self.offset == len(chunk):
+                self.pending.popleft()
+                self.offset = 0
+            if size > 0:
+                size -= take
+        data = parts[0] if len(parts) == 1 else b''.join(parts)
+        self.position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, position: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            position += self.position
+        elif whence != os.SEEK_SET:
+            raise OSError("member streams only seek forward from the start")
+        if position < self.position:
+            raise OSError(f"cannot seek back to {position} (at {self.position})")
+        while self.position < position:
+            if not self.read(min(position - self.position, CHUNK_SIZE)):
+                break
+        return self.position
+
+    def close(self):
+        self.finished = True
+        self.chunks.close()
+
+
+def parse_control(text: str) -> Dict[str, str]:
+    """Fields of a DEBIAN/control file (continuation lines folded into their field)"""
+    fields, key = {}, None
+    for line in text.splitlines():
+        if line[:1] in (' ', '\t') and key:
+            fields[key] += '\n' + line.strip()
+        elif ':' in line:
+            key, _, value = line.partition(':')
+            key = key.strip()
+            fields[key] = value.strip()
+    return fields
+
+
+class DebInstaller:
+    def __init__(self, root=None, db_dir=None):
+        self.root = Path(root or os.environ.get('ALTERON_DEB_ROOT', DEFAULT_ROOT))
+        self.db_dir = Path(db_dir) if db_dir else DEFAULT_DB_DIR
+
+    def destination(self, name: str) -> Optional[Path]:
+        """Where a data.tar entry goes: usr/ maps onto the root prefix, the rest lands under it; None if unsafe"""
+        parts = [part for part in name.split('/') if part not in ('', '.')]
+        if '..' in parts:
+            return None
+        if parts[:1] == ['usr']:
+            parts = parts[1:]
+        return self.root.joinpath(*parts)
+
+    def escapes(self, dest: Path, checked) -> bool:
+        """Would writing dest go through a symlink (or a non-directory) under the root, e.g. lib -> /etc?
+
+        Any package may have made the link, so each parent is looked at on
+        disk; checked holds the directories already known to be real.
+        """
+        if dest == self.root:
+            return False
+        pending = []
+        parent = dest.parent
+        while parent not in checked:
+            if parent == parent.parent:
+                return True  # not under the root at all
+            pending.append(parent)
+            parent = parent.parent
+        for directory in reversed(pending):
+            try:
+                mode = os.lstat(directory).st_mode
+            except FileNotFoundError:
+                # The rest gets created by us, as real directories
+                return False
+            if not stat.S_ISDIR(mode):
+                return True
+            checked.add(directory)
+        return False
+
+    @contextmanager
+    def package_lock(self, package: str):
+        """Installs of the same package take turns; different packages install in parallel"""
+        self.db_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.db_dir / f"{package}.lock", 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def members(self, deb_path) -> Dict[str, Tuple[int, int]]:
+        with open(deb_path, 'rb') as f:
+            members = {name: (offset, size) for name, offset, size in ar_members(f)}
+            if 'debian-binary' not in members:
+                raise DebError("missing debian-binary")
+            offset, size = members['debian-binary']
+            f.seek(offset)
+            version = f.read(size).decode('ascii', 'replace').strip()
+        if not version.startswith('2.'):
+            raise DebError(f"unsupported deb format {version}")
+        return members
+
+    def find(self, members, prefix: str) -> str:
+        for name in members:
+            if name.startswith(prefix):
+                return name
+        raise DebError(f"missing {prefix}*")
+
+    def read_control(self, deb_path, members) -> Dict[str, str]:
+        name = self.find(members, 'control.tar')
+        stream = MemberStream(deb_path, name, *members[name])
+        try:
+            with tarfile.open(fileobj=stream, mode='r:') as tar:
+                for member in tar:
+                    if member.isfile() and member.name.lstrip('./') == 'control':
+                        return parse_control(tar.extractfile(member).read().decode('utf-8', 'replace'))
+        finally:
+            stream.close()
+        raise DebError("control.tar has no control file")
+
+    def write_file(self, stream, member, tmp: Path, privileged: bool):
+        """Copy a regular file's bytes from the tar stream straight into tmp, with its mode and times"""
+        stream.seek(member.offset_data)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            remaining = member.size
+            while remaining:
+                data = stream.read(min(remaining, CHUNK_SIZE))
+                if not data:
+                    raise DebError(f"{member.name} is truncated")
+                remaining -= len(data)
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            if privileged:
+                os.fchown(fd, member.uid, member.gid)
+            # setuid/setgid bits only make sense with the right owner
+            os.fchmod(fd, member.mode & (0o7777 if privileged else 0o777))
+            os.utime(fd, (member.mtime, member.mtime))
+        finally:
+            os.close(fd)
+
+    def is_directory(self, path: Path) -> Optional[bool]:
+        """Whether path is a real directory (not a link to one); None if nothing is there"""
+        try:
+            return stat.S_ISDIR(os.lstat(path).st_mode)
+        except FileNotFoundError:
+            return None
+
+    def extract(self, deb_path, members, result: Dict[str, list]):
+        """Write data.tar's entries in place, each via a temp name and an atomic rename.
+
+        Progress goes into result as it happens, so a failed install still
+        says what it changed. Entries that would clash with what is already
+        there (a file over a directory or the reverse) go to 'conflicts'.
+        """
+        name = self.find(members, 'data.tar')
+        stream = MemberStream(deb_path, name, *members[name])
+        files, directories, skipped, conflicts = (result.setdefault(key, [])
+                                                  for key in ('files', 'directories', 'skipped', 'conflicts'))
+        written = set()
+        self.root.mkdir(parents=True, exist_ok=True)
+        checked = {self.root}
+        suffix = f".alteron-{os.getpid()}-{threading.get_ident()}"
+        privileged = os.geteuid() == 0
+        try:
+            with tarfile.open(fileobj=stream, mode='r:') as tar:
+                for member in tar:
+                    dest = self.destination(member.name)
+                    if dest is None or self.escapes(dest, checked):
+                        skipped.append(member.name)
+                        continue
+                    existing = self.is_directory(dest) if dest != self.root else True
+                    if member.isdir():
+                        if existing is False:
+                            conflicts.append(member.name)
+                            continue
+                        if existing is None:
+                            dest.mkdir(parents=True, exist_ok=True)
+                        checked.add(dest)
+                        if dest != self.root:
+                            directories.append(str(dest))
+                        continue
+                    if existing:
+                        conflicts.append(member.name)
+                        continue
+
+                    if dest.parent not in checked:
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        checked.add(dest.parent)
+                    tmp = dest.with_name(f".{dest.name}{suffix}")
+                    try:
+                        if member.isfile() and not member.issparse():
+                            self.write_file(stream, member, tmp, privileged)
+                        elif member.issym():
+                            os.symlink(member.linkname, tmp)
+                        elif member.islnk():
+                            target = self.destination(member.linkname)
+                            if target is None or target not in written:
+                                skipped.append(member.name)
+                                continue
+                            os.link(target, tmp)
+                        else:
+                            # Devices and FIFOs don't belong in an app install
+                            skipped.append(member.name)
+                            continue
+                        # Readers (and running copies of a binary) see the old file or the new one, never half
+                        os.replace(tmp, dest)
+                    except (IsADirectoryError, NotADirectoryError, FileExistsError):
+                        # Something else put a directory (or a file) there since we looked
+                        conflicts.append(member.name)
+                        continue
+                    finally:
+                        if os.path.lexists(tmp):
+                            os.unlink(tmp)
+                    files.append(str(dest))
+                    written.add(dest)
+        finally:
+            stream.close()
+
+    def write_manifest(self, package: str, manifest: Dict[str, Any]) -> Path:
+        path = self.db_dir / f"{package}.json"
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(manifest, indent=1))
+        os.replace(tmp, path)
+        return path
+
+    def install(self, deb_path) -> Dict[str, Any]:
+        """Install a .deb under the root and record what went where"""
+        started = time.perf_counter()
+        members = self.members(deb_path)
+        control = self.read_control(deb_path, members)
+        package = control.get('Package', '')
+        if not PACKAGE_NAME.match(package):
+            raise DebError(f"invalid package name {package!r}")
+        with self.package_lock(package):
+            manifest = {
+                'package': package,
+                'version': control.get('Version'),
+                'architecture': control.get('Architecture'),
+                'deb': os.path.abspath(deb_path),
+                'root': str(self.root)
+            }
+            try:
+                self.extract(deb_path, members, manifest)
+            except BaseException as e:
+                # Half an install is still an install: record what was replaced before failing
+                manifest['error'] = str(e)
+                self.write_manifest(package, manifest)
+                raise
+            manifest['installed'] = time.time()
+            path = self.write_manifest(package, manifest)
+        return dict(manifest, manifest=str(path), seconds=time.perf_counter() - started)
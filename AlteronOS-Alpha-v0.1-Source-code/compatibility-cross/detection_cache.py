@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Detection Cache
+Persistent platform detection results keyed by file identity
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = Path.home() / '.alteronos' / 'cache' / 'platform_cache.db'
+
+# Bump when detection results change meaning; older caches are discarded
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    dev      INTEGER NOT NULL,
+    ino      INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    platform TEXT NOT NULL,
+    kind     TEXT NOT NULL,
+    PRIMARY KEY (dev, ino)
+);
+"""
+
+
+def identity(st) -> tuple:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class DetectionCache:
+    """In-memory map of (dev, ino) -> (size, mtime_ns, platform, kind), written back in batches"""
+
+    def __init__(self, cache_path=None, flush_every: int = 512):
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self.flush_every = flush_every
+        self.entries: Dict[tuple, tuple] = {}
+        self.dirty: Dict[tuple, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = None
+        self.load()
+
+    def load(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self.db.execute("DROP TABLE IF EXISTS detections")
+                self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self.db.executescript(SCHEMA)
+            rows = self.db.execute("SELECT dev, ino, size, mtime_ns, platform, kind FROM detections")
+            self.entries = {(dev, ino): (size, mtime_ns, platform, kind)
+                            for dev, ino, size, mtime_ns, platform, kind in rows}
+        except sqlite3.Error as e:
+            print(f"⚠️ Detection cache not persisted: {e}")
+            self.db = None
+
+    def get(self, key: tuple) -> Optional[Tuple[str, str]]:
+        """Cached (platform, kind) for an identity tuple, or None if unknown or changed"""
+        entry = self.entries.get(key[:2])
+        if entry is not None and entry[0] == key[2] and entry[1] == key[3]:
+            self.hits += 1
+            return entry[2:]
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, platform: str, kind: str = 'unknown'):
+        value = (key[2], key[3], platform, kind)
+        # Under the lock, so a put can't land in the batch flush() just swapped out
+        with self.lock:
+            self.entries[key[:2]] = value
+            self.dirty[key[:2]] = value
+            full = len(self.dirty) >= self.flush_every
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write new and changed detections to disk"""
+        with self.lock:
+            if not self.dirty:
+                return
+            batch, self.dirty = self.dirty, {}
+            if self.db is None:
+                return
+            try:
+                with self.db:
+                    self.db.executemany(
+                        "INSERT OR REPLACE INTO detections (dev, ino, size, mtime_ns, platform, kind) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(dev, ino) + value for (dev, ino), value in batch.items()])
+            except sqlite3.Error as e:
+                print(f"⚠️ Detection cache flush failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'pending': len(self.dirty)}
+
+    def close(self):
+        self.flush()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -5,14 +5,245 @@ Real Linux Compatibility - ELF Binary Loader
 
 import struct
 import os
-import subprocess
+import glob
+import platform
 from pathlib import Path
-import ctypes
 import mmap
+from output_stream import stream_process
+from deb_package import DebInstaller
+
+# ELF constants
+ELFCLASS32, ELFCLASS64 = 1, 2
+ELFDATA2LSB, ELFDATA2MSB = 1, 2
+PT_LOAD, PT_DYNAMIC, PT_INTERP = 1, 2, 3
+DT_NULL, DT_NEEDED, DT_STRTAB, DT_SONAME, DT_RPATH, DT_RUNPATH = 0, 1, 5, 14, 15, 29
+
+ELF_TYPES = {0: 'none', 1: 'relocatable', 2: 'executable', 3: 'shared', 4: 'core'}
+ELF_MACHINES = {
+    0x03: 'x86', 0x08: 'mips', 0x14: 'ppc', 0x15: 'ppc64', 0x28: 'arm',
+    0x2B: 'sparcv9', 0x3E: 'x86_64', 0xB7: 'aarch64', 0xF3: 'riscv'
+}
+HOST_MACHINES = {
+    'x86_64': 'x86_64', 'amd64': 'x86_64', 'i386': 'x86', 'i686': 'x86',
+    'aarch64': 'aarch64', 'arm64': 'aarch64', 'armv7l': 'arm', 'riscv64': 'riscv',
+    'ppc64le': 'ppc64', 'ppc64': 'ppc64'
+}
+# 32-bit code the 64-bit hosts can also run natively
+HOST_COMPATIBLE = {'x86_64': ('x86',), 'aarch64': ('arm',)}
+
+# Struct layouts per class (field names follow <elf.h>)
+ELF_LAYOUTS = {
+    ELFCLASS32: {
+        'ehdr': 'HHIIIIIHHHHHH',
+        'phdr': ('IIIIIIII', ('p_type', 'p_offset', 'p_vaddr', 'p_paddr',
+                              'p_filesz', 'p_memsz', 'p_flags', 'p_align')),
+        'shdr': 'IIIIIIIIII',
+        'dyn': 'iI'
+    },
+    ELFCLASS64: {
+        'ehdr': 'HHIQQQIHHHHHH',
+        'phdr': ('IIQQQQQQ', ('p_type', 'p_flags', 'p_offset', 'p_vaddr',
+                              'p_paddr', 'p_filesz', 'p_memsz', 'p_align')),
+        'shdr': 'IIQQQQIIQQ',
+        'dyn': 'qQ'
+    }
+}
+
+DEFAULT_LIBRARY_DIRS = {
+    ELFCLASS64: ['/lib64', '/usr/lib64', '/lib/x86_64-linux-gnu', '/usr/lib/x86_64-linux-gnu',
+                 '/lib/aarch64-linux-gnu', '/usr/lib/aarch64-linux-gnu', '/lib', '/usr/lib',
+                 '/usr/local/lib'],
+    ELFCLASS32: ['/lib32', '/usr/lib32', '/lib/i386-linux-gnu', '/usr/lib/i386-linux-gnu',
+                 '/lib', '/usr/lib', '/usr/local/lib']
+}
+
+
+class ELFError(Exception):
+    pass
+
+
+class ELFFile:
+    """mmap-backed ELF reader; fields are unpacked in place with unpack_from"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            if self.size < 52:
+                raise ELFError("File too small for an ELF header")
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if self.data[:4] != b'\x7fELF':
+                raise ELFError("Not an ELF binary")
+            self.elf_class = self.data[4]
+            self.endian = {ELFDATA2LSB: '<', ELFDATA2MSB: '>'}.get(self.data[5])
+            if self.elf_class not in ELF_LAYOUTS or self.endian is None:
+                raise ELFError(f"Unsupported ELF class/data: {self.elf_class}/{self.data[5]}")
+
+            layout = ELF_LAYOUTS[self.elf_class]
+            self.phdr_struct = struct.Struct(self.endian + layout['phdr'][0])
+            self.phdr_fields = layout['phdr'][1]
+            self.shdr_struct = struct.Struct(self.endian + layout['shdr'])
+            self.dyn_struct = struct.Struct(self.endian + layout['dyn'])
+
+            (self.e_type, self.e_machine, self.e_version, self.e_entry, self.e_phoff,
+             self.e_shoff, self.e_flags, self.e_ehsize, self.e_phentsize, self.e_phnum,
+             self.e_shentsize, self.e_shnum, self.e_shstrndx) = struct.unpack_from(
+                self.endian + layout['ehdr'], self.data, 16)
+        except Exception:
+            self.close()
+            raise
+
+        self._segments = None
+        self._dynamic = None
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def check_table(self, offset, count, entry_size, struct_size, name):
+        if count and (entry_size < struct_size or offset + count * entry_size > self.size):
+            raise ELFError(f"Truncated or corrupt {name} table")
+
+    def cstring(self, offset) -> str:
+        end = self.data.find(b'\0', offset)
+        if offset >= self.size or end < 0:
+            raise ELFError(f"String at {offset:#x} runs past end of file")
+        return self.data[offset:end].decode(errors='replace')
+
+    @property
+    def segments(self):
+        """Program headers as dicts"""
+        if self._segments is None:
+            self.check_table(self.e_phoff, self.e_phnum, self.e_phentsize,
+                             self.phdr_struct.size, 'program header')
+            unpack = self.phdr_struct.unpack_from
+            self._segments = [dict(zip(self.phdr_fields, unpack(self.data, self.e_phoff + i * self.e_phentsize)))
+                              for i in range(self.e_phnum)]
+        return self._segments
+
+    def sections(self):
+        """Section headers as dicts, with names from the section string table"""
+        if not self.e_shoff or not self.e_shnum:
+            return []
+        self.check_table(self.e_shoff, self.e_shnum, self.e_shentsize,
+                         self.shdr_struct.size, 'section header')
+        unpack = self.shdr_struct.unpack_from
+        raw = [unpack(self.data, self.e_shoff + i * self.e_shentsize) for i in range(self.e_shnum)]
+        names_offset = raw[self.e_shstrndx][4] if self.e_shstrndx < len(raw) else None
+
+        sections = []
+        for sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size, sh_link, sh_info, _, sh_entsize in raw:
+            sections.append({
+                'name': self.cstring(names_offset + sh_name) if names_offset is not None else '',
+                'type': sh_type, 'flags': sh_flags, 'addr': sh_addr,
+                'offset': sh_offset, 'size': sh_size, 'link': sh_link, 'entsize': sh_entsize
+            })
+        return sections
+
+    def vaddr_to_offset(self, vaddr):
+        for segment in self.segments:
+            if segment['p_type'] == PT_LOAD and segment['p_vaddr'] <= vaddr < segment['p_vaddr'] + segment['p_filesz']:
+                return vaddr - segment['p_vaddr'] + segment['p_offset']
+        raise ELFError(f"Address {vaddr:#x} is not in a loaded segment")
+
+    @property
+    def interpreter(self):
+        for segment in self.segments:
+            if segment['p_type'] == PT_INTERP:
+                return self.cstring(segment['p_offset'])
+        return None
+
+    @property
+    def dynamic(self):
+        """DT_NEEDED, DT_SONAME, DT_RPATH and DT_RUNPATH from the dynamic segment"""
+        if self._dynamic is None:
+            entries = []
+            segment = next((s for s in self.segments if s['p_type'] == PT_DYNAMIC), None)
+            if segment is not None:
+                unpack = self.dyn_struct.unpack_from
+                step = self.dyn_struct.size
+                end = min(segment['p_offset'] + segment['p_filesz'], self.size)
+                for offset in range(segment['p_offset'], end - step + 1, step):
+                    tag, value = unpack(self.data, offset)
+                    if tag == DT_NULL:
+                        break
+                    entries.append((tag, value))
+
+            strtab = next((value for tag, value in entries if tag == DT_STRTAB), None)
+            result = {'needed': [], 'soname': None, 'rpath': [], 'runpath': []}
+            if strtab is not None:
+                strtab_offset = self.vaddr_to_offset(strtab)
+                for tag, value in entries:
+                    if tag == DT_NEEDED:
+                        result['needed'].append(self.cstring(strtab_offset + value))
+                    elif tag == DT_SONAME:
+                        result['soname'] = self.cstring(strtab_offset + value)
+                    elif tag in (DT_RPATH, DT_RUNPATH):
+                        key = 'rpath' if tag == DT_RPATH else 'runpath'
+                        result[key] = [p for p in self.cstring(strtab_offset + value).split(':') if p]
+            self._dynamic = result
+        return self._dynamic
+
+    @property
+    def machine(self):
+        return ELF_MACHINES.get(self.e_machine, f'machine-{self.e_machine:#x}')
+
+    def summary(self):
+        dynamic = self.dynamic
+        return {
+            'class': 64 if self.elf_class == ELFCLASS64 else 32,
+            'endian': 'little' if self.endian == '<' else 'big',
+            'type': ELF_TYPES.get(self.e_type, self.e_type),
+            'machine': self.machine,
+            'entry_point': self.e_entry,
+            'segments': len(self.segments),
+            'sections': self.e_shnum,
+            'interpreter': self.interpreter,
+            'needed': dynamic['needed'],
+            'soname': dynamic['soname'],
+            'rpath': dynamic['rpath'],
+            'runpath': dynamic['runpath']
+        }
+
+
+def system_library_dirs():
+    """Directories from /etc/ld.so.conf (and its includes), in order"""
+    dirs = []
+
+    def read_conf(conf_path):
+        try:
+            with open(conf_path) as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            if line.startswith('include '):
+                for included in sorted(glob.glob(line.split(None, 1)[1])):
+                    read_conf(included)
+            elif line and line not in dirs:
+                dirs.append(line)
+
+    read_conf('/etc/ld.so.conf')
+    return dirs
+
 
 class ELFLoader:
     def __init__(self):
         self.elf_magic = b'\x7fELF'
+        self.ld_conf_dirs = None
+        self.dir_listings = {}
+        self.library_classes = {}
         
     def is_elf_binary(self, file_path):
         """Check if file is ELF binary"""
@@ -24,37 +255,175 @@ class ELFLoader:
             return False
             
     def parse_elf_header(self, file_path):
-        """Parse ELF header"""
+        """Parse ELF header (any class and byte order)"""
         try:
-            with open(file_path, 'rb') as f:
-                # Read ELF identification
-                e_ident = f.read(16)
-                e_type = struct.unpack('<H', f.read(2))[0]
-                e_machine = struct.unpack('<H', f.read(2))[0]
-                e_version = struct.unpack('<I', f.read(4))[0]
-                e_entry = struct.unpack('<Q', f.read(8))[0]
-                
+            with ELFFile(file_path) as elf:
                 return {
-                    'type': e_type,
-                    'machine': e_machine,
-                    'version': e_version,
-                    'entry_point': e_entry,
-                    'arch': 'x86_64' if e_machine == 0x3E else 'x86'
+                    'type': elf.e_type,
+                    'machine': elf.e_machine,
+                    'version': elf.e_version,
+                    'entry_point': elf.e_entry,
+                    'arch': elf.machine,
+                    'class': 64 if elf.elf_class == ELFCLASS64 else 32,
+                    'endian': 'little' if elf.endian == '<' else 'big'
                 }
-        except Exception as e:
+        except (OSError, ValueError, ELFError, struct.error) as e:
             return {"error": str(e)}
             
+    def inspect_elf(self, file_path):
+        """Header, segments, interpreter and dynamic dependencies"""
+        try:
+            with ELFFile(file_path) as elf:
+                return elf.summary()
+        except (OSError, ValueError, ELFError, struct.error) as e:
+            return {"error": str(e)}
+            
+    def library_dirs(self, elf_class):
+        """ld.so.conf directories followed by the default ones for this class"""
+        if self.ld_conf_dirs is None:
+            self.ld_conf_dirs = system_library_dirs()
+        return self.ld_conf_dirs + DEFAULT_LIBRARY_DIRS[elf_class]
+        
+    def listing(self, directory):
+        """Set of names in a library directory, re-read when its mtime changes (a library was installed)"""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self.dir_listings.pop(directory, None)
+            return set()
+        cached = self.dir_listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            names = set(os.listdir(directory))
+        except OSError:
+            names = set()
+        self.dir_listings[directory] = (mtime, names)
+        return names
+        
+    def library_class(self, path):
+        """ELF class of a candidate library (the loader skips other classes); re-read if the file changed"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return 0
+        key = (st.st_ino, st.st_mtime_ns)
+        cached = self.library_classes.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                ident = f.read(5)
+            elf_class = ident[4] if ident[:4] == self.elf_magic else 0
+        except OSError:
+            elf_class = 0
+        self.library_classes[path] = (key, elf_class)
+        return elf_class
+        
+    def find_library(self, name, elf_class, search_dirs):
+        if '/' in name:
+            return name if os.path.exists(name) else None
+        for directory in search_dirs:
+            if name in self.listing(directory):
+                candidate = os.path.join(directory, name)
+                if self.library_class(candidate) == elf_class:
+                    return candidate
+        return None
+        
+    def resolve_libraries(self, file_path, recursive=True):
+        """Map every DT_NEEDED (transitively) to a path, or None when missing"""
+        resolved = {}
+        pending = [os.path.realpath(file_path)]
+        seen = set()
+        elf_class = None
+        env_dirs = [d for d in os.environ.get('LD_LIBRARY_PATH', '').split(':') if d]
+        
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            try:
+                with ELFFile(current) as elf:
+                    elf_class = elf_class or elf.elf_class
+                    dynamic = elf.dynamic
+            except (OSError, ValueError, ELFError, struct.error):
+                continue
+                
+            origin = os.path.dirname(current)
+            expand = lambda dirs: [d.replace('$ORIGIN', origin).replace('${ORIGIN}', origin) for d in dirs]
+            # Same order as ld.so; DT_RPATH only applies when there is no DT_RUNPATH
+            search = (expand(dynamic['rpath']) if not dynamic['runpath'] else []) + env_dirs + \
+                     expand(dynamic['runpath']) + self.library_dirs(elf_class)
+                     
+            for name in dynamic['needed']:
+                if name in resolved:
+                    continue
+                path = self.find_library(name, elf_class, search)
+                resolved[name] = path
+                if path and recursive:
+                    pending.append(os.path.realpath(path))
+                    
+        return resolved
+        
+    def missing_libraries(self, file_path):
+        return [name for name, path in self.resolve_libraries(file_path).items() if path is None]
+        
+    def preflight(self, file_path):
+        """Validate an ELF before launch: class, machine, interpreter and libraries"""
+        try:
+            with ELFFile(file_path) as elf:
+                summary = elf.summary()
+        except (OSError, ValueError, ELFError, struct.error) as e:
+            return {"success": False, "error": f"Invalid ELF: {e}"}
+            
+        host = HOST_MACHINES.get(platform.machine().lower())
+        if host and summary['machine'] != host and summary['machine'] not in HOST_COMPATIBLE.get(host, ()):
+            return {"success": False, "error": f"{summary['machine']} binary cannot run on {host}",
+                    "elf": summary}
+        if summary['interpreter'] and not os.path.exists(summary['interpreter']):
+            return {"success": False, "error": f"Missing interpreter: {summary['interpreter']}",
+                    "elf": summary}
+            
+        missing = self.missing_libraries(file_path) if summary['needed'] else []
+        if missing:
+            return {"success": False, "error": f"Missing libraries: {', '.join(missing)}",
+                    "missing": missing, "elf": summary}
+        return {"success": True, "elf": summary}
+        
+    def make_executable(self, file_path):
+        """Add the execute bits a directly-run binary or script needs (raises OSError if we may not)"""
+        mode = os.stat(file_path).st_mode
+        if mode & 0o111 != 0o111:
+            os.chmod(file_path, mode | 0o111)
+            
+    def build_elf_command(self, elf_path, args=None):
+        """Command line that executes an ELF binary directly"""
+        cmd = [str(Path(elf_path).resolve())]
+        if args:
+            cmd.extend(args)
+        return cmd
+        
+    def build_shell_command(self, script_path, args=None):
+        """Command line that runs a shell script with bash"""
+        cmd = ['bash', script_path]
+        if args:
+            cmd.extend(args)
+        return cmd
+        
     def load_elf_binary(self, elf_path):
         """Load and execute ELF binary"""
         if not self.is_elf_binary(elf_path):
             return {"success": False, "error": "Not an ELF binary"}
             
-        # Make binary executable
-        os.chmod(elf_path, 0o755)
-        
+        check = self.preflight(elf_path)
+        if not check["success"]:
+            return check
+            
         try:
             # Execute the binary
-            result = subprocess.run([elf_path], capture_output=True, text=True)
+            self.make_executable(elf_path)
+            result = stream_process(self.build_elf_command(elf_path)).collect()
             
             return {
                 "success": result.returncode == 0,
@@ -68,17 +437,23 @@ class ELFLoader:
     def install_deb_package(self, deb_path):
         """Install Debian package"""
         try:
-            # Extract and install .deb
-            result = subprocess.run(['dpkg', '-x', deb_path, '/tmp/alteron_pkg'],
-                                  capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                # Copy files to appropriate locations
-                subprocess.run(['cp', '-r', '/tmp/alteron_pkg/*', '/usr/local/'],
-                             capture_output=True)
-                return {"success": True, "output": "Package installed"}
-            else:
-                return {"success": False, "error": result.stderr}
+            # Stream data.tar straight into place (no dpkg, no staging tree)
+            result = DebInstaller().install(deb_path)
+            conflicts = result['conflicts']
+            output = (f"Package {result['package']} {result['version']} installed "
+                      f"({len(result['files'])} files under {result['root']})")
+            if conflicts:
+                output += f", {len(conflicts)} entries clash with existing paths"
+            return {
+                # A clashing entry was left as it was, so the package isn't fully installed
+                "success": not conflicts,
+                "output": output,
+                "error": f"Conflicting paths: {', '.join(conflicts[:5])}" if conflicts else None,
+                "package": result['package'],
+                "manifest": result['manifest'],
+                "skipped": result['skipped'],
+                "conflicts": conflicts
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
             
@@ -88,7 +463,7 @@ class ELFLoader:
             # Make script executable
             os.chmod(script_path, 0o755)
             
-            result = subprocess.run(['bash', script_path], capture_output=True, text=True)
+            result = stream_process(self.build_shell_command(script_path)).collect()
             
             return {
                 "success": result.returncode == 0,
@@ -116,6 +491,14 @@ class LinuxCompatibility:
         else:
             return {"success": False, "error": f"Unsupported format: {path.suffix}"}
             
+    def build_command(self, app_path, args=None):
+        """Command line for a runnable Linux app, or None for packages"""
+        if Path(app_path).suffix == '.sh':
+            return self.elf_loader.build_shell_command(app_path, args)
+        elif self.elf_loader.is_elf_binary(app_path):
+            return self.elf_loader.build_elf_command(app_path, args)
+        return None
+            
     def setup_linux_environment(self):
         """Setup Linux-like environment"""
         linux_env = os.environ.copy()
@@ -6,7 +6,8 @@ Real macOS Compatibility using Darling
 import os
 import subprocess
 from pathlib import Path
-import plistlib
+from output_stream import stream_process
+from capability_probe import PROBE
 
 class MacOSCompatibility:
     def __init__(self):
@@ -15,14 +16,12 @@ class MacOSCompatibility:
         
     def check_darling(self):
         """Check if Darling (macOS translation layer) is available"""
-        try:
-            result = subprocess.run(['darling', '--version'], 
-                                  capture_output=True, text=True)
-            print(f"✅ Darling available: {result.stdout.strip()}")
+        result = PROBE.check('darling')
+        if result['available']:
+            print(f"✅ Darling available: {result['version']}")
             return True
-        except:
-            print("❌ Darling not available")
-            return False
+        print("❌ Darling not available")
+        return False
             
     def run_macos_app(self, app_path):
         """Run macOS application using Darling"""
@@ -40,27 +39,48 @@ class MacOSCompatibility:
         else:
             return {"success": False, "error": f"Unsupported format: {path.suffix}"}
             
+    def find_bundle_executable(self, app_path):
+        """Locate the Mach-O executable inside a .app bundle"""
+        app_dir = Path(app_path)
+        if app_dir.suffix != '.app':
+            return None
+            
+        # macOS app bundle structure
+        contents_dir = app_dir / 'Contents'
+        macos_dir = contents_dir / 'MacOS'
+        info_plist = contents_dir / 'Info.plist'
+        
+        if info_plist.exists():
+            import plistlib
+            
+            # Parse Info.plist to find executable
+            with open(info_plist, 'rb') as f:
+                plist_data = plistlib.load(f)
+                executable = plist_data.get('CFBundleExecutable')
+                
+            if executable and (macos_dir / executable).exists():
+                return str(macos_dir / executable)
+        return None
+        
+    def build_macho_command(self, binary_path):
+        """Command line that runs a Mach-O binary under Darling"""
+        return ['darling', 'shell', binary_path]
+        
+    def build_command(self, app_path):
+        """Command line for a runnable macOS app, or None for images/packages"""
+        if not self.darling_available or Path(app_path).suffix != '.app':
+            return None
+        executable = self.find_bundle_executable(app_path)
+        return self.build_macho_command(executable) if executable else None
+        
     def run_app_bundle(self, app_path):
         """Run macOS .app bundle"""
         try:
             # Find executable in .app bundle
-            app_dir = Path(app_path)
-            if app_dir.suffix == '.app':
-                # macOS app bundle structure
-                contents_dir = app_dir / 'Contents'
-                macos_dir = contents_dir / 'MacOS'
-                info_plist = contents_dir / 'Info.plist'
+            executable_path = self.find_bundle_executable(app_path)
+            if executable_path:
+                return self.run_macho_binary(executable_path)
                 
-                if info_plist.exists():
-                    # Parse Info.plist to find executable
-                    with open(info_plist, 'rb') as f:
-                        plist_data = plistlib.load(f)
-                        executable = plist_data.get('CFBundleExecutable')
-                        
-                    if executable and (macos_dir / executable).exists():
-                        executable_path = macos_dir / executable
-                        return self.run_macho_binary(str(executable_path))
-                        
             return {"success": False, "error": "Invalid app bundle structure"}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -68,8 +88,7 @@ class MacOSCompatibility:
     def run_macho_binary(self, binary_path):
         """Run Mach-O binary using Darling"""
         try:
-            result = subprocess.run(['darling', 'shell', binary_path],
-                                  capture_output=True, text=True)
+            result = stream_process(self.build_macho_command(binary_path)).collect()
             return {
                 "success": result.returncode == 0,
                 "output": result.stdout,
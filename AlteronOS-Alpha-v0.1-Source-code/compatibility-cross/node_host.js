@@ -0,0 +1,154 @@
+#!/usr/bin/env node
+/*
+ * AlteronOS Node Runtime Host
+ * Long-lived node that runs each .js app in its own worker thread
+ *
+ * Protocol (one JSON object per line):
+ *   stdin  <- {"id", "op": "run", "path", "args", "env", "stdout", "stderr"}   (stdout/stderr are FIFO paths)
+ *             {"id", "op": "stop", "signal"}
+ *   stdout -> {"ready": true, ...} once, then {"id", "event": "started"} and {"id", "event": "exit", "code"}
+ *
+ * Apps run as worker threads, so process.chdir(), process.stdin and signal
+ * handlers are unavailable to them; the kernel only uses this host when
+ * ALTERON_RUNTIME_HOSTS=1.
+ */
+
+'use strict';
+
+const fs = require('fs');
+const readline = require('readline');
+const { Worker } = require('worker_threads');
+
+const idleSeconds = Number(process.argv[2] || 300);
+const runs = new Map();
+let idleTimer = null;
+let closing = false;
+
+// Worker boot is most of a launch, so one is always booted ahead and waits here for its app.
+// runMain() loads process.argv[1] exactly as node does for its entry point (CommonJS or ESM).
+const BOOTSTRAP = `
+const { parentPort } = require('worker_threads');
+parentPort.once('message', ({ path, args, env }) => {
+    parentPort.unref();
+    process.argv = [process.execPath, path, ...args];
+    for (const key of Object.keys(process.env)) {
+        delete process.env[key];
+    }
+    Object.assign(process.env, env);
+    require('module').runMain();
+});`;
+let spare = null;
+
+function bootWorker() {
+    const worker = new Worker(BOOTSTRAP, { eval: true, stdin: false, stdout: true, stderr: true });
+    // An idle spare must not keep the host alive
+    worker.unref();
+    worker.on('exit', () => {
+        if (spare === worker) {
+            spare = null;
+        }
+    });
+    return worker;
+}
+
+function send(message) {
+    process.stdout.write(JSON.stringify(message) + '\n');
+}
+
+function scheduleIdleExit() {
+    clearTimeout(idleTimer);
+    if (runs.size > 0) {
+        return;
+    }
+    if (closing) {
+        process.exit(0);
+    }
+    if (idleSeconds > 0) {
+        idleTimer = setTimeout(() => process.exit(0), idleSeconds * 1000);
+        idleTimer.unref();
+    }
+}
+
+function pipeTo(stream, path, exited, trailer) {
+    const out = fs.createWriteStream(null, { fd: fs.openSync(path, 'w') });
+    stream.pipe(out, { end: false });
+    const ended = new Promise(resolve => stream.on('end', resolve));
+    return new Promise(resolve => {
+        // Close only after the worker is gone, so an uncaught error's trace still lands on stderr
+        Promise.all([ended, exited]).then(() => out.end(trailer()));
+        out.on('close', resolve);
+        out.on('error', () => {
+            stream.resume();
+            resolve();
+        });
+    });
+}
+
+function start(request) {
+    const run = { id: request.id, worker: null, signal: 0, trailer: '' };
+    // A worker is its own V8 isolate: globals, require cache, process.argv/env and exit code are per app
+    const worker = spare || bootWorker();
+    let outputs, exited;
+    spare = null;
+    try {
+        exited = new Promise(resolve => worker.on('exit', resolve));
+        outputs = [pipeTo(worker.stdout, request.stdout, exited, () => ''),
+                   pipeTo(worker.stderr, request.stderr, exited, () => run.trailer)];
+    } catch (e) {
+        worker.terminate();
+        send({ id: request.id, event: 'error', error: String(e && e.message || e) });
+        return;
+    }
+    run.worker = worker;
+    runs.set(run.id, run);
+    clearTimeout(idleTimer);
+    worker.ref();
+    worker.postMessage({ path: request.path, args: request.args || [], env: request.env || process.env });
+    send({ id: run.id, event: 'started' });
+    setImmediate(() => {
+        if (!closing) {
+            spare = spare || bootWorker();
+        }
+    });
+
+    worker.on('error', error => {
+        // What node prints for an uncaught exception before exiting with 1
+        run.trailer += `${error && error.stack || error}\n`;
+    });
+    // Report the exit only once everything the app printed has reached its pipes
+    Promise.all([exited, ...outputs]).then(([code]) => {
+        runs.delete(run.id);
+        send({ id: run.id, event: 'exit', code: run.signal ? -run.signal : code });
+        scheduleIdleExit();
+    });
+}
+
+function stop(request) {
+    const run = runs.get(request.id);
+    if (run && !run.signal) {
+        run.signal = request.signal || 15;
+        run.worker.terminate();
+    }
+}
+
+readline.createInterface({ input: process.stdin }).on('line', line => {
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (e) {
+        return;
+    }
+    if (request.op === 'run') {
+        start(request);
+    } else if (request.op === 'stop') {
+        stop(request);
+    }
+}).on('close', () => {
+    // The kernel went away: let running apps finish, take no new ones
+    closing = true;
+    scheduleIdleExit();
+});
+
+spare = bootWorker();
+send({ ready: true, runtime: 'node', version: process.version, pid: process.pid, env: true });
+scheduleIdleExit();
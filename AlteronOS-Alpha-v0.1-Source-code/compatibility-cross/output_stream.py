@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Output Streaming
+Incremental stdout/stderr from launched apps with bounded memory
+"""
+
+import codecs
+import os
+import selectors
+import subprocess
+from collections import deque
+from typing import List, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+# Output kept for the final result, per stream; older output is dropped (see tee_path)
+KEEP_BYTES = 1024 * 1024
+
+
+class OutputTail:
+    """Most recent output of one stream, capped at keep_bytes"""
+
+    def __init__(self, keep_bytes: int = KEEP_BYTES, text: bool = True):
+        self.keep_bytes = keep_bytes
+        self.text = text
+        self.chunks = deque()
+        self.size = 0
+        self.truncated = False
+
+    def append(self, chunk):
+        if not chunk:
+            return
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        while self.size > self.keep_bytes and len(self.chunks) > 1:
+            self.size -= len(self.chunks.popleft())
+            self.truncated = True
+
+    def value(self):
+        return ('' if self.text else b'').join(self.chunks)
+
+
+class OutputStream:
+    """Pull-based reader over a process's pipes.
+
+    Nothing is read ahead of the consumer: when it stops iterating, the pipe
+    fills and the app blocks in write(), so memory stays at one chunk plus the
+    retained tail no matter how much the app prints.
+    """
+
+    def __init__(self, popen, tee_path=None, chunk_size: int = CHUNK_SIZE,
+                 keep_bytes: int = KEEP_BYTES, text: bool = True, encoding: str = 'utf-8',
+                 on_exit=None):
+        self.popen = popen
+        self.chunk_size = chunk_size
+        self.keep_bytes = keep_bytes
+        self.text = text
+        self.on_exit = on_exit
+        self.tee = open(tee_path, 'ab', buffering=0) if tee_path else None
+        self.selector = selectors.DefaultSelector()
+
+        self.pipes = {}
+        self.decoders = {}
+        self.tail = {}
+        for name in ('stdout', 'stderr'):
+            pipe = getattr(popen, name)
+            if pipe is None:
+                continue
+            fd = pipe.fileno()
+            os.set_blocking(fd, False)
+            self.pipes[fd] = name
+            self.selector.register(fd, selectors.EVENT_READ)
+            self.decoders[name] = codecs.getincrementaldecoder(encoding)(errors='replace') if text else None
+            self.tail[name] = OutputTail(keep_bytes, text)
+
+    @property
+    def pid(self):
+        return self.popen.pid
+
+    @property
+    def finished(self) -> bool:
+        return not self.pipes
+
+    @property
+    def truncated(self) -> bool:
+        return any(tail.truncated for tail in self.tail.values())
+
+    # Reading
+    def read_fd(self, fd) -> Optional[Tuple[str, object]]:
+        """One non-blocking read; (stream, data) or None if nothing was ready"""
+        try:
+            data = os.read(fd, self.chunk_size)
+        except BlockingIOError:
+            return None
+        name = self.pipes[fd]
+        decoder = self.decoders[name]
+
+        if not data:
+            self.close_pipe(fd)
+            rest = decoder.decode(b'', final=True) if decoder else b''
+            return (name, rest) if rest else None
+
+        if self.tee is not None:
+            self.tee.write(data)
+        chunk = decoder.decode(data) if decoder else data
+        if not chunk:
+            # Partial multi-byte character; completed by the next read
+            return None
+        self.tail[name].append(chunk)
+        return name, chunk
+
+    def close_pipe(self, fd):
+        name = self.pipes.pop(fd)
+        self.selector.unregister(fd)
+        getattr(self.popen, name).close()
+        if not self.pipes:
+            self.finish()
+
+    def finish(self):
+        self.selector.close()
+        if self.tee is not None:
+            self.tee.close()
+            self.tee = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Tuple[str, object]:
+        """Block until the next chunk of output"""
+        while self.pipes:
+            for key, _ in self.selector.select():
+                chunk = self.read_fd(key.fd)
+                if chunk is not None:
+                    return chunk
+        raise StopIteration
+
+    def poll(self, max_chunks: int = 64) -> List[Tuple[str, object]]:
+        """Whatever output is ready right now, without blocking (for UI timers)"""
+        chunks = []
+        while self.pipes and len(chunks) < max_chunks:
+            events = self.selector.select(0)
+            if not events:
+                break
+            for key, _ in events:
+                chunk = self.read_fd(key.fd)
+                if chunk is not None:
+                    chunks.append(chunk)
+        return chunks
+
+    def lines(self):
+        """(stream, line) pairs; a trailing partial line is yielded at EOF"""
+        partial = {name: '' if self.text else b'' for name in self.tail}
+        newline = '\n' if self.text else b'\n'
+        for name, chunk in self:
+            *complete, partial[name] = (partial[name] + chunk).split(newline)
+            for line in complete:
+                yield name, line
+        for name, rest in partial.items():
+            if rest:
+                yield name, rest
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tuple[str, object]:
+        """Await the next chunk without blocking the event loop"""
+        # asyncio is imported by the coroutines only, so sync users don't pay for it
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while self.pipes:
+            ready = loop.create_future()
+            watched = list(self.pipes)
+            for fd in watched:
+                loop.add_reader(fd, lambda fd=fd: ready.done() or ready.set_result(fd))
+            try:
+                fd = await ready
+            finally:
+                for watched_fd in watched:
+                    loop.remove_reader(watched_fd)
+            chunk = self.read_fd(fd)
+            if chunk is not None:
+                return chunk
+        raise StopAsyncIteration
+
+    # Completion
+    def output(self, name: str):
+        tail = self.tail.get(name)
+        return tail.value() if tail else ('' if self.text else b'')
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        returncode = self.popen.wait(timeout)
+        if self.on_exit is not None:
+            self.on_exit()
+        return returncode
+
+    async def wait_async(self) -> int:
+        import asyncio
+        delay = 0.005
+        while self.popen.poll() is None:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        if self.on_exit is not None:
+            self.on_exit()
+        return self.popen.returncode
+
+    def completed(self) -> subprocess.CompletedProcess:
+        return subprocess.CompletedProcess(self.popen.args, self.popen.returncode,
+                                           self.output('stdout'), self.output('stderr'))
+
+    def collect(self) -> subprocess.CompletedProcess:
+        """Drain to EOF and wait, like subprocess.run(capture_output=True) with a bounded tail"""
+        for _ in self:
+            pass
+        self.wait()
+        return self.completed()
+
+    async def collect_async(self) -> subprocess.CompletedProcess:
+        async for _ in self:
+            pass
+        await self.wait_async()
+        return self.completed()
+
+    def close(self):
+        """Stop reading; the app gets SIGPIPE if it keeps writing"""
+        for fd in list(self.pipes):
+            self.close_pipe(fd)
+
+
+async def drain_async_process(process, tee_path=None, chunk_size: int = CHUNK_SIZE,
+                              keep_bytes: int = KEEP_BYTES, encoding: str = 'utf-8'):
+    """Read an asyncio subprocess's pipes to EOF into bounded tails; {stream: OutputTail}"""
+    import asyncio
+    tee = open(tee_path, 'ab', buffering=0) if tee_path else None
+    tails = {}
+
+    async def pump(name, reader):
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        tail = tails[name] = OutputTail(keep_bytes)
+        # StreamReader pauses the pipe when its buffer fills, so a slow consumer backpressures the app
+        while True:
+            data = await reader.read(chunk_size)
+            if not data:
+                tail.append(decoder.decode(b'', final=True))
+                return
+            if tee is not None:
+                tee.write(data)
+            tail.append(decoder.decode(data))
+
+    try:
+        await asyncio.gather(*(pump(name, reader) for name, reader in
+                               (('stdout', process.stdout), ('stderr', process.stderr)) if reader is not None))
+    finally:
+        if tee is not None:
+            tee.close()
+    return tails
+
+
+def stream_process(argv, supervisor=None, path=None, platform: str = 'unknown', tee_path=None,
+                   chunk_size: int = CHUNK_SIZE, keep_bytes: int = KEEP_BYTES, text: bool = True,
+                   spawn=None, **popen_kwargs) -> OutputStream:
+    """Start argv with piped output and return its stream (supervised when a supervisor is given).
+
+    spawn replaces supervisor.spawn for launchers that return the same kind of entry.
+    """
+    popen_kwargs.setdefault('stdout', subprocess.PIPE)
+    popen_kwargs.setdefault('stderr', subprocess.PIPE)
+    if supervisor is not None:
+        entry = (spawn or supervisor.spawn)(argv, path=path, platform=platform, **popen_kwargs)
+        popen, on_exit = entry.popen, lambda: supervisor.mark_exited(entry)
+    else:
+        popen, on_exit = subprocess.Popen(argv, **popen_kwargs), None
+    return OutputStream(popen, tee_path=tee_path, chunk_size=chunk_size, keep_bytes=keep_bytes,
+                        text=text, on_exit=on_exit)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Prefix Templates
+New Wine prefixes cloned from a pristine booted template
+"""
+
+import errno
+import fcntl
+import os
+import shutil
+import stat
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from capability_probe import PROBE
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Wine rewrites these in place, so every prefix needs its own copy
+PRIVATE_FILES = ('system.reg', 'user.reg', 'userdef.reg')
+# Apps write settings and profile data in place too: win.ini, AppData, Documents...
+MUTABLE_SUFFIXES = ('.ini',)
+USER_TREE = os.path.join('drive_c', 'users')
+STAMP_FILE = '.alteron-template'
+
+# errno values meaning "this filesystem can't reflink", not "this file failed"
+NO_REFLINK = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+
+def reflink(src: str, dst: str, mode: int):
+    """Share src's extents with a new dst (btrfs, XFS, bcachefs); raises OSError when unsupported"""
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        except OSError:
+            os.close(dst_fd)
+            os.unlink(dst)
+            raise
+        os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def is_private(rel: str) -> bool:
+    """Template-relative path of a file a clone must never share with the template"""
+    return (rel in PRIVATE_FILES or rel.lower().endswith(MUTABLE_SUFFIXES)
+            or rel.startswith(USER_TREE + os.sep))
+
+
+class PrefixCloner:
+    """Copies a tree with reflinks where possible, else hardlinks plus private copies of mutable files"""
+
+    def __init__(self):
+        self.reflinks = None  # unknown until the first file is tried
+        # Read-only bits don't stop root, so a root clone never shares inodes with the template
+        self.hardlinks = os.geteuid() != 0
+        self.counts = {'reflink': 0, 'hardlink': 0, 'copy': 0}
+
+    def clone_file(self, src: str, dst: str, private: bool, mode: int):
+        if self.reflinks is not False:
+            try:
+                # A reflinked file is private to the clone, so it can stay writable
+                reflink(src, dst, mode | stat.S_IWUSR)
+                self.reflinks = True
+                self.counts['reflink'] += 1
+                return
+            except OSError as e:
+                if e.errno not in NO_REFLINK:
+                    raise
+                self.reflinks = False
+
+        if not private and self.hardlinks:
+            try:
+                os.link(src, dst)
+                self.counts['hardlink'] += 1
+                return
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                    raise
+        shutil.copyfile(src, dst)
+        os.chmod(dst, mode | stat.S_IWUSR)
+        self.counts['copy'] += 1
+
+    def clone_tree(self, src, dst):
+        """Recreate src at dst (which must not exist); symlinks such as dosdevices are copied as links"""
+        src, dst = str(src), str(dst)
+        for root, dirs, files in os.walk(src):
+            target_root = dst + root[len(src):]
+            os.mkdir(target_root, stat.S_IMODE(os.stat(root).st_mode) | stat.S_IWUSR)
+            for name in dirs + files:
+                path = os.path.join(root, name)
+                target = os.path.join(target_root, name)
+                st = os.lstat(path)
+                if stat.S_ISLNK(st.st_mode):
+                    os.symlink(os.readlink(path), target)
+                    if name in dirs:
+                        # os.walk would follow it otherwise
+                        dirs.remove(name)
+                elif stat.S_ISREG(st.st_mode) and name != STAMP_FILE:
+                    private = is_private(os.path.relpath(path, src))
+                    self.clone_file(path, target, private, stat.S_IMODE(st.st_mode))
+
+
+class PrefixTemplate:
+    def __init__(self, path, wine: str, wineserver: str):
+        self.path = Path(path)
+        self.wine = wine
+        self.wineserver = wineserver
+        self.lock = threading.Lock()
+        self.version = None
+        self.clones = 0
+        self.last_clone = None
+
+    def env(self) -> Dict[str, str]:
+        env = os.environ.copy()
+        env['WINEPREFIX'] = str(self.path)
+        env['WINESERVER'] = self.wineserver
+        return env
+
+    def wine_version(self) -> str:
+        if self.version is None:
+            self.version = PROBE.check('wine', [self.wine, '--version']).get('version') or 'unknown'
+        return self.version
+
+    @property
+    def ready(self) -> bool:
+        try:
+            return (self.path / STAMP_FILE).read_text().strip() == self.wine_version()
+        except OSError:
+            return False
+
+    def ensure(self) -> bool:
+        """Boot the template once per Wine version"""
+        if self.ready:
+            return True
+        with self.lock:
+            if self.ready:
+                return True
+            print(f"🍷 Building Wine prefix template ({self.wine_version()})")
+            building = self.path.with_name(self.path.name + f'.building-{os.getpid()}')
+            shutil.rmtree(building, ignore_errors=True)
+            building.parent.mkdir(parents=True, exist_ok=True)
+
+            env = dict(self.env(), WINEPREFIX=str(building))
+            result = subprocess.run([self.wine, 'wineboot', '--init'], env=env, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # Registry files are only complete once the template's server has saved and exited
+            subprocess.run([self.wineserver, '-w'], env=env, stdin=subprocess.DEVNULL,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode != 0 or not (building / 'system.reg').exists():
+                shutil.rmtree(building, ignore_errors=True)
+                print("⚠️ Wine prefix template boot failed")
+                return False
+
+            self.freeze(building)
+            (building / STAMP_FILE).write_text(self.wine_version())
+            old = self.path.with_name(self.path.name + f'.old-{os.getpid()}')
+            if self.path.exists():
+                self.path.rename(old)
+            building.rename(self.path)
+            shutil.rmtree(old, ignore_errors=True)
+            return True
+
+    def freeze(self, root: Path):
+        """Make shared files read-only so a write through a hardlinked clone can't alter the template"""
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(dirpath, name)
+                if is_private(os.path.relpath(path, root)):
+                    continue
+                if not os.path.islink(path):
+                    mode = stat.S_IMODE(os.lstat(path).st_mode)
+                    os.chmod(path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+    def clone(self, prefix) -> Optional[Dict[str, Any]]:
+        """Create prefix from the template; None if no template could be built"""
+        if not self.ensure():
+            return None
+        prefix = Path(prefix)
+        prefix.parent.mkdir(parents=True, exist_ok=True)
+        # Clone beside the destination and rename, so a half-copied prefix is never visible
+        staging = prefix.with_name(f'.{prefix.name}.clone-{os.getpid()}-{time.time_ns()}')
+        cloner = PrefixCloner()
+        started = time.perf_counter()
+        try:
+            cloner.clone_tree(self.path, staging)
+            staging.rename(prefix)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.clones += 1
+        self.last_clone = dict(cloner.counts, seconds=time.perf_counter() - started)
+        return self.last_clone
+
+    def status(self) -> Dict[str, Any]:
+        return {'path': str(self.path), 'ready': self.ready, 'wine_version': self.version,
+                'clones': self.clones, 'last_clone': self.last_clone}
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Process Supervisor
+Non-blocking launches with a live process table and child reaping
+"""
+
+import os
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+
+class ProcessEntry:
+    __slots__ = ('pid', 'path', 'platform', 'started', 'state', 'returncode',
+                 'ended', 'popen', 'pidfd')
+
+    def __init__(self, popen, path, platform):
+        self.pid = popen.pid
+        self.path = path
+        self.platform = platform
+        self.started = time.time()
+        self.state = 'running'
+        self.returncode = None
+        self.ended = None
+        self.popen = popen
+        self.pidfd = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pid': self.pid,
+            'path': self.path,
+            'platform': self.platform,
+            'started': self.started,
+            'state': self.state,
+            'returncode': self.returncode,
+            'runtime': (self.ended or time.time()) - self.started
+        }
+
+
+class AsyncProcessHandle:
+    """Popen-shaped view of an asyncio subprocess; asyncio's child watcher does the reaping"""
+
+    def __init__(self, process, args):
+        self.process = process
+        self.pid = process.pid
+        self.args = args
+
+    @property
+    def returncode(self):
+        return self.process.returncode
+
+    def poll(self):
+        return self.process.returncode
+
+    def wait(self, timeout: Optional[float] = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.process.returncode is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            time.sleep(0.01)
+        return self.process.returncode
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def send_signal(self, signum):
+        if self.process.returncode is None:
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+class ProcessSupervisor:
+    def __init__(self, history_size: int = 256, poll_interval: float = 0.5):
+        # Live processes only, keyed by PID
+        self.table: Dict[int, ProcessEntry] = {}
+        self.history = deque(maxlen=history_size)
+        self.exit_callbacks = []
+        self.lock = threading.Lock()
+        self.poll_interval = poll_interval
+
+        self.selector = selectors.DefaultSelector()
+        self.wake_r, self.wake_w = os.pipe()
+        os.set_blocking(self.wake_r, False)
+        os.set_blocking(self.wake_w, False)
+        self.selector.register(self.wake_r, selectors.EVENT_READ)
+
+        self.mode = self.choose_reap_mode()
+        self.loop = None
+        self.running = True
+        self.reaper = threading.Thread(target=self.reap_loop, name="alteron-reaper", daemon=True)
+        self.reaper.start()
+
+    def choose_reap_mode(self) -> str:
+        """pidfd on Linux 5.3+, else SIGCHLD (main thread only), else polling"""
+        if hasattr(os, 'pidfd_open'):
+            try:
+                os.close(os.pidfd_open(os.getpid()))
+                return 'pidfd'
+            except OSError:
+                pass
+
+        if threading.current_thread() is threading.main_thread():
+            previous = signal.getsignal(signal.SIGCHLD)
+
+            def on_sigchld(signum, frame):
+                self.wake()
+                if callable(previous):
+                    previous(signum, frame)
+
+            signal.signal(signal.SIGCHLD, on_sigchld)
+            return 'sigchld'
+
+        return 'poll'
+
+    def spawn(self, argv: List[str], path: Optional[str] = None, platform: str = 'unknown',
+              **popen_kwargs) -> ProcessEntry:
+        """Start a process without waiting for it and track it"""
+        popen = subprocess.Popen(argv, **popen_kwargs)
+        entry = ProcessEntry(popen, path or argv[0], platform)
+
+        with self.lock:
+            self.table[entry.pid] = entry
+            if self.mode == 'pidfd':
+                try:
+                    entry.pidfd = os.pidfd_open(entry.pid)
+                    if self.loop is not None:
+                        self.loop.call_soon_threadsafe(self.loop.add_reader, entry.pidfd, self.reap)
+                    else:
+                        self.selector.register(entry.pidfd, selectors.EVENT_READ, entry)
+                except OSError:
+                    entry.pidfd = None
+
+        # Child may have exited before registration
+        self.wake()
+        return entry
+
+    def adopt(self, process, argv: List[str], path: Optional[str] = None,
+              platform: str = 'unknown') -> ProcessEntry:
+        """Track a process started with asyncio.create_subprocess_exec"""
+        return self.track(AsyncProcessHandle(process, argv), path, platform)
+
+    def track(self, handle, path: Optional[str] = None, platform: str = 'unknown',
+              watch_fd: Optional[int] = None) -> ProcessEntry:
+        """Track a Popen-shaped handle for a process we did not fork ourselves.
+
+        watch_fd, if given, becomes readable when the handle's exit status is
+        available; it is watched like a pidfd so the exit is noticed promptly.
+        """
+        entry = ProcessEntry(handle, path or handle.args[0], platform)
+        with self.lock:
+            self.table[entry.pid] = entry
+            if watch_fd is not None:
+                # Our own duplicate: mark_exited closes it whatever the handle does with the original
+                entry.pidfd = os.dup(watch_fd)
+                if self.loop is not None:
+                    self.loop.call_soon_threadsafe(self.loop.add_reader, entry.pidfd, self.reap)
+                else:
+                    self.selector.register(entry.pidfd, selectors.EVENT_READ, entry)
+        self.wake()
+        return entry
+
+    def wake(self):
+        try:
+            os.write(self.wake_w, b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def reap_loop(self):
+        while self.running:
+            timeout = None if self.mode == 'pidfd' else self.poll_interval
+            events = self.selector.select(timeout)
+
+            for key, _ in events:
+                if key.fd == self.wake_r:
+                    self.drain_wake()
+                    break
+            else:
+                self.reap()
+
+    def attach_loop(self, loop):
+        """Reap from an asyncio loop instead of the reaper thread (call on the loop)"""
+        with self.lock:
+            self.running = False
+            self.wake()
+        self.reaper.join(timeout=1.0)
+
+        with self.lock:
+            self.loop = loop
+            for entry in self.table.values():
+                if entry.pidfd is not None:
+                    self.selector.unregister(entry.pidfd)
+                    loop.add_reader(entry.pidfd, self.reap)
+            self.selector.unregister(self.wake_r)
+            loop.add_reader(self.wake_r, self.drain_wake)
+
+        if self.mode == 'poll':
+            self.schedule_loop_poll()
+        self.reap()
+
+    def drain_wake(self):
+        try:
+            while os.read(self.wake_r, 512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        self.reap()
+
+    def schedule_loop_poll(self):
+        if self.running or self.loop is None or self.loop.is_closed():
+            return
+        self.reap()
+        self.loop.call_later(self.poll_interval, self.schedule_loop_poll)
+
+    def release_loop_pidfd(self, pidfd):
+        self.loop.remove_reader(pidfd)
+        os.close(pidfd)
+
+    def reap(self):
+        """Collect exited children; Popen.poll() keeps blocking waiters consistent"""
+        with self.lock:
+            entries = list(self.table.values())
+
+        for entry in entries:
+            if entry.popen.poll() is not None:
+                self.mark_exited(entry)
+
+    def mark_exited(self, entry: ProcessEntry):
+        with self.lock:
+            if entry.pid not in self.table:
+                return
+
+            entry.returncode = entry.popen.returncode
+            entry.ended = time.time()
+            if entry.returncode < 0:
+                entry.state = 'killed'
+            elif entry.returncode == 0:
+                entry.state = 'exited'
+            else:
+                entry.state = 'failed'
+
+            del self.table[entry.pid]
+            if entry.pidfd is not None:
+                if self.loop is not None:
+                    self.loop.call_soon_threadsafe(self.release_loop_pidfd, entry.pidfd)
+                else:
+                    self.selector.unregister(entry.pidfd)
+                    os.close(entry.pidfd)
+                entry.pidfd = None
+            self.history.append(entry)
+
+        for callback in list(self.exit_callbacks):
+            try:
+                callback(entry)
+            except Exception as e:
+                print(f"⚠️ Process exit callback failed: {e}")
+
+    def on_exit(self, callback):
+        """Register callback(entry) for every process exit"""
+        self.exit_callbacks.append(callback)
+
+    def wait(self, pid: int, timeout: Optional[float] = None) -> Optional[int]:
+        """Block until a supervised process exits and return its code"""
+        entry = self.table.get(pid)
+        if entry is None:
+            finished = next((e for e in reversed(self.history) if e.pid == pid), None)
+            return finished.returncode if finished else None
+        returncode = entry.popen.wait(timeout)
+        self.mark_exited(entry)
+        return returncode
+
+    def get(self, pid: int) -> Optional[ProcessEntry]:
+        return self.table.get(pid)
+
+    def terminate(self, pid: int, kill_after: float = 5.0) -> bool:
+        """SIGTERM a process, SIGKILL it if it ignores us"""
+        entry = self.table.get(pid)
+        if entry is None:
+            return False
+        entry.popen.terminate()
+        try:
+            entry.popen.wait(kill_after)
+        except subprocess.TimeoutExpired:
+            entry.popen.kill()
+            entry.popen.wait()
+        self.mark_exited(entry)
+        return True
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [entry.to_dict() for entry in list(self.table.values())]
+
+    def __len__(self):
+        return len(self.table)
+
+    def shutdown(self, terminate: bool = False):
+        if terminate:
+            for pid in list(self.table):
+                self.terminate(pid)
+        self.running = False
+        self.wake()
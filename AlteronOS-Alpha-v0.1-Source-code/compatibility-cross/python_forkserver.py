@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Python Fork Server
+Warm interpreter that forks a fresh child per script launch
+
+Protocol (SOCK_SEQPACKET, one JSON message each way per step):
+  client -> {"script", "args", "env", "cwd", "limits"} with stdin/stdout/stderr fds attached
+  server -> {"pid": N} or {"error": "..."}, then {"returncode": N} when the child exits
+"""
+
+import atexit
+import importlib
+import json
+import os
+import resource
+import runpy
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+DEFAULT_PRELOAD = ('json', 're', 'os', 'sys', 'pathlib', 'collections', 'itertools', 'functools',
+                   'datetime', 'subprocess', 'typing', 'dataclasses', 'argparse', 'logging',
+                   'random', 'math', 'urllib.request', 'threading')
+
+
+def preload(modules):
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def apply_limits(limits):
+    if limits.get('cpu_seconds') is not None:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits['cpu_seconds'], limits['cpu_seconds']))
+    if limits.get('address_space') is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (limits['address_space'], limits['address_space']))
+    if limits.get('nice'):
+        os.nice(limits['nice'])
+
+
+def run_child(request, fds) -> int:
+    """Become `python3 script args...` in this forked process and return its exit code"""
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        if fd > 2:
+            os.close(fd)
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    script = request['script']
+    os.environ.clear()
+    os.environ.update(request.get('env') or {})
+    if request.get('cwd'):
+        os.chdir(request['cwd'])
+    apply_limits(request.get('limits') or {})
+    if os.environ.get('PYTHONUNBUFFERED'):
+        sys.stdout.reconfigure(write_through=True)
+        sys.stderr.reconfigure(write_through=True)
+
+    sys.argv = [script] + list(request.get('args') or [])
+    # Same as `python3 script.py`: the script's directory, not ours, heads sys.path
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+
+    if not os.path.isfile(script):
+        print(f"{sys.executable}: can't open file '{script}': [Errno 2] No such file or directory",
+              file=sys.stderr)
+        return 2
+
+    code = 0
+    interrupted = False
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Start the traceback at the script, as `python3 script.py` would, not in runpy or here
+        tb, script_file = e.__traceback__, os.path.abspath(script)
+        while tb is not None and os.path.abspath(tb.tb_frame.f_code.co_filename) != script_file:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb)
+        code = 1
+        interrupted = isinstance(e, KeyboardInterrupt)
+
+    # What interpreter shutdown would do: wait for non-daemon threads, run atexit, flush
+    for thread in threading.enumerate():
+        if thread is not threading.main_thread() and not thread.daemon:
+            thread.join()
+    atexit._run_exitfuncs()
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    if interrupted:
+        # python3 dies of the SIGINT it didn't handle, so its parent sees -2, not 1
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGINT)
+    return code & 0xFF
+
+
+def send(conn, message):
+    try:
+        conn.send(json.dumps(message).encode())
+    except OSError:
+        pass
+
+
+def serve(socket_path, idle_timeout, parent=None):
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    listener.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    listener.listen(64)
+
+    # Single-threaded on purpose: forking a multi-threaded process can deadlock the child
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    # SIGTERM stops new launches; the server stays until running scripts report their exit codes
+    draining = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: draining.append(signum))
+
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ, 'accept')
+    selector.register(wake_r, selectors.EVENT_READ, 'signal')
+    children = {}
+    last_active = time.monotonic()
+
+    print('ready', flush=True)
+    try:
+        while True:
+            events = selector.select(timeout=1.0)
+            for key, _ in events:
+                if key.data == 'accept':
+                    conn, _ = listener.accept()
+                    selector.register(conn, selectors.EVENT_READ, 'request')
+                elif key.data == 'signal':
+                    try:
+                        while os.read(wake_r, 512):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    reap(children)
+                else:
+                    handle_request(key.fileobj, selector, listener, wake_r, wake_w, children)
+            reap(children)
+
+            if draining or (parent and os.getppid() != parent):
+                if listener.fileno() >= 0:
+                    selector.unregister(listener)
+                    listener.close()
+                if not children:
+                    return
+            elif children or len(selector.get_map()) > 2:
+                last_active = time.monotonic()
+            elif idle_timeout and time.monotonic() - last_active > idle_timeout:
+                return
+    finally:
+        listener.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def handle_request(conn, selector, listener, wake_r, wake_w, children):
+    selector.unregister(conn)
+    try:
+        data, fds, _, _ = socket.recv_fds(conn, 1 << 20, 3)
+    except OSError:
+        conn.close()
+        return
+    if not data:
+        conn.close()
+        for fd in fds:
+            os.close(fd)
+        return
+
+    try:
+        request = json.loads(data)
+        if len(fds) != 3:
+            raise ValueError(f"expected 3 fds, got {len(fds)}")
+    except ValueError as e:
+        send(conn, {'error': f"bad request: {e}"})
+        conn.close()
+        for fd in fds:
+            os.close(fd)
+        return
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            listener.close()
+            conn.close()
+            selector.close()
+            signal.set_wakeup_fd(-1)
+            os.close(wake_r)
+            os.close(wake_w)
+            code = run_child(request, fds)
+        finally:
+            os._exit(code)
+
+    for fd in fds:
+        os.close(fd)
+    send(conn, {'pid': pid})
+    children[pid] = conn
+
+
+def reap(children):
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        conn = children.pop(pid, None)
+        if conn is not None:
+            send(conn, {'returncode': os.waitstatus_to_exitcode(status)})
+            conn.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AlteronOS Python fork server")
+    parser.add_argument('--socket', required=True)
+    parser.add_argument('--idle', type=float, default=600.0)
+    parser.add_argument('--parent', type=int, default=None)
+    parser.add_argument('--preload', default=','.join(DEFAULT_PRELOAD))
+    options = parser.parse_args()
+
+    # runpy.run_path imports pkgutil on first use; do it once here rather than in every child
+    preload(['pkgutil'] + [name for name in options.preload.split(',') if name])
+    serve(options.socket, options.idle, options.parent)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Python Pool
+.py launches forked from a warm, preimported interpreter instead of a cold python3
+"""
+
+import json
+import os
+import select
+import signal
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from python_forkserver import DEFAULT_PRELOAD
+
+SERVER_SCRIPT = str(Path(__file__).resolve().with_name('python_forkserver.py'))
+DEFAULT_SOCKET_DIR = Path(os.environ.get('XDG_RUNTIME_DIR') or Path.home() / '.alteronos' / 'run')
+START_TIMEOUT = 10.0
+# Applied per launch by the child; every other PYTHON* variable is fixed when the server starts
+CHILD_PYTHON_VARS = {'PYTHONUNBUFFERED'}
+
+
+def python_vars(env) -> Dict[str, str]:
+    """The PYTHON* settings an interpreter reads at startup (PYTHONPATH, PYTHONIOENCODING, ...)"""
+    return {key: value for key, value in env.items()
+            if key.startswith('PYTHON') and key not in CHILD_PYTHON_VARS}
+
+
+class PooledProcess:
+    """Popen-shaped handle for a script running in a child of the fork server.
+
+    The child is the server's, not ours, so its exit status arrives as a
+    message on the launch connection; fileno() becomes readable when it does.
+    """
+
+    def __init__(self, conn, pid: int, args, stdin=None, stdout=None, stderr=None):
+        self.conn = conn
+        self.pid = pid
+        self.args = args
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = None
+        self.error = None
+        self.lock = threading.Lock()
+
+    def fileno(self) -> int:
+        return self.conn.fileno()
+
+    def read_status(self):
+        try:
+            data = self.conn.recv(4096, socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if data:
+            self.returncode = json.loads(data)['returncode']
+        else:
+            # The server died first; its orphaned child would run unsupervised, so stop it
+            self.error = "python fork server exited"
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self.returncode = -signal.SIGKILL
+        self.conn.close()
+
+    def poll(self):
+        with self.lock:
+            if self.returncode is None:
+                self.read_status()
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            try:
+                select.select([self.conn], [], [], remaining)
+            except (OSError, ValueError):
+                # Closed by a concurrent poll(); the next poll() returns its code
+                pass
+        return self.returncode
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def send_signal(self, signum):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+class PythonPool:
+    def __init__(self, python: str = 'python3', preload=DEFAULT_PRELOAD, idle_timeout: float = 600.0,
+                 socket_dir=None):
+        self.python = python
+        self.preload = list(preload)
+        self.idle_timeout = idle_timeout
+        self.socket_path = Path(socket_dir or DEFAULT_SOCKET_DIR) / f"alteron-pyfork-{os.getpid()}.sock"
+        self.server = None
+        self.server_vars = None
+        self.startup_seconds = None
+        self.launches = 0
+        self.lock = threading.Lock()
+
+    def alive(self) -> bool:
+        return self.server is not None and self.server.poll() is None
+
+    def start(self) -> bool:
+        """Start the fork server (it exits after idle_timeout with nothing running)"""
+        with self.lock:
+            if self.alive():
+                return True
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            started = time.perf_counter()
+            self.server_vars = python_vars(os.environ)
+            try:
+                self.server = subprocess.Popen(
+                    [self.python, SERVER_SCRIPT, '--socket', str(self.socket_path),
+                     '--idle', str(self.idle_timeout), '--parent', str(os.getpid()),
+                     '--preload', ','.join(self.preload)],
+                    stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, start_new_session=True)
+            except OSError as e:
+                print(f"⚠️ Python fork server failed to start: {e}")
+                self.server = None
+                return False
+
+            ready, _, _ = select.select([self.server.stdout], [], [], START_TIMEOUT)
+            line = self.server.stdout.readline() if ready else b''
+            self.server.stdout.close()
+            if line.strip() != b'ready':
+                print("⚠️ Python fork server did not come up")
+                self.server.kill()
+                self.server.wait()
+                self.server = None
+                return False
+            self.startup_seconds = time.perf_counter() - started
+            return True
+
+    def accepts(self, env=None) -> bool:
+        """Whether a launch with env can fork from the server: its children inherit the server's PYTHON* settings"""
+        server_vars = self.server_vars if self.alive() else python_vars(os.environ)
+        return python_vars(os.environ if env is None else env) == server_vars
+
+    def connect(self):
+        for attempt in range(2):
+            if not self.start():
+                raise RuntimeError("python fork server unavailable")
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            try:
+                conn.connect(str(self.socket_path))
+                return conn
+            except (FileNotFoundError, ConnectionRefusedError):
+                # Idled out between our check and the connect; start a new one
+                conn.close()
+                if self.server is not None:
+                    self.server.wait()
+        raise RuntimeError("python fork server refused the connection")
+
+    def stdio(self, stdin, stdout, stderr):
+        """(fds for the child, fds to close once sent, our pipe ends) following Popen's conventions"""
+        child_fds, sent, ends = [], [], []
+        for target, spec in enumerate((stdin, stdout, stderr)):
+            end = None
+            if spec == subprocess.PIPE:
+                r, w = os.pipe()
+                fd, ours = (r, w) if target == 0 else (w, r)
+                end = open(ours, 'wb' if target == 0 else 'rb')
+                sent.append(fd)
+            elif spec == subprocess.DEVNULL:
+                fd = os.open(os.devnull, os.O_RDWR)
+                sent.append(fd)
+            elif spec == subprocess.STDOUT and target == 2:
+                fd = child_fds[1]
+            elif spec is None:
+                fd = target
+            else:
+                fd = spec if isinstance(spec, int) else spec.fileno()
+            child_fds.append(fd)
+            ends.append(end)
+        return child_fds, sent, ends
+
+    def spawn(self, script: str, args=(), env=None, cwd=None, stdin=None, stdout=None, stderr=None,
+              limits: Optional[Dict[str, Any]] = None) -> PooledProcess:
+        """Run script in a fresh fork of the warm interpreter; raises RuntimeError/OSError if the pool can't"""
+        request = json.dumps({
+            'script': script,
+            'args': list(args),
+            'env': dict(os.environ if env is None else env),
+            'cwd': cwd or os.getcwd(),
+            'limits': limits or {}
+        }).encode()
+
+        conn = self.connect()
+        child_fds, sent, ends = self.stdio(stdin, stdout, stderr)
+        try:
+            socket.send_fds(conn, [request], child_fds)
+            reply = conn.recv(4096)
+        except OSError:
+            conn.close()
+            for end in ends:
+                if end is not None:
+                    end.close()
+            raise
+        finally:
+            for fd in sent:
+                os.close(fd)
+
+        message = json.loads(reply) if reply else {'error': "fork server closed the connection"}
+        if 'pid' not in message:
+            conn.close()
+            for end in ends:
+                if end is not None:
+                    end.close()
+            raise RuntimeError(message.get('error'))
+        self.launches += 1
+        return PooledProcess(conn, message['pid'], [self.python, script] + list(args), *ends)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'running': self.alive(),
+            'pid': self.server.pid if self.alive() else None,
+            'socket': str(self.socket_path),
+            'startup_seconds': self.startup_seconds,
+            'launches': self.launches,
+            'preload': self.preload
+        }
+
+    def stop(self, timeout: float = 5.0):
+        """Stop taking launches; the server exits once the scripts it forked have finished"""
+        if not self.alive():
+            return
+        self.server.terminate()
+        try:
+            self.server.wait(timeout)
+        except subprocess.TimeoutExpired:
+            pass
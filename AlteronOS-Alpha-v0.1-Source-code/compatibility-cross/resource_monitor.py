@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Resource Monitor
+CPU, memory, I/O and fd usage of supervised apps sampled from /proc
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+PROC = '/proc'
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# Field positions in /proc/<pid>/stat after the ")" closing the command name
+STAT_STATE = 0
+STAT_UTIME = 11
+STAT_STIME = 12
+STAT_THREADS = 17
+
+
+class ProcessUsage:
+    __slots__ = ('pid', 'cpu_ticks', 'sampled', 'samples', 'latest')
+
+    def __init__(self, pid: int, window: int):
+        self.pid = pid
+        self.cpu_ticks = None
+        self.sampled = None
+        # (time, cpu_percent, rss_bytes, read_bytes, write_bytes, fds)
+        self.samples = deque(maxlen=window)
+        self.latest = None
+
+    def summary(self) -> Dict[str, Any]:
+        latest = self.latest or {}
+        cpu = [sample[1] for sample in self.samples]
+        rss = [sample[2] for sample in self.samples]
+        return dict(latest,
+                    pid=self.pid,
+                    cpu_avg=sum(cpu) / len(cpu) if cpu else 0.0,
+                    cpu_max=max(cpu, default=0.0),
+                    rss_peak=max(rss, default=0),
+                    window=len(self.samples))
+
+
+class ResourceMonitor:
+    def __init__(self, supervisor, interval: float = 2.0, window: int = 30, count_fds: bool = True):
+        self.supervisor = supervisor
+        self.interval = interval
+        self.window = window
+        self.count_fds = count_fds
+        self.available = os.path.isdir(os.path.join(PROC, 'self'))
+        self.usage: Dict[int, ProcessUsage] = {}
+        # One read buffer per sampling thread (the app manager's and the kernel executor's)
+        self.buffers = threading.local()
+        self.last_sample_cost = 0.0
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def read_proc(self, pid: int, name: str) -> Optional[bytes]:
+        """Read a small /proc file into this thread's reusable buffer"""
+        buffer = getattr(self.buffers, 'buffer', None)
+        if buffer is None:
+            buffer = self.buffers.buffer = bytearray(4096)
+        try:
+            fd = os.open(f"{PROC}/{pid}/{name}", os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            size = os.readv(fd, [buffer])
+            return bytes(memoryview(buffer)[:size])
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+
+    def sample_process(self, pid: int, now: float) -> Optional[Dict[str, Any]]:
+        stat = self.read_proc(pid, 'stat')
+        if stat is None:
+            return None
+        fields = stat[stat.rindex(b')') + 2:].split()
+        cpu_ticks = int(fields[STAT_UTIME]) + int(fields[STAT_STIME])
+
+        statm = self.read_proc(pid, 'statm')
+        rss = int(statm.split()[1]) * PAGE_SIZE if statm else 0
+
+        read_bytes = write_bytes = None
+        io = self.read_proc(pid, 'io')
+        if io:
+            for line in io.splitlines():
+                if line.startswith(b'read_bytes:'):
+                    read_bytes = int(line[11:])
+                elif line.startswith(b'write_bytes:'):
+                    write_bytes = int(line[12:])
+
+        fds = None
+        if self.count_fds:
+            try:
+                fds = len(os.listdir(f"{PROC}/{pid}/fd"))
+            except OSError:
+                pass
+
+        usage = self.usage.get(pid)
+        if usage is None:
+            usage = self.usage[pid] = ProcessUsage(pid, self.window)
+        cpu_percent = 0.0
+        if usage.cpu_ticks is not None and now > usage.sampled:
+            cpu_percent = 100.0 * (cpu_ticks - usage.cpu_ticks) / CLOCK_TICKS / (now - usage.sampled)
+        usage.cpu_ticks = cpu_ticks
+        usage.sampled = now
+
+        usage.samples.append((now, cpu_percent, rss, read_bytes, write_bytes, fds))
+        usage.latest = {
+            'state': fields[STAT_STATE].decode(),
+            'threads': int(fields[STAT_THREADS]),
+            'cpu_percent': cpu_percent,
+            'cpu_seconds': cpu_ticks / CLOCK_TICKS,
+            'rss': rss,
+            'read_bytes': read_bytes,
+            'write_bytes': write_bytes,
+            'fds': fds
+        }
+        return usage.latest
+
+    def sample(self):
+        """One pass over every supervised process"""
+        if not self.available:
+            return
+        started = time.perf_counter()
+        now = time.monotonic()
+        live = list(self.supervisor.table)
+        for pid in live:
+            self.sample_process(pid, now)
+
+        # Forget processes that have exited
+        for pid in set(self.usage) - set(live):
+            del self.usage[pid]
+        self.last_sample_cost = time.perf_counter() - started
+
+    def get(self, pid: int) -> Optional[Dict[str, Any]]:
+        usage = self.usage.get(pid)
+        return usage.summary() if usage else None
+
+    def all_usage(self) -> List[Dict[str, Any]]:
+        return [usage.summary() for usage in list(self.usage.values())]
+
+    def totals(self) -> Dict[str, Any]:
+        """Aggregate usage across all monitored apps"""
+        latest = [usage.latest for usage in list(self.usage.values()) if usage.latest]
+        return {
+            'processes': len(latest),
+            'cpu_percent': sum(item['cpu_percent'] for item in latest),
+            'rss': sum(item['rss'] for item in latest),
+            'read_bytes': sum(item['read_bytes'] or 0 for item in latest),
+            'write_bytes': sum(item['write_bytes'] or 0 for item in latest),
+            'fds': sum(item['fds'] or 0 for item in latest),
+            'interval': self.interval,
+            'sample_cost_ms': self.last_sample_cost * 1000
+        }
+
+    def start(self):
+        """Sample on a background thread (standalone use; the kernel samples from its loop)"""
+        if self.thread is None and self.available:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.sample_loop, name="alteron-resmon", daemon=True)
+            self.thread.start()
+        return self
+
+    def sample_loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
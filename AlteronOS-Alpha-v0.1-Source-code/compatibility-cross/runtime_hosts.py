@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Runtime Hosts
+Warm node processes that run .js apps without a cold start each
+"""
+
+import atexit
+import itertools
+import json
+import os
+import select
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+HOST_DIR = Path(__file__).resolve().parent
+HOST_SUFFIXES = {'.js': 'node'}
+START_TIMEOUT = 30.0
+RUN_START_TIMEOUT = 10.0
+
+
+def host_command(runtime: str, idle_timeout: float) -> Optional[list]:
+    if runtime == 'node':
+        return ['node', str(HOST_DIR / 'node_host.js'), str(idle_timeout)]
+    return None
+
+
+class HostedRun:
+    """Popen-shaped handle for an app running inside a runtime host (pid is the host's)"""
+
+    def __init__(self, host, run_id: int, args, stdout, stderr):
+        self.host = host
+        self.id = run_id
+        self.pid = host.pid
+        self.args = args
+        self.stdin = None
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = None
+        self.error = None
+        self.started = threading.Event()
+        self.done = threading.Event()
+
+    def finish(self, returncode: int, error: Optional[str] = None):
+        self.returncode = returncode
+        self.error = error
+        self.started.set()
+        self.done.set()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None):
+        if not self.done.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def send_signal(self, signum):
+        # The host ends the run and reports -signum, as if the app had been a process
+        if self.returncode is None:
+            self.host.send({'id': self.id, 'op': 'stop', 'signal': int(signum)})
+
+
+class RuntimeHost:
+    def __init__(self, runtime: str, command: list, fifo_dir: Path):
+        self.runtime = runtime
+        self.command = command
+        self.fifo_dir = fifo_dir
+        self.popen = None
+        self.info: Dict[str, Any] = {}
+        self.cwd = None
+        self.env = None
+        self.runs: Dict[int, HostedRun] = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.startup_seconds = None
+        self.launches = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.popen.pid if self.popen is not None else None
+
+    def alive(self) -> bool:
+        return self.popen is not None and self.popen.poll() is None
+
+    def start(self):
+        """Start the host if it isn't running (it exits by itself after its idle timeout)"""
+        with self.lock:
+            if self.alive():
+                return
+            started = time.perf_counter()
+            self.cwd, self.env = os.getcwd(), dict(os.environ)
+            popen = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     cwd=self.cwd, start_new_session=True)
+            ready, _, _ = select.select([popen.stdout], [], [], START_TIMEOUT)
+            try:
+                info = json.loads(popen.stdout.readline()) if ready else {}
+            except ValueError:
+                info = {}
+            if not info.get('ready'):
+                popen.kill()
+                popen.wait()
+                raise RuntimeError(f"{self.runtime} host did not come up")
+
+            self.popen, self.info = popen, info
+            self.startup_seconds = time.perf_counter() - started
+            threading.Thread(target=self.read_events, args=(popen,), name=f"alteron-{self.runtime}-host",
+                             daemon=True).start()
+
+    def read_events(self, popen):
+        for line in popen.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            run = self.runs.get(message.get('id'))
+            if run is None:
+                continue
+            event = message.get('event')
+            if event == 'started':
+                run.started.set()
+            elif event in ('exit', 'error'):
+                self.runs.pop(run.id, None)
+                run.finish(message.get('code', 1), message.get('error'))
+
+        # The host is gone and its apps with it
+        popen.wait()
+        for run in list(self.runs.values()):
+            self.runs.pop(run.id, None)
+            run.finish(-signal.SIGKILL, f"{self.runtime} host exited")
+
+    def send(self, message):
+        with self.write_lock:
+            self.popen.stdin.write(json.dumps(message).encode() + b'\n')
+            self.popen.stdin.flush()
+
+    def accepts(self, env, cwd) -> bool:
+        """Workers share the host's cwd, and its environment unless the host can swap it per run"""
+        if os.path.abspath(cwd or os.getcwd()) != self.cwd:
+            return False
+        if not self.info.get('env') and dict(os.environ if env is None else env) != self.env:
+            return False
+        return True
+
+    def run(self, path: str, args=(), env=None, cwd=None) -> Optional[HostedRun]:
+        """Start an app in the host; None when it needs an isolation the host can't give"""
+        self.start()
+        if not self.accepts(env, cwd):
+            return None
+
+        run_id = next(self.ids)
+        fifos = [self.fifo_dir / f"{self.runtime}-{os.getpid()}-{run_id}.{name}" for name in ('out', 'err')]
+        ends = []
+        try:
+            for fifo in fifos:
+                os.mkfifo(fifo, 0o600)
+                # Opened before the host so its open-for-write doesn't block
+                ends.append(open(os.open(fifo, os.O_RDONLY | os.O_NONBLOCK), 'rb'))
+            run = HostedRun(self, run_id, [str(path)] + list(args), *ends)
+            self.runs[run_id] = run
+            self.send({'id': run_id, 'op': 'run', 'path': os.path.abspath(path), 'args': list(args),
+                       'env': dict(os.environ if env is None else env),
+                       'stdout': str(fifos[0]), 'stderr': str(fifos[1])})
+            if not run.started.wait(RUN_START_TIMEOUT):
+                run.kill()
+                raise RuntimeError(f"{self.runtime} host did not start {path}")
+            if run.error is not None:
+                raise RuntimeError(run.error)
+        except (OSError, RuntimeError):
+            self.runs.pop(run_id, None)
+            for end in ends:
+                end.close()
+            raise
+        finally:
+            for fifo in fifos:
+                try:
+                    fifo.unlink()
+                except FileNotFoundError:
+                    pass
+        self.launches += 1
+        return run
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'running': self.alive(),
+            'pid': self.pid if self.alive() else None,
+            'version': self.info.get('version'),
+            'startup_seconds': self.startup_seconds,
+            'launches': self.launches,
+            'active': len(self.runs)
+        }
+
+    def stop(self):
+        """Close the host's stdin: it takes no more apps and exits once running ones finish"""
+        if self.alive():
+            try:
+                self.popen.stdin.close()
+            except OSError:
+                pass
+
+
+class RuntimeHosts:
+    def __init__(self, idle_timeout: float = 300.0):
+        self.idle_timeout = idle_timeout
+        self.hosts: Dict[str, RuntimeHost] = {}
+        self.unavailable: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.fifo_dir = Path(tempfile.mkdtemp(prefix='alteron-hosts-'))
+        atexit.register(shutil.rmtree, self.fifo_dir, True)
+
+    def host(self, runtime: str) -> Optional[RuntimeHost]:
+        with self.lock:
+            if runtime in self.unavailable:
+                return None
+            host = self.hosts.get(runtime)
+            if host is None:
+                command = host_command(runtime, self.idle_timeout)
+                if command is None:
+                    self.unavailable[runtime] = "no suitable runtime"
+                    return None
+                host = self.hosts[runtime] = RuntimeHost(runtime, command, self.fifo_dir)
+        return host
+
+    def spawn(self, path: str, args=(), env=None, cwd=None) -> Optional[HostedRun]:
+        """Run a .js app in its warm host; None means use a one-shot process instead"""
+        runtime = HOST_SUFFIXES.get(Path(path).suffix)
+        host = self.host(runtime) if runtime else None
+        if host is None:
+            return None
+        try:
+            return host.run(path, args, env=env, cwd=cwd)
+        except (OSError, RuntimeError) as e:
+            if host.startup_seconds is None:
+                # Never came up: stop trying for this runtime
+                self.unavailable[runtime] = str(e)
+            print(f"⚠️ {runtime} runtime host unavailable, using a new process: {e}")
+            return None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'hosts': {runtime: host.status() for runtime, host in list(self.hosts.items())},
+            'unavailable': dict(self.unavailable)
+        }
+
+    def shutdown(self):
+        for host in list(self.hosts.values()):
+            host.stop()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Signature Engine
+Table-driven executable/package detection from one header and one trailer read
+"""
+
+import os
+import struct
+from typing import Callable, Dict, List, Optional, Tuple
+
+HEADER_SIZE = 4096
+TRAILER_SIZE = 4096
+
+# Interpreters whose scripts run through the cross-platform runners
+PORTABLE_INTERPRETERS = ('python', 'node', 'java')
+
+
+class Signature:
+    __slots__ = ('kind', 'platform', 'region', 'offset', 'magic', 'verify', 'priority')
+
+    def __init__(self, kind: str, platform: str, region: str, offset: int, magic: bytes,
+                 verify: Optional[Callable] = None, priority: int = 0):
+        self.kind = kind
+        self.platform = platform
+        self.region = region      # 'header' or 'trailer' (offset from the end when negative)
+        self.offset = offset
+        self.magic = magic
+        self.verify = verify
+        self.priority = priority
+
+    def matches(self, header: bytes, trailer: bytes, size: int) -> bool:
+        block = header if self.region == 'header' else trailer
+        start = self.offset if self.offset >= 0 else len(block) + self.offset
+        if start < 0 or block[start:start + len(self.magic)] != self.magic:
+            return False
+        return self.verify is None or self.verify(header, trailer, size)
+
+
+def verify_pe(header, trailer, size):
+    """MZ stub whose e_lfanew points at a PE signature (any DOS stub)"""
+    if len(header) < 0x40:
+        return False
+    pe_offset = struct.unpack_from('<I', header, 0x3C)[0]
+    return header[pe_offset:pe_offset + 4] == b'PE\0\0'
+
+
+def verify_fat_macho(header, trailer, size):
+    """Fat headers share CAFEBABE with Java classes; a fat binary has a handful of archs"""
+    return len(header) >= 8 and 0 < struct.unpack_from('>I', header, 4)[0] < 30
+
+
+def verify_udif(header, trailer, size):
+    """koly block is the last 512 bytes of a UDIF disk image"""
+    return size >= 512
+
+
+def verify_jar(header, trailer, size):
+    return b'META-INF/' in header
+
+
+SIGNATURES: List[Signature] = [
+    # Linux (AppImage is an ELF with its own marker, so it ranks first)
+    Signature('appimage', 'linux', 'header', 8, b'AI\x02', priority=10),
+    Signature('appimage', 'linux', 'header', 8, b'AI\x01', priority=10),
+    Signature('elf', 'linux', 'header', 0, b'\x7fELF'),
+    Signature('deb', 'linux', 'header', 0, b'!<arch>\ndebian-binary', priority=5),
+    Signature('rpm', 'linux', 'header', 0, b'\xed\xab\xee\xdb'),
+
+    # Windows
+    Signature('pe', 'windows', 'header', 0, b'MZ', verify=verify_pe, priority=5),
+    Signature('dos', 'windows', 'header', 0, b'MZ'),
+    Signature('msi', 'windows', 'header', 0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),
+
+    # macOS
+    Signature('macho', 'macos', 'header', 0, b'\xfe\xed\xfa\xce'),
+    Signature('macho', 'macos', 'header', 0, b'\xfe\xed\xfa\xcf'),
+    Signature('macho', 'macos', 'header', 0, b'\xce\xfa\xed\xfe'),
+    Signature('macho', 'macos', 'header', 0, b'\xcf\xfa\xed\xfe'),
+    Signature('macho-fat', 'macos', 'header', 0, b'\xca\xfe\xba\xbe', verify=verify_fat_macho, priority=5),
+    Signature('macho-fat', 'macos', 'header', 0, b'\xca\xfe\xba\xbf', verify=verify_fat_macho, priority=5),
+    Signature('xar-pkg', 'macos', 'header', 0, b'xar!'),
+    Signature('udif-dmg', 'macos', 'trailer', -512, b'koly', verify=verify_udif, priority=5),
+
+    # Cross-platform
+    Signature('java-class', 'cross_platform', 'header', 0, b'\xca\xfe\xba\xbe'),
+    Signature('jar', 'cross_platform', 'header', 0, b'PK\x03\x04', verify=verify_jar, priority=5),
+    Signature('zip', 'unknown', 'header', 0, b'PK\x03\x04'),
+]
+
+
+class SignatureEngine:
+    def __init__(self, signatures: Optional[List[Signature]] = None):
+        self.signatures = signatures if signatures is not None else SIGNATURES
+        # Offset-0 header signatures are bucketed by their first byte; the rest are always tried
+        self.by_first_byte: Dict[int, List[Signature]] = {}
+        self.always: List[Signature] = []
+        for signature in sorted(self.signatures, key=lambda s: -s.priority):
+            if signature.region == 'header' and signature.offset == 0:
+                self.by_first_byte.setdefault(signature.magic[0], []).append(signature)
+            else:
+                self.always.append(signature)
+
+    def match(self, header: bytes, trailer: bytes = b'', size: Optional[int] = None) -> Tuple[str, str]:
+        """(platform, kind) for the given blocks; ('unknown', 'unknown') if nothing matches"""
+        if size is None:
+            size = len(header)
+        candidates = self.always + self.by_first_byte.get(header[0], []) if header else self.always
+        best = None
+        for signature in candidates:
+            if (best is None or signature.priority > best.priority) and signature.matches(header, trailer, size):
+                best = signature
+        if best is not None:
+            return best.platform, best.kind
+        if header.startswith(b'#!'):
+            return self.match_shebang(header)
+        return 'unknown', 'unknown'
+
+    def match_shebang(self, header: bytes) -> Tuple[str, str]:
+        line = header[2:header.find(b'\n') if b'\n' in header else len(header)].strip()
+        parts = line.split()
+        if not parts:
+            return 'linux', 'script'
+        interpreter = os.path.basename(parts[0])
+        if interpreter == b'env' and len(parts) > 1:
+            interpreter = parts[1]
+        name = interpreter.decode(errors='replace')
+        if name.startswith(PORTABLE_INTERPRETERS):
+            return 'cross_platform', f'script:{name}'
+        return 'linux', f'script:{name}'
+
+    def read_blocks(self, path: str) -> Tuple[bytes, bytes, int]:
+        """One header read and (for larger files) one trailer read"""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            header = os.pread(fd, HEADER_SIZE, 0)
+            # Small files are covered by the header; the trailer may overlap it otherwise
+            trailer = os.pread(fd, TRAILER_SIZE, max(0, size - TRAILER_SIZE)) if size > HEADER_SIZE else header
+            return header, trailer, size
+        finally:
+            os.close(fd)
+
+    def detect(self, path: str) -> Tuple[str, str]:
+        try:
+            header, trailer, size = self.read_blocks(path)
+        except OSError:
+            return 'unknown', 'unknown'
+        return self.match(header, trailer, size)
+
+
+ENGINE = SignatureEngine()
+
+
+def detect_file(path: str) -> Tuple[str, str]:
+    """(platform, kind) of a file using the default signature table"""
+    return ENGINE.detect(path)
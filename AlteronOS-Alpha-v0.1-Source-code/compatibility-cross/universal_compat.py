@@ -4,21 +4,106 @@ Real Universal Compatibility Layer
 Uses actual emulation: Wine/Proton, ELF loader, Darling
 """
 
+import atexit
 import os
+import resource
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from windows_compat import WindowsCompatibility
-from linux_compat import LinuxCompatibility
-from macos_compat import MacOSCompatibility
+from typing import Dict, List
+from process_supervisor import ProcessSupervisor
+from resource_monitor import ResourceMonitor
+from detection_cache import DetectionCache, identity
+from signatures import detect_file
+from output_stream import OutputStream, drain_async_process, stream_process
+from capability_probe import PROBE
+
+# Kernel metrics registry when running under the kernel
+try:
+    from metrics import REGISTRY, record_cache
+    DETECTIONS = REGISTRY.counter('alteron_compat_detections_total', 'Platform detections by result',
+                                  ('platform',))
+except ImportError:
+    DETECTIONS = None
+    record_cache = None
+
+# Platforms recognised from the extension alone (no file access)
+EXTENSION_PLATFORMS = {
+    **dict.fromkeys(['.exe', '.msi', '.dll', '.bat', '.cmd'], 'windows'),
+    **dict.fromkeys(['.deb', '.rpm', '.sh', '.bin', '.appimage'], 'linux'),
+    **dict.fromkeys(['.dmg', '.pkg', '.app', '.command'], 'macos'),
+    **dict.fromkeys(['.py', '.js', '.jar', '.txt'], 'cross_platform')
+}
+
+# Interpreters for cross-platform scripts
+SCRIPT_RUNTIMES = {
+    '.py': ['python3'],
+    '.js': ['node'],
+    '.jar': ['java', '-jar']
+}
+
+# Popen arguments a pooled .py launch can honour; anything else takes the one-shot path
+POOL_KWARGS = {'env', 'cwd', 'stdin', 'stdout', 'stderr'}
+
+
+def limit_command(cmd, limits):
+    """cmd run through prlimit/nice, so the limits hold before the app's first instruction.
+
+    Both exec the next command in place, so the pid is still the app's.
+    None if a needed tool isn't installed.
+    """
+    prefix = []
+    rlimits = [f'--{option}={limits[key]}' for key, option in (('cpu_seconds', 'cpu'), ('address_space', 'as'))
+               if limits.get(key) is not None]
+    if rlimits:
+        prlimit = shutil.which('prlimit')
+        if prlimit is None:
+            return None
+        prefix += [prlimit] + rlimits + ['--']
+    if limits.get('nice'):
+        nice = shutil.which('nice')
+        if nice is None:
+            return None
+        prefix += [nice, '-n', str(limits['nice'])]
+    return prefix + list(cmd)
+
+
+def limit_process(pid: int, limits):
+    """Apply launch limits to a started child when limit_command can't (preexec_fn isn't safe in the threaded kernel)"""
+    try:
+        if limits.get('cpu_seconds') is not None:
+            resource.prlimit(pid, resource.RLIMIT_CPU, (limits['cpu_seconds'], limits['cpu_seconds']))
+        if limits.get('address_space') is not None:
+            resource.prlimit(pid, resource.RLIMIT_AS, (limits['address_space'], limits['address_space']))
+        if limits.get('nice'):
+            # Relative to ours, as os.nice() in the child would be
+            niceness = os.getpriority(os.PRIO_PROCESS, 0) + limits['nice']
+            os.setpriority(os.PRIO_PROCESS, pid, min(niceness, 19))
+    except ProcessLookupError:
+        # Already gone; its exit is reported as usual
+        pass
 
 class RealUniversalCompatibility:
-    def __init__(self):
+    def __init__(self, supervisor=None, cache_path=None):
         print("🚀 Initializing Real Universal Compatibility Layer")
         
-        # Initialize real compatibility layers
-        self.windows_compat = WindowsCompatibility()
-        self.linux_compat = LinuxCompatibility()
-        self.macos_compat = MacOSCompatibility()
+        # Magic-byte detections survive restarts
+        self.detection_cache = DetectionCache(cache_path)
+        atexit.register(self.detection_cache.close)
+        
+        # Shared with the kernel so both see the same process table
+        self.supervisor = supervisor if supervisor is not None else ProcessSupervisor()
+        
+        # Runtime checks run in parallel once per process (and are cached on disk);
+        # platform layers load on first use and read the shared results
+        self.capabilities = PROBE
+        self.capabilities.probe_in_background()
+        self._windows_compat = None
+        self._linux_compat = None
+        self._macos_compat = None
+        self._python_pool = None
+        self._runtime_hosts = None
         
         # Platform detection
         self.platform_handlers = {
@@ -28,49 +113,169 @@ class RealUniversalCompatibility:
             'cross_platform': self.handle_cross_platform_app
         }
         
-        self.running_apps = []
+    @property
+    def running_apps(self):
+        """Live supervised processes keyed by PID"""
+        return self.supervisor.table
+        
+    @property
+    def python_pool(self):
+        """Warm fork server for .py launches; ALTERON_PY_POOL=0 runs every script in a cold python3"""
+        if self._python_pool is None and os.environ.get('ALTERON_PY_POOL', '1') != '0':
+            from python_pool import PythonPool
+            self._python_pool = PythonPool(SCRIPT_RUNTIMES['.py'][0],
+                                           idle_timeout=float(os.environ.get('ALTERON_PY_POOL_IDLE', 600)))
+        return self._python_pool
+        
+    @property
+    def runtime_hosts(self):
+        """Warm node host for .js runs, opt-in with ALTERON_RUNTIME_HOSTS=1.
+
+        Hosted node apps run in worker threads, which have no process.chdir(),
+        process.stdin or signal handlers, so by default every run is one-shot.
+        """
+        if self._runtime_hosts is None and os.environ.get('ALTERON_RUNTIME_HOSTS', '0') == '1':
+            from runtime_hosts import RuntimeHosts
+            self._runtime_hosts = RuntimeHosts(idle_timeout=float(os.environ.get('ALTERON_RUNTIME_IDLE', 300)))
+        return self._runtime_hosts
+        
+    @property
+    def windows_compat(self):
+        if self._windows_compat is None:
+            from windows_compat import WindowsCompatibility
+            self._windows_compat = WindowsCompatibility()
+        return self._windows_compat
+        
+    @property
+    def linux_compat(self):
+        if self._linux_compat is None:
+            from linux_compat import LinuxCompatibility
+            self._linux_compat = LinuxCompatibility()
+        return self._linux_compat
+        
+    @property
+    def macos_compat(self):
+        if self._macos_compat is None:
+            from macos_compat import MacOSCompatibility
+            self._macos_compat = MacOSCompatibility()
+        return self._macos_compat
         
     def detect_platform(self, app_path):
         """Detect application platform"""
-        path = Path(app_path)
-        suffix = path.suffix.lower()
-        
-        # Windows formats
-        if suffix in ['.exe', '.msi', '.dll', '.bat', '.cmd']:
-            return 'windows'
-        # Linux formats
-        elif suffix in ['.deb', '.rpm', '.sh', '.bin', '.appimage']:
-            return 'linux'
-        # macOS formats
-        elif suffix in ['.dmg', '.pkg', '.app', '.command']:
-            return 'macos'
-        # Cross-platform
-        elif suffix in ['.py', '.js', '.jar', '.txt']:
-            return 'cross_platform'
-        else:
-            # Try to detect by file magic
-            return self.detect_by_file_magic(app_path)
-            
-    def detect_by_file_magic(self, app_path):
-        """Detect platform by file magic bytes"""
+        platform = self.classify_platform(app_path)
+        if DETECTIONS is not None:
+            DETECTIONS.labels(platform).inc()
+        return platform
+        
+    def classify_platform(self, app_path):
+        """Platform from the extension, falling back to (cached) file signatures"""
+        return self.detect_format(app_path)[0]
+        
+    def detect_format(self, app_path):
+        """(platform, kind): the extension when known, else the signature engine"""
+        suffix = os.path.splitext(app_path)[1].lower()
+        platform = EXTENSION_PLATFORMS.get(suffix)
+        if platform:
+            return platform, suffix[1:]
+        return self.detect_cached(app_path)
+        
+    def detect_cached(self, app_path, st=None):
+        """Signature match, reusing the last result while (dev, ino, size, mtime) is unchanged"""
         try:
-            with open(app_path, 'rb') as f:
-                magic = f.read(4)
+            key = identity(st if st is not None else os.stat(app_path))
+        except OSError:
+            return 'unknown', 'unknown'
+        detected = self.detection_cache.get(key)
+        if record_cache:
+            record_cache('platform_detection', detected is not None)
+        if detected is None:
+            detected = detect_file(app_path)
+            self.detection_cache.put(key, *detected)
+        return detected
+        
+    def classify_many(self, paths, recursive: bool = False, max_workers: int = 8) -> Dict[str, str]:
+        """Classify files and folder contents in bulk; only cache misses are opened"""
+        results: Dict[str, str] = {}
+        misses: List[tuple] = []
+        directories = []
+        
+        for path in paths:
+            platform = EXTENSION_PLATFORMS.get(os.path.splitext(path)[1].lower())
+            if platform:
+                results[path] = platform
+            elif os.path.isdir(path):
+                directories.append(path)
+            else:
+                try:
+                    key = identity(os.stat(path))
+                except OSError:
+                    results[path] = 'unknown'
+                    continue
+                misses.append((path, key))
+                
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alteron-classify") as pool:
+            # One task per directory: scandir plus the stat calls for its entries
+            pending = [pool.submit(self.scan_directory, d, recursive) for d in directories]
+            while pending:
+                found, misses_found, subdirs = pending.pop().result()
+                results.update(found)
+                misses.extend(misses_found)
+                pending.extend(pool.submit(self.scan_directory, d, recursive) for d in subdirs)
                 
-                # Windows PE executable
-                if magic == b'MZ\x90\x00':
-                    return 'windows'
-                # Linux ELF binary
-                elif magic == b'\x7fELF':
-                    return 'linux'
-                # macOS Mach-O binary
-                elif magic in [b'\xfe\xed\xfa\xce', b'\xfe\xed\xfa\xcf', 
-                              b'\xce\xfa\xed\xfe', b'\xcf\xfa\xed\xfe']:
-                    return 'macos'
+            # Cache lookups are cheap; only files that changed are read
+            unknown = []
+            hits = 0
+            for path, key in misses:
+                detected = self.detection_cache.get(key)
+                if detected is None:
+                    unknown.append((path, key))
                 else:
-                    return 'unknown'
-        except:
-            return 'unknown'
+                    results[path] = detected[0]
+                    hits += 1
+            if record_cache:
+                record_cache('platform_detection', True, hits)
+                record_cache('platform_detection', False, len(unknown))
+                
+            chunk = max(1, len(unknown) // (max_workers * 4))
+            batches = [unknown[i:i + chunk] for i in range(0, len(unknown), chunk)]
+            for detected in pool.map(self.detect_batch, batches):
+                for path, key, (platform, kind) in detected:
+                    results[path] = platform
+                    self.detection_cache.put(key, platform, kind)
+                    
+        self.detection_cache.flush()
+        return results
+        
+    def scan_directory(self, directory, recursive):
+        """(classified by extension, [(path, identity)] needing magic, subdirectories)"""
+        found = {}
+        misses = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    platform = EXTENSION_PLATFORMS.get(os.path.splitext(entry.name)[1].lower())
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if platform:
+                            found[entry.path] = platform
+                        elif is_dir:
+                            if recursive:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            misses.append((entry.path, identity(entry.stat())))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return found, misses, subdirs
+        
+    def detect_batch(self, batch):
+        return [(path, key, detect_file(path)) for path, key in batch]
+        
+    def detect_by_file_magic(self, app_path):
+        """Detect platform by file signatures (uncached)"""
+        return detect_file(app_path)[0]
             
     def handle_windows_app(self, app_path, args=None):
         """Handle Windows application"""
@@ -106,14 +311,65 @@ class RealUniversalCompatibility:
         else:
             return {"success": False, "error": f"Unsupported cross-platform format: {path.suffix}"}
             
+    def build_script_command(self, script_path, args=None):
+        """Command line for a .py/.js/.jar app"""
+        cmd = SCRIPT_RUNTIMES[Path(script_path).suffix] + [script_path]
+        if args:
+            cmd.extend(args)
+        return cmd
+        
+    def build_command(self, app_path, args=None, platform=None):
+        """Command line for apps that run as a process, None for in-process handling"""
+        detected, kind = self.detect_format(app_path)
+        platform = platform or detected
+        suffix = Path(app_path).suffix
+        
+        if platform == 'windows' and kind in ('exe', 'pe', 'dos'):
+            if self.windows_compat.wine_available:
+                return self.windows_compat.build_exe_command(app_path, args)
+        elif platform == 'linux':
+            if kind == 'appimage' or kind.startswith('script:'):
+                return self.linux_compat.elf_loader.build_elf_command(app_path, args)
+            return self.linux_compat.build_command(app_path, args)
+        elif platform == 'macos':
+            return self.macos_compat.build_command(app_path)
+        elif platform == 'cross_platform':
+            if suffix in SCRIPT_RUNTIMES:
+                return self.build_script_command(app_path, args)
+            if kind == 'jar':
+                return SCRIPT_RUNTIMES['.jar'] + [app_path] + (args or [])
+            if kind.startswith('script:'):
+                # Extension-less script: the kernel honours its shebang
+                return self.linux_compat.elf_loader.build_elf_command(app_path, args)
+        return None
+        
+    def launch_env(self, app_path, platform):
+        """Environment for a process launch; None inherits the kernel's"""
+        if platform == 'windows' and self.windows_compat.wine_available:
+            return self.windows_compat.launch_env(app_path)
+        return None
+        
+    def preflight(self, app_path, platform=None):
+        """Cheap pre-launch validation; native Linux binaries get an ELF dependency check"""
+        detected, kind = self.detect_format(app_path)
+        platform = platform or detected
+        if platform in ('linux', 'cross_platform') and (kind in ('elf', 'appimage') or kind.startswith('script:')):
+            # Run directly by the kernel, so it needs its execute bits
+            try:
+                self.linux_compat.elf_loader.make_executable(app_path)
+            except OSError as e:
+                return {"success": False, "error": f"Cannot make {app_path} executable: {e}"}
+        if platform == 'linux' and kind == 'elf':
+            return self.linux_compat.elf_loader.preflight(app_path)
+        return {"success": True}
+        
     def run_python_script(self, script_path, args=None):
         """Run Python script"""
         try:
-            cmd = ['python3', script_path]
-            if args:
-                cmd.extend(args)
+            cmd = self.build_script_command(script_path, args)
                 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = stream_process(cmd, self.supervisor, path=script_path, platform='cross_platform',
+                                    spawn=self.spawn_process).collect()
             
             return {
                 "success": result.returncode == 0,
@@ -123,14 +379,22 @@ class RealUniversalCompatibility:
         except Exception as e:
             return {"success": False, "error": str(e)}
             
-    def run_javascript(self, script_path, args=None):
+    def script_stream(self, cmd, script_path, strict=False):
+        """Output of a .js/.jar run: in a warm runtime host, or a fresh process when strict isolation is needed"""
+        hosts = None if strict else self.runtime_hosts
+        if hosts is not None:
+            runtime = SCRIPT_RUNTIMES[Path(script_path).suffix]
+            handle = hosts.spawn(script_path, cmd[len(runtime) + 1:])
+            if handle is not None:
+                return OutputStream(handle)
+        return stream_process(cmd)
+        
+    def run_javascript(self, script_path, args=None, strict=False):
         """Run JavaScript with Node.js"""
         try:
-            cmd = ['node', script_path]
-            if args:
-                cmd.extend(args)
+            cmd = self.build_script_command(script_path, args)
                 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self.script_stream(cmd, script_path, strict).collect()
             
             return {
                 "success": result.returncode == 0,
@@ -140,14 +404,12 @@ class RealUniversalCompatibility:
         except Exception as e:
             return {"success": False, "error": str(e)}
             
-    def run_java_jar(self, jar_path, args=None):
+    def run_java_jar(self, jar_path, args=None, strict=False):
         """Run Java JAR file"""
         try:
-            cmd = ['java', '-jar', jar_path]
-            if args:
-                cmd.extend(args)
+            cmd = self.build_script_command(jar_path, args)
                 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self.script_stream(cmd, jar_path, strict).collect()
             
             return {
                 "success": result.returncode == 0,
@@ -171,31 +433,183 @@ class RealUniversalCompatibility:
         except Exception as e:
             return {"success": False, "error": str(e)}
             
-    def run_application(self, app_path, args=None, platform=None):
-        """Run any application with real compatibility"""
+    def prepare_launch(self, app_path, args=None, platform=None):
+        """(platform, cmd, failure): cmd None means in-process handling, failure a result dict"""
         if platform is None:
             platform = self.detect_platform(app_path)
+        if platform not in self.platform_handlers:
+            return platform, None, {
+                "success": False,
+                "error": f"Unsupported platform: {platform}",
+                "supported_platforms": list(self.platform_handlers.keys())
+            }
+            
+        cmd = self.build_command(app_path, args, platform)
+        if cmd is not None:
+            check = self.preflight(app_path, platform)
+            if not check["success"]:
+                return platform, None, dict(check, platform=platform)
+        return platform, cmd, None
+        
+    def run_in_process(self, app_path, args, platform):
+        """Installers, disk images and text files are handled in-process"""
+        result = self.platform_handlers[platform](app_path, args)
+        result.setdefault('platform', platform)
+        return result
+        
+    def run_application(self, app_path, args=None, platform=None, wait=True):
+        """Run any application with real compatibility (wait=False returns once started)"""
+        platform, cmd, failure = self.prepare_launch(app_path, args, platform)
+        if failure:
+            return failure
             
         print(f"🚀 Running {app_path} as {platform} application")
+        if cmd is None:
+            return self.run_in_process(app_path, args, platform)
+        return self.launch_process(cmd, app_path, platform, wait)
         
-        if platform in self.platform_handlers:
-            result = self.platform_handlers[platform](app_path, args)
+    async def run_application_async(self, app_path, args=None, platform=None, timeout=None,
+                                    tee_path=None, kill_after: float = 5.0):
+        """Launch on the running event loop and await exit; cancelling stops the app"""
+        # Imported here: only needed once a loop is running, and it dominates this module's import time
+        import asyncio
+        loop = asyncio.get_running_loop()
+        # Detection and preflight touch the disk (and may probe Wine), so keep them off the loop
+        platform, cmd, failure = await loop.run_in_executor(None, self.prepare_launch, app_path, args, platform)
+        if failure:
+            return failure
+        if cmd is None:
+            return await loop.run_in_executor(None, self.run_in_process, app_path, args, platform)
             
-            if result['success']:
-                self.running_apps.append({
-                    'path': app_path,
-                    'platform': platform,
-                    'args': args
-                })
+        try:
+            env = await loop.run_in_executor(None, self.launch_env, app_path, platform)
+            process = await asyncio.create_subprocess_exec(*cmd, stdin=subprocess.DEVNULL, env=env,
+                                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except Exception as e:
+            return {"success": False, "error": str(e), "platform": platform}
+        entry = self.supervisor.adopt(process, cmd, path=app_path, platform=platform)
+        
+        try:
+            tails = await asyncio.wait_for(self.wait_async_process(process, tee_path), timeout)
+        except asyncio.TimeoutError:
+            await self.stop_async_process(process, kill_after)
+            return {"success": False, "error": f"Timed out after {timeout}s", "timed_out": True,
+                    "return_code": process.returncode, "pid": process.pid, "platform": platform}
+        except asyncio.CancelledError:
+            await asyncio.shield(self.stop_async_process(process, kill_after))
+            raise
+        finally:
+            if process.returncode is not None:
+                self.supervisor.mark_exited(entry)
                 
-            return result
-        else:
-            return {
-                "success": False,
-                "error": f"Unsupported platform: {platform}",
-                "supported_platforms": list(self.platform_handlers.keys())
-            }
+        return {
+            "success": process.returncode == 0,
+            "output": tails['stdout'].value(),
+            "error": tails['stderr'].value(),
+            "return_code": process.returncode,
+            "truncated": any(tail.truncated for tail in tails.values()),
+            "pid": process.pid,
+            "platform": platform
+        }
+        
+    async def wait_async_process(self, process, tee_path=None):
+        tails = await drain_async_process(process, tee_path)
+        await process.wait()
+        return tails
+        
+    async def stop_async_process(self, process, kill_after: float = 5.0):
+        """SIGTERM, then SIGKILL if the app outlives kill_after"""
+        import asyncio
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), kill_after)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            
+    async def run_many_async(self, launches, limit: int = 64, timeout=None):
+        """Run launches concurrently, at most `limit` at a time; results keep input order.
+
+        Each launch is an app path or a dict of run_application_async arguments.
+        """
+        import asyncio
+        semaphore = asyncio.Semaphore(limit) if limit else None
+        
+        async def run_one(launch):
+            options = {'app_path': launch} if isinstance(launch, str) else dict(launch)
+            options.setdefault('timeout', timeout)
+            if semaphore is None:
+                return await self.run_application_async(**options)
+            async with semaphore:
+                return await self.run_application_async(**options)
+                
+        results = await asyncio.gather(*(run_one(launch) for launch in launches), return_exceptions=True)
+        return [result if not isinstance(result, BaseException)
+                else {"success": False, "error": str(result) or type(result).__name__}
+                for result in results]
             
+    def spawn_process(self, cmd, path=None, platform='unknown', limits=None, **popen_kwargs):
+        """supervisor.spawn, except that plain .py launches fork from the warm interpreter pool.
+
+        limits ({'cpu_seconds', 'address_space', 'nice'}) is applied to the child before it
+        execs either way, except that without prlimit/nice it is set just after the start.
+        Launches whose PYTHON* environment differs from the pool's get a cold interpreter.
+        """
+        pool = self.python_pool
+        if (pool is not None and path and cmd[:2] == SCRIPT_RUNTIMES['.py'] + [path]
+                and set(popen_kwargs) <= POOL_KWARGS and pool.accepts(popen_kwargs.get('env'))):
+            try:
+                handle = pool.spawn(path, cmd[2:], limits=limits, **popen_kwargs)
+                return self.supervisor.track(handle, path=path, platform=platform, watch_fd=handle.fileno())
+            except (OSError, RuntimeError) as e:
+                print(f"⚠️ Python pool launch failed, using a new interpreter: {e}")
+        wrapped = limit_command(cmd, limits) if limits else None
+        entry = self.supervisor.spawn(wrapped or cmd, path=path, platform=platform, **popen_kwargs)
+        if limits and wrapped is None:
+            limit_process(entry.pid, limits)
+        return entry
+        
+    def launch_process(self, cmd, app_path, platform, wait=True):
+        """Start a supervised process, optionally waiting for its output"""
+        try:
+            env = self.launch_env(app_path, platform)
+            if not wait:
+                entry = self.spawn_process(cmd, path=app_path, platform=platform, env=env,
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                return {"success": True, "pid": entry.pid, "platform": platform}
+            stream = stream_process(cmd, self.supervisor, path=app_path, platform=platform, env=env,
+                                    spawn=self.spawn_process)
+        except Exception as e:
+            return {"success": False, "error": str(e), "platform": platform}
+            
+        result = stream.collect()
+        return {
+            "success": result.returncode == 0,
+            "output": result.stdout,
+            "error": result.stderr,
+            "return_code": result.returncode,
+            "truncated": stream.truncated,
+            "pid": stream.pid,
+            "platform": platform
+        }
+        
+    def stream_application(self, app_path, args=None, platform=None, tee_path=None, **options):
+        """Start an app and return an OutputStream over its live output (or an error dict)"""
+        platform, cmd, failure = self.prepare_launch(app_path, args, platform)
+        if failure:
+            return failure
+        if cmd is None:
+            return {"success": False, "error": f"{app_path} does not run as a process", "platform": platform}
+        try:
+            return stream_process(cmd, self.supervisor, path=app_path, platform=platform, tee_path=tee_path,
+                                  env=self.launch_env(app_path, platform), spawn=self.spawn_process, **options)
+        except Exception as e:
+            return {"success": False, "error": str(e), "platform": platform}
+        
     def get_system_info(self):
         """Get compatibility system information"""
         return {
@@ -203,6 +617,11 @@ class RealUniversalCompatibility:
             'linux_available': True,  # Always available for ELF
             'macos_available': self.macos_compat.darling_available,
             'running_apps': len(self.running_apps),
+            'detection_cache': self.detection_cache.stats(),
+            'capabilities': self.capabilities.snapshot(),
+            'wine_servers': self.windows_compat.server_status(),
+            'python_pool': self.python_pool.status() if self.python_pool is not None else None,
+            'runtime_hosts': self.runtime_hosts.status() if self.runtime_hosts is not None else None,
             'features': [
                 'Wine/Proton Windows emulation',
                 'ELF binary loading',
@@ -213,8 +632,9 @@ class RealUniversalCompatibility:
 
 # Application manager using real compatibility
 class RealAppManager:
-    def __init__(self):
+    def __init__(self, monitor_interval: float = 2.0):
         self.compat_layer = RealUniversalCompatibility()
+        self.monitor = ResourceMonitor(self.compat_layer.supervisor, interval=monitor_interval).start()
         
     def install_app(self, app_path):
         """Install application using appropriate method"""
@@ -236,6 +656,12 @@ class RealAppManager:
         """Launch application"""
         return self.compat_layer.run_application(app_path, args)
         
+    def get_app_usage(self, pid=None):
+        """CPU, memory, I/O and fd usage of one launched app, or of all of them"""
+        if pid is not None:
+            return self.monitor.get(pid)
+        return {"apps": self.monitor.all_usage(), "totals": self.monitor.totals()}
+        
     def get_available_platforms(self):
         """Get available compatibility platforms"""
         info = self.compat_layer.get_system_info()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Windows Paths
+Case-insensitive Windows-to-Unix path translation for Wine prefixes
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Characters Wine replaces with '_' when it makes a short name
+INVALID_DOS_CHARS = set('*?<>|"+=,;[] ~.\\/:\u00e5') | {chr(c) for c in range(32)}
+SHORT_NAME_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ012345'
+
+
+def is_short_name(name: str) -> bool:
+    """Already a valid 8.3 name (so it is its own short name)"""
+    base, dot, ext = name.partition('.')
+    return (0 < len(base) <= 8 and len(ext) <= 3 and '.' not in ext and not (dot and not ext)
+            and not any(c in INVALID_DOS_CHARS for c in base + ext))
+
+
+def wine_short_name(name: str) -> str:
+    """Short name as Wine's GetShortPathName generates it (hash based, e.g. PROG~W2U)"""
+    hash_ = 0xbeef
+    lower = name.lower()
+    for i in range(len(lower) - 1):
+        hash_ = ((hash_ << 3) ^ (hash_ >> 5) ^ ord(lower[i]) ^ (ord(lower[i + 1]) << 8)) & 0xffff
+    hash_ = ((hash_ << 3) ^ (hash_ >> 5) ^ ord(lower[-1])) & 0xffff
+
+    ext = name.rfind('.', 1, len(name) - 1)
+    ext = ext if ext > 0 else None
+    stem = name[:ext] if ext is not None else name
+    short = ''.join('_' if c in INVALID_DOS_CHARS else c.upper() for c in stem[:4])
+    short = short.ljust(5, '~')
+    short += SHORT_NAME_CHARS[(hash_ >> 10) & 0x1f] + SHORT_NAME_CHARS[(hash_ >> 5) & 0x1f] + SHORT_NAME_CHARS[hash_ & 0x1f]
+    if ext is not None:
+        short += '.' + ''.join('_' if c in INVALID_DOS_CHARS else c.upper() for c in name[ext + 1:ext + 4])
+    return short
+
+
+def numbered_short_names(names: List[str]) -> Dict[str, str]:
+    """Windows-style PROGRA~1 names, numbered in sorted order within each stem/extension group"""
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for name in sorted(names, key=str.casefold):
+        if is_short_name(name):
+            continue
+        stem, dot, ext = name.rpartition('.') if '.' in name[1:] else (name, '', '')
+        clean = lambda part: ''.join(c.upper() for c in part if c not in INVALID_DOS_CHARS)
+        groups.setdefault((clean(stem)[:6], clean(ext)[:3]), []).append(name)
+
+    short = {}
+    for (stem, ext), members in groups.items():
+        for number, name in enumerate(members, 1):
+            prefix = stem[:max(1, 6 - (len(str(number)) - 1))]
+            short[f"{prefix}~{number}" + (f".{ext}" if ext else '')] = name
+    return short
+
+
+class DirectoryNames:
+    __slots__ = ('mtime_ns', 'names', 'short')
+
+    def __init__(self, mtime_ns: int, entries: List[str]):
+        self.mtime_ns = mtime_ns
+        self.names: Dict[str, str] = {}
+        # Sorted so that of two names differing only in case, the choice is stable
+        for entry in sorted(entries):
+            self.names.setdefault(entry.casefold(), entry)
+        self.short: Optional[Dict[str, str]] = None
+
+    def short_names(self) -> Dict[str, str]:
+        """Built on first use: only paths containing '~' need it"""
+        if self.short is None:
+            entries = list(self.names.values())
+            short = {wine_short_name(name).casefold(): name for name in entries if not is_short_name(name)}
+            for alias, name in numbered_short_names(entries).items():
+                short.setdefault(alias.casefold(), name)
+            self.short = short
+        return self.short
+
+
+class WindowsPathTranslator:
+    def __init__(self, prefix):
+        self.prefix = Path(prefix).expanduser()
+        self.dosdevices = self.prefix / 'dosdevices'
+        self.cache: Dict[str, DirectoryNames] = {}
+        self.drives: Dict[str, str] = {}
+        self.drives_mtime = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Drives
+    def drive_map(self) -> Dict[str, str]:
+        """Drive letter -> Unix directory from dosdevices symlinks (re-read when it changes)"""
+        try:
+            mtime = os.stat(self.dosdevices).st_mtime_ns
+        except OSError:
+            return {'c': str(self.prefix / 'drive_c'), 'z': '/'}
+        if mtime != self.drives_mtime:
+            drives = {}
+            for entry in os.listdir(self.dosdevices):
+                # 'c:' is a drive; 'c::' is the raw device behind it
+                if len(entry) == 2 and entry[1] == ':':
+                    drives[entry[0].lower()] = os.path.realpath(self.dosdevices / entry)
+            self.drives, self.drives_mtime = drives, mtime
+        return self.drives
+
+    def split(self, windows_path: str, cwd: str = 'C:\\') -> Tuple[str, List[str]]:
+        """(unix root, components) with '.' and '..' applied lexically like Windows does"""
+        path = windows_path.replace('/', '\\')
+        if path.startswith('\\\\?\\') or path.startswith('\\??\\'):
+            path = path[4:]
+            if path[:4].upper() == 'UNC\\':
+                path = '\\\\' + path[4:]
+
+        if path.startswith('\\\\'):
+            # \\server\share\... lives under dosdevices/unc
+            root = str(self.dosdevices / 'unc')
+            rest = path[2:]
+        elif len(path) >= 2 and path[1] == ':':
+            letter = path[0].lower()
+            root = self.drive_map().get(letter)
+            if root is None:
+                raise FileNotFoundError(f"No drive {letter.upper()}: in {self.prefix}")
+            rest = path[2:]
+            if not rest.startswith('\\') and letter == cwd[0].lower():
+                # Drive-relative ("C:foo") resolves against the current directory
+                rest = cwd[2:] + '\\' + rest
+        else:
+            drive_root, cwd_parts = self.split(cwd)
+            root = drive_root
+            rest = path if path.startswith('\\') else '\\'.join(cwd_parts) + '\\' + path
+
+        parts = []
+        for part in rest.split('\\'):
+            if part in ('', '.'):
+                continue
+            if part == '..':
+                if parts:
+                    parts.pop()
+                continue
+            # Windows ignores trailing dots and spaces in names
+            parts.append(part.rstrip(' .') or part)
+        return root, parts
+
+    # Directory cache
+    def listing(self, directory: str) -> Optional[DirectoryNames]:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        names = self.cache.get(directory)
+        if names is not None and names.mtime_ns == mtime:
+            self.hits += 1
+            return names
+        self.misses += 1
+        try:
+            names = DirectoryNames(mtime, os.listdir(directory))
+        except OSError:
+            return None
+        with self.lock:
+            self.cache[directory] = names
+        return names
+
+    def resolve_component(self, directory: str, name: str) -> Optional[str]:
+        names = self.listing(directory)
+        if names is None:
+            return None
+        found = names.names.get(name.casefold())
+        if found is None and '~' in name:
+            found = names.short_names().get(name.casefold())
+        return found
+
+    def translate(self, windows_path: str, cwd: str = 'C:\\', strict: bool = False) -> Path:
+        """Unix path for a Windows path; components that don't exist yet are kept as given"""
+        current, parts = self.split(windows_path, cwd)
+        for index, part in enumerate(parts):
+            found = self.resolve_component(current, part)
+            if found is None:
+                if strict:
+                    raise FileNotFoundError(f"{windows_path}: '{part}' not found in {current}")
+                return Path(current, *parts[index:])
+            current = os.path.join(current, found)
+        return Path(current)
+
+    def invalidate(self, directory: Optional[str] = None):
+        with self.lock:
+            if directory is None:
+                self.cache.clear()
+            else:
+                self.cache.pop(str(directory), None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'directories': len(self.cache), 'hits': self.hits, 'misses': self.misses}
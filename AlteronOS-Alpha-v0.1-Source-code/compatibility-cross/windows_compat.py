@@ -4,42 +4,58 @@ Real Windows Compatibility using Wine/Proton
 """
 
 import os
+import hashlib
 import subprocess
 import platform
 from pathlib import Path
-import ctypes
 import threading
+from output_stream import stream_process
+from wine_server import WineServerManager
+from win_paths import WindowsPathTranslator
+from capability_probe import PROBE
 
 class WindowsCompatibility:
-    def __init__(self):
+    def __init__(self, wine_binary=None, pool_size=None, idle_timeout=None, isolate=None):
+        # ALTERON_WINE points at another wine build (or a stand-in for testing)
+        self.wine_binary = wine_binary or os.environ.get('ALTERON_WINE', 'wine')
+        self.isolate = isolate if isolate is not None else os.environ.get('ALTERON_WINE_ISOLATE') == '1'
         self.wine_available = self.check_wine()
         self.proton_available = self.check_proton()
         self.windows_dlls = self.load_windows_dlls()
+        self.path_translators = {}
+        
+        self.servers = None
+        if self.wine_available:
+            self.servers = WineServerManager(
+                self.wine_binary, os.environ.get('ALTERON_WINESERVER'),
+                pool_size=pool_size if pool_size is not None else int(os.environ.get('ALTERON_WINE_POOL', 2)),
+                idle_timeout=idle_timeout if idle_timeout is not None
+                else float(os.environ.get('ALTERON_WINE_IDLE', 300)))
+            self.warm()
+            
+    def warm(self):
+        """Boot the default prefix's server (and the spare pool) off the caller's thread"""
+        def warm_up():
+            self.servers.server()
+            if self.isolate:
+                self.servers.refill()
+        threading.Thread(target=warm_up, name="alteron-wine-warm", daemon=True).start()
         
     def check_wine(self):
         """Check if Wine is available"""
-        try:
-            result = subprocess.run(['wine', '--version'], 
-                                  capture_output=True, text=True)
-            print(f"✅ Wine available: {result.stdout.strip()}")
+        result = PROBE.check('wine', [self.wine_binary, '--version'])
+        if result['available']:
+            print(f"✅ Wine available: {result['version']}")
             return True
-        except:
-            print("❌ Wine not available")
-            return False
+        print("❌ Wine not available")
+        return False
             
     def check_proton(self):
         """Check if Proton is available"""
-        proton_paths = [
-            '/usr/share/steam/compatibilitytools.d/',
-            '~/.steam/steam/compatibilitytools.d/',
-            '~/.local/share/Steam/compatibilitytools.d/'
-        ]
-        
-        for path in proton_paths:
-            expanded = Path(path).expanduser()
-            if expanded.exists():
-                print(f"✅ Proton found at {expanded}")
-                return True
+        result = PROBE.check('proton')
+        if result['available']:
+            print(f"✅ Proton found at {result['path']}")
+            return True
         print("❌ Proton not found")
         return False
         
@@ -53,6 +69,7 @@ class WindowsCompatibility:
                 # Try to load Windows DLLs through Wine
                 dll_path = f"/usr/lib/wine/{dll}"
                 if Path(dll_path).exists():
+                    import ctypes
                     dlls[dll] = ctypes.CDLL(dll_path)
                     print(f"✅ Loaded {dll}")
                 else:
@@ -73,17 +90,39 @@ class WindowsCompatibility:
                 return stub_function
         return StubDLL()
         
+    def build_exe_command(self, exe_path, args=None):
+        """Command line that runs a Windows executable under Wine"""
+        cmd = [self.wine_binary, exe_path]
+        if args:
+            cmd.extend(args)
+        return cmd
+        
+    def prefix_name(self, exe_path):
+        """Stable per-app prefix name: executable stem plus a hash of its location"""
+        digest = hashlib.sha1(os.path.abspath(exe_path).encode()).hexdigest()[:8]
+        return f"{Path(exe_path).stem}-{digest}"
+        
+    def launch_env(self, exe_path=None):
+        """Environment that points a Wine launch at a warm prefix and its running wineserver"""
+        if self.servers is None:
+            return None
+        if self.isolate and exe_path:
+            server = self.servers.acquire(self.prefix_name(exe_path))
+            server.touch()
+            return server.env()
+        return self.servers.launch_env()
+        
+    def server_status(self):
+        return self.servers.status() if self.servers else None
+        
     def run_windows_exe(self, exe_path, args=None):
         """Run Windows executable using Wine"""
         if not self.wine_available:
             return {"success": False, "error": "Wine not available"}
             
         try:
-            cmd = ['wine', exe_path]
-            if args:
-                cmd.extend(args)
-                
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            cmd = self.build_exe_command(exe_path, args)
+            result = stream_process(cmd, env=self.launch_env(exe_path)).collect()
             
             return {
                 "success": result.returncode == 0,
@@ -100,8 +139,8 @@ class WindowsCompatibility:
             return {"success": False, "error": "Wine not available"}
             
         try:
-            result = subprocess.run(['wine', 'msiexec', '/i', msi_path], 
-                                  capture_output=True, text=True)
+            result = subprocess.run([self.wine_binary, 'msiexec', '/i', msi_path], 
+                                  capture_output=True, text=True, env=self.launch_env())
             return {
                 "success": result.returncode == 0,
                 "output": result.stdout
@@ -117,8 +156,12 @@ class WindowsCompatibility:
             
             # Initialize Wine prefix if it doesn't exist
             if not expanded_path.exists():
-                subprocess.run(['wine', 'wineboot', '--init'], 
-                             capture_output=True)
+                if self.servers is not None:
+                    # Cloned from the booted template instead of a fresh wineboot
+                    self.servers.server(expanded_path)
+                else:
+                    subprocess.run([self.wine_binary, 'wineboot', '--init'], 
+                                 capture_output=True)
                 print(f"✅ Wine prefix created: {expanded_path}")
                 
             return True
@@ -129,19 +172,20 @@ class WindowsCompatibility:
     def get_windows_version(self):
         """Get emulated Windows version"""
         try:
-            result = subprocess.run(['wine', 'winecfg', '-v'], 
-                                  capture_output=True, text=True)
+            result = subprocess.run([self.wine_binary, 'winecfg', '-v'], 
+                                  capture_output=True, text=True, env=self.launch_env())
             return result.stdout.strip() or "Windows 10"
         except:
             return "Windows 10 (emulated)"
             
-    def map_windows_path(self, windows_path):
-        """Map Windows path to Unix path in Wine prefix"""
-        prefix = os.environ.get('WINEPREFIX', '~/.wine')
-        expanded_prefix = Path(prefix).expanduser()
-        
-        # Convert C:\Program Files to drive_c/Program Files
-        unix_path = windows_path.replace('C:\\', 'drive_c/').replace('\\', '/')
-        full_path = expanded_prefix / unix_path
+    def path_translator(self, prefix=None):
+        """Shared translator (and its directory cache) for a prefix"""
+        prefix = str(Path(prefix or os.environ.get('WINEPREFIX', '~/.wine')).expanduser())
+        translator = self.path_translators.get(prefix)
+        if translator is None:
+            translator = self.path_translators[prefix] = WindowsPathTranslator(prefix)
+        return translator
         
-        return full_path
+    def map_windows_path(self, windows_path, prefix=None):
+        """Map Windows path to Unix path in Wine prefix (any drive, case-insensitive, 8.3 names)"""
+        return self.path_translator(prefix).translate(windows_path)
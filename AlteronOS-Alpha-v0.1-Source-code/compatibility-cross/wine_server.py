@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Wine Servers
+Persistent wineserver per prefix and a pool of pre-booted prefixes
+"""
+
+import itertools
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Optional
+from prefix_template import PrefixTemplate
+
+DEFAULT_BASE_DIR = Path.home() / '.alteronos' / 'wine'
+
+
+def find_wineserver(wine: str) -> str:
+    """wineserver next to the configured wine binary, else the one on PATH"""
+    sibling = Path(shutil.which(wine) or wine).with_name('wineserver')
+    if sibling.exists():
+        return str(sibling)
+    return shutil.which('wineserver') or 'wineserver'
+
+
+class WineServer:
+    """One prefix and the persistent wineserver that keeps it warm"""
+
+    def __init__(self, prefix, wine: str, wineserver: str, idle_timeout: Optional[float]):
+        self.prefix = Path(prefix)
+        self.wine = wine
+        self.wineserver = wineserver
+        self.idle_timeout = idle_timeout
+        self.popen = None
+        self.started = None
+        self.last_used = None
+        self.launches = 0
+        self.boot_seconds = None
+        self.lock = threading.Lock()
+        self.boot_lock = threading.Lock()
+
+    def env(self) -> Dict[str, str]:
+        env = os.environ.copy()
+        env['WINEPREFIX'] = str(self.prefix)
+        # Clients that find no server start this one rather than whatever is on PATH
+        env['WINESERVER'] = self.wineserver
+        return env
+
+    @property
+    def initialized(self) -> bool:
+        return (self.prefix / 'system.reg').exists()
+
+    def boot(self) -> bool:
+        """wineboot --init the prefix once; later calls are free"""
+        if self.initialized:
+            return True
+        with self.boot_lock:
+            if self.initialized:
+                return True
+            started = time.perf_counter()
+            self.prefix.parent.mkdir(parents=True, exist_ok=True)
+            result = subprocess.run([self.wine, 'wineboot', '--init'], env=self.env(), stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.boot_seconds = time.perf_counter() - started
+            return result.returncode == 0 and self.initialized
+
+    def alive(self) -> bool:
+        return self.popen is not None and self.popen.poll() is None
+
+    def ensure(self) -> bool:
+        """Start the server if it is not running (it exits on its own after idle_timeout)"""
+        with self.lock:
+            if self.alive():
+                return True
+            # -p<n>: stay up n seconds after the last client disconnects, so running apps are never cut off
+            persist = f'-p{int(self.idle_timeout)}' if self.idle_timeout else '-p'
+            try:
+                self.popen = subprocess.Popen([self.wineserver, '-f', persist], env=self.env(),
+                                              stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL, start_new_session=True)
+            except OSError as e:
+                print(f"⚠️ wineserver failed to start for {self.prefix}: {e}")
+                self.popen = None
+                return False
+            self.started = time.time()
+            return True
+
+    def touch(self):
+        self.last_used = time.time()
+        self.launches += 1
+
+    def stop(self, timeout: float = 5.0):
+        """Kill the server (and any Wine processes still attached to it)"""
+        if not self.alive():
+            return
+        subprocess.run([self.wineserver, '-k'], env=self.env(), stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            self.popen.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.popen.kill()
+            self.popen.wait()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'prefix': str(self.prefix),
+            'running': self.alive(),
+            'pid': self.popen.pid if self.alive() else None,
+            'started': self.started,
+            'last_used': self.last_used,
+            'launches': self.launches,
+            'boot_seconds': self.boot_seconds
+        }
+
+
+class WineServerManager:
+    def __init__(self, wine: str = 'wine', wineserver: Optional[str] = None, base_dir=None,
+                 pool_size: int = 2, idle_timeout: Optional[float] = 300.0, template: bool = True):
+        self.wine = wine
+        self.wineserver = wineserver or find_wineserver(wine)
+        self.base_dir = Path(base_dir) if base_dir else DEFAULT_BASE_DIR
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.default_prefix = Path(os.environ.get('WINEPREFIX', '~/.wine')).expanduser()
+        self.template = PrefixTemplate(self.base_dir / 'template', wine, self.wineserver) if template else None
+
+        self.servers: Dict[str, WineServer] = {}
+        self.acquiring: Dict[str, threading.Lock] = {}
+        self.pool = deque()
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+        self.refill_thread = None
+        self.adopt_spares()
+
+    def adopt_spares(self):
+        """Spares booted by earlier runs are still good; their servers start on demand"""
+        pool_dir = self.base_dir / 'pool'
+        if not pool_dir.is_dir():
+            return
+        for prefix in sorted(pool_dir.iterdir()):
+            if len(self.pool) >= self.pool_size:
+                break
+            if (prefix / 'system.reg').exists():
+                self.pool.append(self.new_server(prefix))
+
+    def new_server(self, prefix) -> WineServer:
+        return WineServer(prefix, self.wine, self.wineserver, self.idle_timeout)
+
+    def prepare(self, server: WineServer) -> bool:
+        """Create a missing prefix by cloning the template (milliseconds), else wineboot it"""
+        if server.initialized:
+            return True
+        with server.boot_lock:
+            if server.initialized:
+                return True
+            if self.template is not None and not server.prefix.exists():
+                try:
+                    if self.template.clone(server.prefix) is not None:
+                        return True
+                except OSError as e:
+                    print(f"⚠️ Prefix clone failed, falling back to wineboot: {e}")
+        return server.boot()
+
+    def server(self, prefix=None) -> WineServer:
+        """Booted, running server for a prefix (the default prefix when None)"""
+        key = str(Path(prefix).expanduser() if prefix else self.default_prefix)
+        with self.lock:
+            server = self.servers.get(key)
+            if server is None:
+                server = self.servers[key] = self.new_server(key)
+        self.prepare(server)
+        server.ensure()
+        return server
+
+    def launch_env(self, prefix=None) -> Dict[str, str]:
+        """Environment for a Wine launch against an already-running server"""
+        server = self.server(prefix)
+        server.touch()
+        return server.env()
+
+    # Pre-booted prefixes
+    def boot_spare(self) -> WineServer:
+        prefix = self.base_dir / 'pool' / f"{os.getpid()}-{time.time_ns()}-{next(self.ids)}"
+        server = self.new_server(prefix)
+        if not self.prepare(server):
+            shutil.rmtree(prefix, ignore_errors=True)
+            raise RuntimeError(f"wineboot failed for {prefix}")
+        server.ensure()
+        return server
+
+    def refill(self):
+        """Boot spares in the background until the pool is full"""
+        with self.lock:
+            if self.pool_size <= 0 or (self.refill_thread is not None and self.refill_thread.is_alive()):
+                return
+            self.refill_thread = threading.Thread(target=self.refill_loop, name="alteron-wine-pool", daemon=True)
+            self.refill_thread.start()
+
+    def refill_loop(self):
+        while len(self.pool) < self.pool_size:
+            try:
+                spare = self.boot_spare()
+            except Exception as e:
+                print(f"⚠️ Wine prefix pool refill failed: {e}")
+                return
+            self.pool.append(spare)
+
+    def acquire(self, name: str) -> WineServer:
+        """Prefix dedicated to `name`, taken from the warm pool when it doesn't exist yet"""
+        target = self.base_dir / 'prefixes' / name
+        with self.lock:
+            # Threads acquiring the same name take turns, so only one spare is spent on it
+            acquiring = self.acquiring.setdefault(str(target), threading.Lock())
+        with acquiring:
+            with self.lock:
+                server = self.servers.get(str(target))
+            if server is not None or target.exists():
+                return self.server(target)
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            while True:
+                try:
+                    spare = self.pool.popleft()
+                except IndexError:
+                    spare = self.boot_spare()
+                try:
+                    # The running server follows the rename: it is keyed by the prefix's device and inode
+                    spare.prefix.rename(target)
+                    break
+                except FileNotFoundError:
+                    # Another process sharing the pool took this spare first
+                    spare.stop()
+                except OSError:
+                    # The spare is still unused, so it goes back either way
+                    self.pool.appendleft(spare)
+                    if not target.exists():
+                        raise
+                    # Another process created this prefix first (ENOTEMPTY): use theirs
+                    return self.server(target)
+            self.refill()
+            spare.prefix = target
+            spare.ensure()
+            with self.lock:
+                self.servers[str(target)] = spare
+            return spare
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'wine': self.wine,
+            'wineserver': self.wineserver,
+            'idle_timeout': self.idle_timeout,
+            'pool': {'ready': len(self.pool), 'size': self.pool_size},
+            'template': self.template.status() if self.template else None,
+            'servers': [server.to_dict() for server in list(self.servers.values())]
+        }
+
+    def shutdown(self, include_pool: bool = True):
+        """Kill every server this manager started; spares are idle so they are always safe to stop"""
+        for server in list(self.servers.values()):
+            server.stop()
+        if include_pool:
+            while self.pool:
+                self.pool.popleft().stop()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Boot Graph
+Runs boot steps as a dependency DAG on a thread pool
+"""
+
+import heapq
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Callable, Optional
+from tracing import NULL_TRACER
+
+
+class BootStep:
+    def __init__(self, key: str, title: str, func: Callable[[], bool],
+                 deps=(), timeout: Optional[float] = None,
+                 critical: bool = True, cost: float = 1.0):
+        self.key = key
+        self.title = title
+        self.func = func
+        self.deps = list(deps)
+        self.timeout = timeout
+        self.critical = critical
+        self.cost = cost
+
+
+class BootGraph:
+    def __init__(self, max_workers: int = 4, on_start=None, on_finish=None, tracer=None):
+        self.steps: Dict[str, BootStep] = {}
+        self.max_workers = max_workers
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.tracer = tracer or NULL_TRACER
+
+    def add_step(self, key, title, func, deps=(), timeout=None, critical=True, cost=1.0):
+        """Declare a boot step and the steps it depends on"""
+        if key in self.steps:
+            raise ValueError(f"Duplicate boot step: {key}")
+        self.steps[key] = BootStep(key, title, func, deps, timeout, critical, cost)
+        return self.steps[key]
+
+    def validate(self):
+        """Check for unknown dependencies and cycles"""
+        for step in self.steps.values():
+            for dep in step.deps:
+                if dep not in self.steps:
+                    raise ValueError(f"Boot step '{step.key}' depends on unknown step '{dep}'")
+        self.topological_order()
+
+    def dependents(self) -> Dict[str, List[str]]:
+        children = {key: [] for key in self.steps}
+        for step in self.steps.values():
+            for dep in step.deps:
+                children[dep].append(step.key)
+        return children
+
+    def topological_order(self) -> List[str]:
+        children = self.dependents()
+        indegree = {key: len(step.deps) for key, step in self.steps.items()}
+        ready = [key for key, count in indegree.items() if count == 0]
+        order = []
+
+        while ready:
+            key = ready.pop()
+            order.append(key)
+            for child in children[key]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self.steps):
+            cyclic = sorted(set(self.steps) - set(order))
+            raise ValueError(f"Boot graph has a dependency cycle: {cyclic}")
+        return order
+
+    def critical_path_ranks(self) -> Dict[str, float]:
+        """Length of the longest chain from each step to the end of boot"""
+        children = self.dependents()
+        ranks = {}
+        for key in reversed(self.topological_order()):
+            downstream = max((ranks[child] for child in children[key]), default=0.0)
+            ranks[key] = self.steps[key].cost + downstream
+        return ranks
+
+    def critical_path(self) -> List[str]:
+        """The chain of steps that bounds total boot time"""
+        ranks = self.critical_path_ranks()
+        children = self.dependents()
+        roots = [key for key, step in self.steps.items() if not step.deps]
+        if not roots:
+            return []
+
+        path = [max(roots, key=ranks.get)]
+        while children[path[-1]]:
+            path.append(max(children[path[-1]], key=ranks.get))
+        return path
+
+    def run_step(self, step: BootStep):
+        started = time.perf_counter()
+        if self.on_start:
+            self.on_start(step)
+        with self.tracer.span(step.title, cat='boot', step=step.key) as span:
+            try:
+                ok = bool(step.func())
+                error = None
+            except Exception as e:
+                ok = False
+                error = str(e)
+            if not ok:
+                span.set(failed=True)
+        return ok, error, time.perf_counter() - started
+
+    def run_detached(self, step: BootStep) -> Future:
+        """Run a step that has a timeout on its own daemon thread.
+
+        A pool thread is joined at interpreter exit, so a hung step abandoned
+        there would block shutdown forever; a daemon thread is not.
+        """
+        future = Future()
+
+        def target():
+            if future.set_running_or_notify_cancel():
+                future.set_result(self.run_step(step))
+
+        threading.Thread(target=target, name=f"alteron-boot-{step.key}", daemon=True).start()
+        return future
+
+    def run(self) -> Dict[str, Any]:
+        """Run all steps, longest remaining chain first, failing fast on critical errors"""
+        self.validate()
+        ranks = self.critical_path_ranks()
+        children = self.dependents()
+        waiting = {key: len(step.deps) for key, step in self.steps.items()}
+
+        ready = []
+        for key, count in waiting.items():
+            if count == 0:
+                heapq.heappush(ready, (-ranks[key], key))
+
+        results = {}
+        running = {}
+        deadlines = {}
+        failed_step = None
+        boot_started = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix="alteron-boot")
+        try:
+            while (ready or running) and failed_step is None:
+                # Submit ready steps in critical-path order
+                while ready and len(running) < self.max_workers:
+                    _, key = heapq.heappop(ready)
+                    step = self.steps[key]
+                    if step.timeout is not None:
+                        future = self.run_detached(step)
+                        deadlines[future] = time.perf_counter() + step.timeout
+                    else:
+                        future = executor.submit(self.run_step, step)
+                    running[future] = key
+
+                timeout = None
+                if deadlines:
+                    timeout = max(0.0, min(deadlines.values()) - time.perf_counter())
+
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                # Steps past their deadline are failed (their daemon thread is abandoned)
+                now = time.perf_counter()
+                for future, deadline in list(deadlines.items()):
+                    if future not in done and now >= deadline:
+                        key = running.pop(future)
+                        del deadlines[future]
+                        step = self.steps[key]
+                        results[key] = {"success": False, "duration": step.timeout,
+                                        "error": f"timed out after {step.timeout}s"}
+                        if self.on_finish:
+                            self.on_finish(step, results[key])
+                        if step.critical:
+                            failed_step = key
+                            break
+                        self.release(key, children, waiting, ready, ranks)
+
+                for future in done:
+                    if future not in running:
+                        continue
+                    key = running.pop(future)
+                    deadlines.pop(future, None)
+                    step = self.steps[key]
+                    ok, error, duration = future.result()
+                    results[key] = {"success": ok, "duration": duration, "error": error}
+                    if self.on_finish:
+                        self.on_finish(step, results[key])
+
+                    if not ok and step.critical:
+                        failed_step = failed_step or key
+                    else:
+                        self.release(key, children, waiting, ready, ranks)
+        finally:
+            # Fail fast: drop queued work, don't wait for stragglers
+            executor.shutdown(wait=failed_step is None, cancel_futures=True)
+
+        skipped = [key for key in self.steps if key not in results]
+        return {
+            "success": failed_step is None and not skipped,
+            "failed_step": failed_step,
+            "skipped": skipped,
+            "steps": results,
+            "wall_time": time.perf_counter() - boot_started,
+            "critical_path": self.critical_path()
+        }
+
+    def release(self, key, children, waiting, ready, ranks):
+        """Mark dependents of a finished step as ready when all their deps are done"""
+        for child in children[key]:
+            waiting[child] -= 1
+            if waiting[child] == 0:
+                heapq.heappush(ready, (-ranks[child], child))
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+AlteronOS IPC Bus
+Kernel-hosted Unix socket bus with length-prefixed binary frames
+"""
+
+import asyncio
+import errno
+import itertools
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Callable, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Frame header: payload length, request id, kind, codec
+HEADER = struct.Struct('!IIBB')
+MAX_FRAME = 16 * 1024 * 1024
+
+KIND_REQUEST = 0
+KIND_RESULT = 1
+KIND_ERROR = 2
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+
+def default_socket_path() -> str:
+    if os.environ.get('ALTERON_IPC_SOCKET'):
+        return os.environ['ALTERON_IPC_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    base = Path(runtime_dir) / 'alteronos' if runtime_dir else Path.home() / '.alteronos'
+    return str(base / 'kernel.sock')
+
+
+def encode(obj, codec=None):
+    """Serialize a payload; msgpack when installed, JSON otherwise"""
+    if codec is None:
+        codec = CODEC_MSGPACK if msgpack else CODEC_JSON
+    if codec == CODEC_MSGPACK:
+        return codec, msgpack.packb(obj, use_bin_type=True, default=str)
+    return codec, json.dumps(obj, separators=(',', ':'), default=str).encode()
+
+
+def decode(codec, data):
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack frame received but msgpack is not installed")
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+def build_frame(request_id, kind, obj, codec=None) -> bytes:
+    codec, payload = encode(obj, codec)
+    return HEADER.pack(len(payload), request_id, kind, codec) + payload
+
+
+class IPCServer:
+    def __init__(self, path: Optional[str] = None, executor=None):
+        self.path = path or default_socket_path()
+        self.executor = executor
+        self.methods: Dict[str, Callable] = {}
+        self.inline = set()
+        self.server = None
+        self.bound = False
+        self.connections = set()
+
+    def register(self, name: str, func: Callable, inline: bool = False):
+        """Expose func(**params) as an IPC method (inline=True runs cheap sync calls on the loop)"""
+        self.methods[name] = func
+        if inline:
+            self.inline.add(name)
+
+    def register_all(self, methods: Dict[str, Callable], inline=()):
+        self.methods.update(methods)
+        self.inline.update(inline)
+
+    def claim_path(self):
+        """Remove a stale socket left by a dead kernel; refuse if a live one still answers on it"""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if os.path.lexists(self.path):
+                os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise OSError(errno.EADDRINUSE, f"another kernel is listening on {self.path}")
+
+    async def start(self):
+        parent = Path(self.path).parent
+        parent.mkdir(parents=True, exist_ok=True)
+        self.claim_path()
+        # Bound in a private 0700 directory and made 0600 before it is linked into place,
+        # so other users never get a window to connect (and no process-wide umask change)
+        private = tempfile.mkdtemp(prefix='.ipc-', dir=parent)
+        staging = os.path.join(private, 'kernel.sock')
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(staging)
+            os.chmod(staging, 0o600)
+            try:
+                # Unlike bind, link never replaces a socket another kernel created meanwhile
+                os.link(staging, self.path)
+            except FileExistsError:
+                raise OSError(errno.EADDRINUSE, f"another kernel is listening on {self.path}")
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            if os.path.lexists(staging):
+                os.unlink(staging)
+            os.rmdir(private)
+        self.bound = True
+        self.server = await asyncio.start_unix_server(self.serve_client, sock=sock)
+        return self
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self.connections):
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+        # Only our own socket: a refused start must not remove a running kernel's
+        if self.bound and os.path.exists(self.path):
+            os.unlink(self.path)
+        self.bound = False
+
+    async def serve_client(self, reader, writer):
+        self.connections.add(writer)
+        pending = set()
+        try:
+            while True:
+                header = await reader.readexactly(HEADER.size)
+                length, request_id, kind, codec = HEADER.unpack(header)
+                if length > MAX_FRAME:
+                    break
+                payload = await reader.readexactly(length)
+                if kind != KIND_REQUEST:
+                    continue
+                # Each request is its own task, so slow calls don't block pipelined ones
+                task = asyncio.ensure_future(self.handle(writer, request_id, codec, payload))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            self.connections.discard(writer)
+            writer.close()
+
+    async def handle(self, writer, request_id, codec, payload):
+        try:
+            request = decode(codec, payload)
+            name = request.get('method')
+            method = self.methods.get(name)
+            if method is None:
+                raise KeyError(f"Unknown IPC method: {name}")
+            params = request.get('params') or {}
+
+            if asyncio.iscoroutinefunction(method):
+                result = await method(**params)
+            elif name in self.inline:
+                result = method(**params)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.executor, lambda: method(**params))
+            frame = build_frame(request_id, KIND_RESULT, result, codec)
+        except Exception as e:
+            frame = build_frame(request_id, KIND_ERROR, {"error": str(e), "type": type(e).__name__}, codec)
+
+        if not writer.is_closing():
+            writer.write(frame)
+            await writer.drain()
+
+
+class IPCError(Exception):
+    pass
+
+
+class IPCClient:
+    def __init__(self, path: Optional[str] = None, timeout: float = 30.0):
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(self.path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.rfile = self.sock.makefile('rb', buffering=65536)
+        self.ids = itertools.count(1)
+        self.pending: Dict[int, Future] = {}
+        self.send_lock = threading.Lock()
+        self.closed = False
+        self.reader = threading.Thread(target=self.read_loop, name="alteron-ipc-client", daemon=True)
+        self.reader.start()
+
+    def call_async(self, method: str, **params) -> Future:
+        """Send a request without waiting; many may be in flight at once"""
+        request_id = next(self.ids) & 0xFFFFFFFF
+        future = Future()
+        self.pending[request_id] = future
+        frame = build_frame(request_id, KIND_REQUEST, {"method": method, "params": params})
+        try:
+            with self.send_lock:
+                self.sock.sendall(frame)
+        except OSError as e:
+            self.pending.pop(request_id, None)
+            future.set_exception(IPCError(f"Kernel connection lost: {e}"))
+        return future
+
+    def call(self, method: str, **params):
+        """Send a request and wait for its result"""
+        future = self.call_async(method, **params)
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            # A late reply finds nothing to resolve instead of leaking the entry
+            for request_id, waiting in list(self.pending.items()):
+                if waiting is future:
+                    self.pending.pop(request_id, None)
+            raise
+
+    def recv_exact(self, size):
+        data = self.rfile.read(size)
+        if len(data) < size:
+            raise ConnectionError("Kernel closed the IPC connection")
+        return data
+
+    def read_loop(self):
+        try:
+            while True:
+                length, request_id, kind, codec = HEADER.unpack(self.recv_exact(HEADER.size))
+                payload = decode(codec, self.recv_exact(length))
+                future = self.pending.pop(request_id, None)
+                if future is None:
+                    continue
+                if kind == KIND_ERROR:
+                    future.set_exception(IPCError(payload.get('error')))
+                else:
+                    future.set_result(payload)
+        except (ConnectionError, OSError, ValueError) as e:
+            self.closed = True
+            for future in list(self.pending.values()):
+                if not future.done():
+                    future.set_exception(IPCError(f"Kernel connection lost: {e}"))
+            self.pending.clear()
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class KernelProxy:
+    """Client-side stand-in for the kernel's compat layer and terminals"""
+
+    def __init__(self, client: IPCClient):
+        self.client = client
+
+    def run_application(self, app_path, args=None, platform=None, priority='normal'):
+        return self.client.call('apps.run', app_path=app_path, args=args,
+                                platform=platform or 'auto', priority=priority)
+
+    def run_many(self, launches, limit=64, timeout=None):
+        # Waits for the whole batch, so the per-call timeout does not apply
+        return self.client.call_async('apps.run_batch', launches=list(launches), limit=limit,
+                                      timeout=timeout).result()
+
+    def detect_platform(self, app_path):
+        return self.client.call('compat.detect', app_path=app_path)
+
+    def classify_many(self, paths, recursive=False):
+        return self.client.call('compat.classify', paths=list(paths), recursive=recursive)
+
+    def get_system_info(self):
+        return self.client.call('system.info')
+
+    def running_apps(self):
+        return self.client.call('apps.list')
+
+    def terminal_names(self):
+        return self.client.call('terminals.list')
+
+    def execute_terminal(self, name, command):
+        return self.client.call('terminals.execute', name=name, command=command)
+
+
+def connect_kernel(path: Optional[str] = None) -> Optional[KernelProxy]:
+    """Connect to a running kernel, or None if no kernel is listening"""
+    try:
+        return KernelProxy(IPCClient(path))
+    except OSError:
+        return None
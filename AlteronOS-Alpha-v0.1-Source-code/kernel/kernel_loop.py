@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Kernel Event Loop
+One asyncio loop hosting services, process reaping, IPC and timers
+"""
+
+import asyncio
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Callable
+from ipc_bus import IPCServer
+
+
+class KernelLoop:
+    def __init__(self, kernel=None, max_workers: int = 8):
+        self.kernel = kernel
+        self.loop = None
+        self.loop_thread = None
+        self.stop_event = None
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="alteron-kernel")
+        self.startup_hooks: List[Callable] = []
+        self.shutdown_hooks: List[Callable] = []
+        self.listeners: Dict[str, List[Callable]] = {}
+        self.timers = []
+        self.tasks = set()
+        self.ipc = None
+
+    # Events
+    def on(self, event: str, callback: Callable):
+        """Subscribe callback(*args) to a kernel event"""
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event: str, *args):
+        """Deliver an event on the loop (callable from any thread)"""
+        if self.loop is None:
+            return
+        if threading.get_ident() == self.loop_thread:
+            self.dispatch_event(event, args)
+        else:
+            self.loop.call_soon_threadsafe(self.dispatch_event, event, args)
+
+    def dispatch_event(self, event, args):
+        for callback in self.listeners.get(event, []):
+            try:
+                result = callback(*args)
+                if asyncio.iscoroutine(result):
+                    self.spawn(result)
+            except Exception as e:
+                print(f"⚠️ Event handler for {event} failed: {e}")
+
+    # Tasks and timers
+    def spawn(self, coro):
+        """Run a coroutine on the kernel loop, keeping a reference until done"""
+        task = self.loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def call_later(self, delay: float, func: Callable, *args):
+        handle = self.loop.call_later(delay, func, *args)
+        self.timers.append(handle)
+        return handle
+
+    def every(self, interval: float, func: Callable, *args):
+        """Run func periodically on the loop (coroutines are awaited)"""
+        async def periodic():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    result = func(*args)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    print(f"⚠️ Timer {getattr(func, '__name__', func)} failed: {e}")
+        return self.spawn(periodic())
+
+    async def run_blocking(self, func: Callable, *args):
+        """Run blocking work on the executor so the loop keeps reacting"""
+        return await self.loop.run_in_executor(self.executor, func, *args)
+
+    def run_blocking_soon(self, func: Callable, *args):
+        """Fire-and-forget variant of run_blocking for callbacks"""
+        return self.loop.run_in_executor(self.executor, func, *args)
+
+    # Lifecycle
+    def on_startup(self, hook: Callable):
+        self.startup_hooks.append(hook)
+
+    def on_shutdown(self, hook: Callable):
+        self.shutdown_hooks.append(hook)
+
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+
+    async def main(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.stop_event = asyncio.Event()
+        self.loop.set_default_executor(self.executor)
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(signum, self.stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        if self.kernel is not None:
+            self.attach_kernel()
+
+        for hook in self.startup_hooks:
+            result = hook(self)
+            if asyncio.iscoroutine(result):
+                await result
+
+        await self.stop_event.wait()
+
+        for hook in reversed(self.shutdown_hooks):
+            try:
+                result = hook(self)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️ Shutdown hook failed: {e}")
+
+        for handle in self.timers:
+            handle.cancel()
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def attach_kernel(self):
+        """Move kernel housekeeping onto the loop"""
+        kernel = self.kernel
+        kernel.kernel_loop = self
+
+        # Children are reaped by loop readers instead of the reaper thread
+        kernel.supervisor.attach_loop(self.loop)
+        kernel.supervisor.on_exit(lambda entry: self.emit('process_exit', entry))
+
+        if hasattr(kernel, 'resource_monitor'):
+            # /proc reads are blocking file I/O, so sampling runs on the executor
+            monitor = kernel.resource_monitor
+            self.every(monitor.interval, lambda: self.run_blocking(monitor.sample))
+
+        if hasattr(kernel, 'workers'):
+            # Probes call into native code, so they run on the executor
+            self.every(5.0, lambda: self.run_blocking(kernel.check_workers))
+
+        if hasattr(kernel, 'launch_scheduler'):
+            # Dispatch preflights, spawns and runs in-process launches, so it runs on the executor
+            kernel.launch_scheduler.handoff = self.run_blocking_soon
+            self.every(1.0, lambda: self.run_blocking(kernel.launch_scheduler.tick))
+
+        if hasattr(kernel, 'service_manager'):
+            # Health checks may block, so they run on the executor
+            self.every(1.0, lambda: self.run_blocking(kernel.service_manager.tick))
+            self.on_shutdown(lambda loop: kernel.service_manager.stop_all())
+
+        if hasattr(kernel, 'toggle_profiler'):
+            # kill -USR2 <kernel pid> starts/stops the sampling profiler
+            try:
+                self.loop.add_signal_handler(signal.SIGUSR2,
+                                             lambda: self.run_blocking_soon(kernel.toggle_profiler))
+            except (NotImplementedError, RuntimeError, AttributeError):
+                pass
+            self.on_shutdown(lambda loop: kernel.profiling and kernel.stop_profiler())
+
+        # Desktop, terminals and app launcher talk to this kernel over the bus
+        self.ipc = IPCServer(executor=self.executor)
+        self.ipc.register_all(kernel.ipc_methods(), inline=('ping', 'apps.list', 'apps.usage', 'services.status'))
+        self.on_startup(self.start_ipc)
+        self.on_shutdown(lambda loop: self.ipc.stop())
+
+    async def start_ipc(self, loop):
+        try:
+            await self.ipc.start()
+            print(f"🔌 IPC bus listening on {self.ipc.path}")
+        except OSError as e:
+            print(f"⚠️ IPC bus not available: {e}")
+
+    def run(self):
+        """Block the calling thread running the kernel loop"""
+        try:
+            asyncio.run(self.main())
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
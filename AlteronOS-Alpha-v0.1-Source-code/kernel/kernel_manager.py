@@ -4,19 +4,68 @@ AlteronOS Enhanced Kernel Manager v2.0
 Manages ALL components with universal app support
 """
 
-import ctypes
+import importlib.util
 import threading
 import time
 import sys
 from pathlib import Path
 from typing import Dict, List, Any
+from lazy_import import lazy_import, lazy_module_status, ImportTimer
+
+# --import-report has to see the kernel's own imports, so its timer goes in before them
+BOOT_STARTED = time.perf_counter()
+IMPORT_TIMER = ImportTimer().install() if __name__ == "__main__" and '--import-report' in sys.argv else None
+
+from boot_graph import BootGraph
+from tracing import Tracer, NULL_TRACER
+from launch_scheduler import LaunchScheduler
+from kernel_loop import KernelLoop
+from service_manager import ServiceManager, ServiceUnit
+from metrics import REGISTRY, MetricsServer, cache_hit_rates
+
+# Heavy modules load on first use, not at kernel import
+desktop = lazy_import('desktop')
+sampling_profiler = lazy_import('sampling_profiler')
+
+# Native worker libraries (see AOSFS/native_workers.py)
+NATIVE_WORKERS = {
+    'c': './libc_worker.so',
+    'rust': './librust_worker.so',
+    'go': './libgo_worker.so',
+    'cpp': './libcpp_worker.so'
+}
+
+RUNNING_PROCESSES = REGISTRY.gauge('alteron_running_processes', 'Live application processes')
+LAUNCH_QUEUE = REGISTRY.gauge('alteron_launch_queue_depth', 'Launches waiting for a platform slot')
+APPS_CPU = REGISTRY.gauge('alteron_apps_cpu_percent', 'CPU use of all supervised apps')
+APPS_RSS = REGISTRY.gauge('alteron_apps_rss_bytes', 'Resident memory of all supervised apps')
+BOOT_STEP_SECONDS = REGISTRY.gauge('alteron_boot_step_seconds', 'Duration of each boot step', ('step',))
+
+# Sibling component directories, imported as flat modules
+COMPONENT_DIRS = ['AOSFS', 'compatibility-cross', 'terminal', 'user']
+
+def add_component_paths():
+    """Make AOSFS, compatibility, terminal and user modules importable"""
+    root = Path(__file__).resolve().parent.parent
+    for name in COMPONENT_DIRS:
+        component_dir = str(root / name)
+        if component_dir not in sys.path and Path(component_dir).is_dir():
+            sys.path.append(component_dir)
 
 class EnhancedKernelManager:
-    def __init__(self):
+    def __init__(self, trace: bool = False, headless: bool = False, profile: bool = False,
+                 profile_path=None, monitor_interval: float = 2.0):
+        self.tracer = Tracer() if trace else NULL_TRACER
+        self.headless = headless
+        self._profiler = None
+        self.profile_path = profile_path
+        if profile:
+            self.profiler.start()
         self.system_ready = False
         self.components = {}
         self.terminals = {}
-        self.running_apps = []
+        self.boot_report = {}
+        self.print_lock = threading.Lock()
         
         # Enhanced feature flags
         self.features = {
@@ -26,39 +75,83 @@ class EnhancedKernelManager:
             'windows_compat': True,
             'linux_compat': True,
             'macos_compat': True,
-            'aosfs_protected': True
+            'aosfs_protected': True,
+            'desktop': not headless
         }
         
+        add_component_paths()
+        
+        # One process table for the kernel and the compatibility layer
+        from process_supervisor import ProcessSupervisor
+        from resource_monitor import ResourceMonitor
+        self.supervisor = ProcessSupervisor()
+        self.resource_monitor = ResourceMonitor(self.supervisor, interval=monitor_interval)
+        RUNNING_PROCESSES.set_function(lambda: len(self.supervisor))
+        APPS_CPU.set_function(lambda: self.resource_monitor.totals()['cpu_percent'])
+        APPS_RSS.set_function(lambda: self.resource_monitor.totals()['rss'])
+        
         self.boot_sequence()
         
-    def boot_sequence(self):
-        """Enhanced boot sequence"""
-        print("=" * 60)
-        print("🚀 ALTERONOS v2.0 - Enhanced Boot Sequence")
-        print("=" * 60)
+    def build_boot_graph(self):
+        """Declare boot steps and their dependencies"""
+        graph = BootGraph(max_workers=4,
+                          on_start=self.report_step_start,
+                          on_finish=self.report_step_finish,
+                          tracer=self.tracer)
         
+        # (key, title, func, deps, timeout, cost)
         steps = [
-            ("Initializing Python Kernel Manager", self.init_kernel),
-            ("Loading Native Workers", self.load_native_workers),
-            ("Mounting AOSFS", self.mount_aosfs),
-            ("Starting Compatibility Layer", self.start_compatibility),
-            ("Initializing Multi-Terminal System", self.init_terminals),
-            ("Loading Universal App Support", self.load_app_support),
-            ("Starting System Services", self.start_services),
-            ("Launching Desktop Environment", self.launch_desktop)
+            ("kernel", "Initializing Python Kernel Manager", self.init_kernel, [], 5, 0.1),
+            ("workers", "Loading Native Workers", self.load_native_workers, ["kernel"], 10, 1.0),
+            ("aosfs", "Mounting AOSFS", self.mount_aosfs, ["kernel"], 10, 1.0),
+            ("compat", "Starting Compatibility Layer", self.start_compatibility, ["kernel"], 30, 5.0),
+            ("terminals", "Initializing Multi-Terminal System", self.init_terminals, ["kernel"], 10, 0.5),
+            ("app_support", "Loading Universal App Support", self.load_app_support, ["compat"], 5, 0.1),
+            ("services", "Starting System Services", self.start_services,
+             ["workers", "aosfs", "compat", "terminals"], 15, 0.5),
+            ("desktop", "Launching Desktop Environment", self.launch_desktop,
+             ["services", "app_support"], 15, 1.0)
         ]
         
-        for step_name, step_func in steps:
-            print(f"\n🔧 {step_name}...")
-            if step_func():
-                print("   ✅ Success")
+        if self.headless:
+            # Server boot: no desktop, so tkinter is never imported
+            steps = [step for step in steps if step[0] != "desktop"]
+            
+        for key, title, func, deps, timeout, cost in steps:
+            graph.add_step(key, title, func, deps=deps, timeout=timeout, cost=cost)
+            
+        return graph
+        
+    def report_step_start(self, step):
+        with self.print_lock:
+            print(f"\n🔧 {step.title}...")
+            
+    def report_step_finish(self, step, result):
+        BOOT_STEP_SECONDS.labels(step.key).set(result['duration'])
+        with self.print_lock:
+            if result["success"]:
+                print(f"   ✅ {step.title} ({result['duration'] * 1000:.0f} ms)")
             else:
-                print("   ❌ Failed")
-                return False
+                reason = f": {result['error']}" if result["error"] else ""
+                print(f"   ❌ {step.title} failed{reason}")
                 
+    def boot_sequence(self):
+        """Enhanced boot sequence (parallel dependency graph)"""
+        print("=" * 60)
+        print("🚀 ALTERONOS v2.0 - Enhanced Boot Sequence")
+        print("=" * 60)
+        
+        with self.tracer.span("Boot", cat='boot'):
+            self.boot_report = self.build_boot_graph().run()
+        
+        if not self.boot_report["success"]:
+            print(f"\n❌ Boot aborted at: {self.boot_report['failed_step']}")
+            return False
+            
         self.system_ready = True
-        print(f"\n🎉 AlteronOS v2.0 Ready!")
+        print(f"\n🎉 AlteronOS v2.0 Ready! ({self.boot_report['wall_time'] * 1000:.0f} ms)")
         print("   Features: Universal Apps, Multi-Terminals, AOSFS, .txt Support")
+        print(f"   Critical path: {' → '.join(self.boot_report['critical_path'])}")
         return True
         
     def init_kernel(self):
@@ -69,53 +162,37 @@ class EnhancedKernelManager:
         
     def load_native_workers(self):
         """Load all native workers"""
-        workers = {
-            'c': self.load_c_worker,
-            'rust': self.load_rust_worker, 
-            'go': self.load_go_worker,
-            'cpp': self.load_cpp_worker
-        }
+        from native_workers import NativeWorkerManager
+        self.workers = NativeWorkerManager()
         
-        for name, loader in workers.items():
-            if loader():
+        for name, lib_path in NATIVE_WORKERS.items():
+            with self.tracer.span(f"Load {name} worker", cat='worker') as span:
+                worker = self.workers.register(name, lib_path, init=f'init_{name}_worker')
+                loaded = worker.state == 'healthy'
+                span.set(loaded=loaded)
+                
+            if loaded:
                 self.components[f'{name}_worker'] = True
             else:
                 print(f"   ⚠️ {name} worker not available")
                 
         return True
         
-    def load_c_worker(self):
-        try:
-            self.c_worker = ctypes.CDLL('./libc_worker.so')
-            self.c_worker.init_enhanced_worker()
-            return True
-        except:
-            return False
-            
-    def load_rust_worker(self):
-        try:
-            self.rust_worker = ctypes.CDLL('./librust_worker.so')
-            self.rust_worker.init_enhanced_worker() 
-            return True
-        except:
-            return False
-            
-    def load_go_worker(self):
-        try:
-            self.go_worker = ctypes.CDLL('./libgo_worker.so')
-            self.go_worker.init_enhanced_worker()
-            return True
-        except:
-            return False
-            
-    def load_cpp_worker(self):
-        try:
-            self.cpp_worker = ctypes.CDLL('./libcpp_worker.so')
-            self.cpp_worker.init_enhanced_worker()
-            return True
-        except:
-            return False
+    def check_workers(self):
+        """Health-probe native workers and hot-swap rebuilt libraries"""
+        self.workers.check()
+        for name in NATIVE_WORKERS:
+            self.components[f'{name}_worker'] = self.workers.available(name)
             
+    def reload_worker(self, name: str):
+        """Swap in a rebuilt worker library without restarting the kernel"""
+        if name not in self.workers.workers:
+            return {"success": False, "error": f"Unknown worker: {name}"}
+        success = self.workers.reload(name)
+        worker = self.workers.workers[name]
+        return {"success": success, "version": worker.version, "generation": worker.generation,
+                "error": None if success else worker.last_error}
+        
     def mount_aosfs(self):
         """Mount enhanced AOSFS with .txt support"""
         try:
@@ -149,8 +226,12 @@ class EnhancedKernelManager:
     def start_compatibility(self):
         """Start universal compatibility layer"""
         try:
-            from compatibility import UniversalCompatibility
-            self.compat_layer = UniversalCompatibility()
+            with self.tracer.span("Import compatibility layer", cat='compat'):
+                from universal_compat import RealUniversalCompatibility
+            with self.tracer.span("Compatibility probes", cat='compat'):
+                self.compat_layer = RealUniversalCompatibility(supervisor=self.supervisor)
+            self.launch_scheduler = LaunchScheduler(self.compat_layer, self.supervisor)
+            LAUNCH_QUEUE.set_function(self.launch_scheduler.queue_depth)
             print("   🌍 Universal Compatibility: Windows, Linux, macOS")
             return True
         except ImportError:
@@ -175,77 +256,254 @@ class EnhancedKernelManager:
         
     def start_services(self):
         """Start system services"""
-        services = [
-            "File System Monitor",
-            "App Compatibility Service", 
-            "Terminal Management",
-            "User Session Manager",
-            "Security Layer"
+        self.service_manager = ServiceManager()
+        
+        units = [
+            ServiceUnit('fs_monitor', "File System Monitor", self.start_fs_monitor,
+                        stop=self.stop_fs_monitor, health=lambda: self.fs_manager.mounted,
+                        lazy=True),
+            ServiceUnit('compat_service', "App Compatibility Service", self.start_compat_service,
+                        health=self.check_compat_service),
+            ServiceUnit('terminal_mgmt', "Terminal Management", self.start_terminal_service,
+                        stop=self.stop_terminal_service,
+                        health=lambda: bool(self.terminal_mgr.terminals)),
+            ServiceUnit('session_manager', "User Session Manager", self.start_session_manager,
+                        stop=lambda: self.sessions.clear(),
+                        deps=['compat_service', 'terminal_mgmt'])
         ]
         
-        for service in services:
-            print(f"   🛡️ Starting: {service}")
+        for unit in units:
+            self.service_manager.register(unit)
             
+        # Units that fail to start stay in backoff and are retried by tick();
+        # none of them is critical enough to abort boot
+        if not self.service_manager.start_all():
+            for unit in self.service_manager.units.values():
+                if unit.state == 'backoff':
+                    print(f"   ⚠️ {unit.title} not available: {unit.last_error}")
+        return True
+        
+    def require_service(self, name: str) -> bool:
+        """Start a (possibly lazy) service on first use"""
+        return self.service_manager.require(name)
+        
+    def start_fs_monitor(self):
+        from fs_manager import EnhancedAOSFSManager
+        self.fs_manager = EnhancedAOSFSManager(workers=self.workers)
+        return self.fs_manager.mounted
+        
+    def stop_fs_monitor(self):
+        self.fs_manager.catalog.close()
+        del self.fs_manager
+        
+    def start_compat_service(self):
+        return hasattr(self, 'compat_layer')
+        
+    def check_compat_service(self):
+        # Children must still be reaped, by the reaper thread or the kernel loop
+        return self.supervisor.reaper.is_alive() or self.supervisor.loop is not None
+        
+    def start_terminal_service(self):
+        if not hasattr(self, 'terminal_mgr'):
+            from terminals import TerminalManager
+            self.terminal_mgr = TerminalManager()
+        return True
+        
+    def stop_terminal_service(self):
+        del self.terminal_mgr
+        
+    def start_session_manager(self):
+        self.sessions = {}
         return True
         
     def launch_desktop(self):
         """Launch enhanced desktop environment"""
-        try:
-            from desktop import EnhancedAlteronDesktop
-            desktop_thread = threading.Thread(target=self.start_desktop, daemon=True)
-            desktop_thread.start()
-            print("   🖥️ Desktop environment launched")
-            return True
-        except ImportError as e:
-            print(f"   ⚠️ Desktop not available: {e}")
+        # Only locate the module here; tkinter is imported by the desktop thread
+        if importlib.util.find_spec('desktop') is None:
+            print("   ⚠️ Desktop not available: No module named 'desktop'")
             return True  # Can run in terminal mode
             
+        desktop_thread = threading.Thread(target=self.start_desktop, daemon=True)
+        desktop_thread.start()
+        print("   🖥️ Desktop environment launched")
+        return True
+            
     def start_desktop(self):
         """Start desktop in separate thread"""
-        desktop = EnhancedAlteronDesktop()
-        desktop.run()
+        try:
+            desktop_env = desktop.AlteronDesktop()
+            desktop_env.run()
+        except Exception as e:
+            print(f"⚠️ Desktop stopped: {e}")
         
-    def run_application(self, app_path: str, platform: str = "auto"):
-        """Run application with compatibility layer"""
+    def run_application(self, app_path: str, platform: str = "auto", args=None,
+                        priority: str = "normal", limits=None):
+        """Queue application launch through the launch scheduler"""
         if not self.system_ready:
             return {"success": False, "error": "System not ready"}
             
         print(f"🚀 Launching: {app_path}")
         
-        # Use compatibility layer if available
-        if hasattr(self, 'compat_layer'):
-            result = self.compat_layer.run_application(app_path)
-        else:
-            result = {"success": True, "output": f"Running {app_path}"}
-            
-        if result['success']:
-            self.running_apps.append({
-                'path': app_path,
-                'platform': result.get('platform', 'unknown'),
-                'timestamp': time.time()
-            })
+        with self.tracer.span(f"Launch {Path(app_path).name}", cat='app', path=app_path) as span:
+            # Use compatibility layer if available
+            if hasattr(self, 'launch_scheduler'):
+                ticket = self.launch_scheduler.submit(app_path, args=args,
+                                                      platform=None if platform == "auto" else platform,
+                                                      priority=priority, limits=limits)
+                result = dict(ticket.result or {"success": True}, ticket=ticket.id,
+                              state=ticket.state, platform=ticket.platform)
+            else:
+                result = {"success": False, "error": "Compatibility layer not available"}
+            span.set(success=result['success'], platform=result.get('platform', 'unknown'))
             
         return result
         
+    async def run_batch(self, launches, limit: int = 64, timeout=None):
+        """Run many apps concurrently on the kernel loop and return their results in order"""
+        if not self.system_ready:
+            return {"success": False, "error": "System not ready"}
+        if not hasattr(self, 'compat_layer'):
+            return {"success": False, "error": "Compatibility layer not available"}
+        with self.tracer.span(f"Batch launch ({len(launches)} apps)", cat='app') as span:
+            results = await self.compat_layer.run_many_async(launches, limit=limit, timeout=timeout)
+            span.set(succeeded=sum(1 for result in results if result.get('success')))
+        return {"success": all(result.get('success') for result in results), "results": results}
+        
+    @property
+    def running_apps(self):
+        """Live application processes keyed by PID"""
+        return self.supervisor.table
+        
+    def ipc_methods(self):
+        """Kernel calls exposed on the IPC bus"""
+        return {
+            'ping': lambda: 'pong',
+            'system.info': self.get_system_info,
+            'apps.run': self.run_application,
+            'apps.run_batch': self.run_batch,
+            'apps.list': self.supervisor.snapshot,
+            'apps.usage': lambda pid=None: (self.resource_monitor.get(pid) if pid
+                                            else self.resource_monitor.all_usage()),
+            'compat.detect': lambda app_path: self.compat_layer.detect_platform(app_path),
+            'compat.classify': lambda paths, recursive=False: self.compat_layer.classify_many(paths, recursive),
+            'terminals.list': lambda: list(self.terminal_mgr.terminals),
+            'terminals.execute': lambda name, command: self.terminal_mgr.terminals[name].execute(command),
+            'services.status': lambda: self.service_manager.status(),
+            'services.require': self.require_service,
+            'metrics.snapshot': REGISTRY.snapshot,
+            'workers.status': lambda: self.workers.status(),
+            'workers.reload': self.reload_worker,
+            'profiler.start': self.start_profiler,
+            'profiler.stop': self.stop_profiler,
+            'profiler.status': lambda: self.profiler.status()
+        }
+        
+    @property
+    def profiler(self):
+        """Created on first use, so a kernel that never profiles never imports the sampler"""
+        if self._profiler is None:
+            self._profiler = sampling_profiler.SamplingProfiler()
+        return self._profiler
+        
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None and self._profiler.running
+        
+    def start_profiler(self):
+        """Start sampling every kernel thread"""
+        if not self.profiler.start():
+            return {"success": False, "error": "Profiler already running"}
+        print(f"🔬 Profiler sampling every {self.profiler.interval * 1000:.0f} ms")
+        return {"success": True}
+        
+    def stop_profiler(self, path=None):
+        """Stop sampling and write folded stacks"""
+        if not self.profiler.stop():
+            return {"success": False, "error": "Profiler not running"}
+        path = self.profiler.write_folded(path or self.profile_path)
+        status = self.profiler.status()
+        print(f"🔬 Profile written to {path} ({status['samples']} samples)")
+        return {"success": True, "path": path, "samples": status['samples'],
+                "duration": status['duration'], "top": self.profiler.top()}
+        
+    def toggle_profiler(self):
+        return self.stop_profiler() if self.profiling else self.start_profiler()
+        
     def get_system_info(self):
         """Get comprehensive system information"""
+        metrics = REGISTRY.snapshot()
         return {
             "os_name": "AlteronOS",
             "version": self.kernel_version,
             "architecture": self.architecture,
             "features": self.features,
             "components_loaded": list(self.components.keys()),
-            "running_apps": len(self.running_apps),
-            "system_ready": self.system_ready
+            "running_apps": metrics['alteron_running_processes'],
+            "app_resources": self.resource_monitor.totals(),
+            "native_workers": self.workers.status() if hasattr(self, 'workers') else [],
+            "launch_queue": self.launch_scheduler.stats() if hasattr(self, 'launch_scheduler') else None,
+            "services": self.service_manager.status() if hasattr(self, 'service_manager') else [],
+            "system_ready": self.system_ready,
+            "headless": self.headless,
+            "lazy_modules": lazy_module_status(),
+            "launches_per_second": metrics['alteron_launches_per_second'],
+            "cache_hit_rates": cache_hit_rates(),
+            "metrics": metrics
         }
 
+def export_boot_trace(kernel, trace_path="alteron_boot_trace.json"):
+    """Write the Chrome trace and print the span summary"""
+    kernel.tracer.export_chrome_trace(trace_path)
+    print("\n📈 Boot Trace Summary")
+    print(kernel.tracer.format_summary())
+    print(f"\n   Trace written to {trace_path} (open in ui.perfetto.dev or chrome://tracing)")
+    # Only boot is traced; launch spans would otherwise pile up for the kernel's lifetime
+    kernel.tracer = NULL_TRACER
+
+def print_import_report(import_timer, boot_started):
+    """Print the -X importtime style report collected during boot"""
+    print("\n📦 Import Time Report")
+    print(import_timer.format_report())
+    print("\n   Slowest top-level imports:")
+    for record in import_timer.slowest(5):
+        print(f"   {record['cumulative_us'] / 1000:8.2f} ms  {record['module']}")
+    print(f"\n   Kernel cold start: {(time.perf_counter() - boot_started) * 1000:.1f} ms")
+
 # Kernel entry point
 if __name__ == "__main__":
-    kernel = EnhancedKernelManager()
+    trace_arg = next((arg for arg in sys.argv[1:] if arg.startswith('--trace-boot')), None)
+    metrics_arg = next((arg for arg in sys.argv[1:] if arg.startswith('--metrics-port')), None)
+    profile_arg = next((arg for arg in sys.argv[1:] if arg.startswith('--profile')), None)
+    _, _, profile_path = (profile_arg or '').partition('=')
+    interval_arg = next((arg for arg in sys.argv[1:] if arg.startswith('--monitor-interval=')), None)
+    kernel = EnhancedKernelManager(trace=trace_arg is not None,
+                                   headless='--headless' in sys.argv,
+                                   profile=profile_arg is not None,
+                                   profile_path=profile_path or None,
+                                   monitor_interval=float(interval_arg.partition('=')[2]) if interval_arg else 2.0)
     
-    # Keep kernel running
+    if trace_arg:
+        _, _, trace_path = trace_arg.partition('=')
+        export_boot_trace(kernel, trace_path or "alteron_boot_trace.json")
+        
+    if IMPORT_TIMER:
+        IMPORT_TIMER.uninstall()
+        print_import_report(IMPORT_TIMER, BOOT_STARTED)
+    
+    # Keep kernel running on the event loop until SIGINT/SIGTERM
+    kernel_loop = KernelLoop(kernel)
+    
+    if metrics_arg:
+        _, _, metrics_port = metrics_arg.partition('=')
+        try:
+            metrics_server = MetricsServer(REGISTRY, int(metrics_port or 9464)).start()
+            print(f"📊 Metrics on http://127.0.0.1:{metrics_server.port}/metrics")
+            kernel_loop.on_shutdown(lambda loop: metrics_server.stop())
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Metrics endpoint not available: {e}")
+        
     try:
-        while True:
-            time.sleep(1)
+        kernel_loop.run()
     except KeyboardInterrupt:
-        print("\n🛑 AlteronOS Kernel Shutting Down...")
\ No newline at end of file
+        pass
+    print("\n🛑 AlteronOS Kernel Shutting Down...")
\ No newline at end of file
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Launch Scheduler
+Queued app launches with per-platform limits, priorities and resource caps
+"""
+
+import itertools
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from metrics import REGISTRY
+
+# Priority classes, highest first: (rank, nice value)
+PRIORITY_CLASSES = {
+    'interactive': (0, 0),
+    'normal': (1, 5),
+    'batch': (2, 10),
+    'idle': (3, 19)
+}
+
+DEFAULT_PLATFORM_LIMITS = {
+    'windows': 2,
+    'macos': 2,
+    'linux': max(2, (os.cpu_count() or 2)),
+    'cross_platform': max(2, (os.cpu_count() or 2))
+}
+
+LAUNCHES = REGISTRY.counter('alteron_launches_total', 'App launches by platform and outcome',
+                            ('platform', 'result'))
+LAUNCH_LATENCY = REGISTRY.histogram('alteron_launch_latency_seconds',
+                                    'Submit-to-running time of app launches (queue wait and spawn)',
+                                    ('platform',))
+LAUNCH_RATE = REGISTRY.meter('alteron_launches_per_second', 'App launches started per second (60 s window)')
+APP_EXITS = REGISTRY.counter('alteron_app_exits_total', 'Scheduled app exits by platform and status',
+                             ('platform', 'status'))
+
+
+class ResourceLimits:
+    def __init__(self, cpu_seconds: Optional[int] = None, address_space: Optional[int] = None,
+                 nice: Optional[int] = None):
+        self.cpu_seconds = cpu_seconds
+        self.address_space = address_space
+        self.nice = nice
+
+    def settings(self, nice: int) -> Dict[str, Any]:
+        """Limits as plain data, with the priority class's nice unless overridden"""
+        return {'cpu_seconds': self.cpu_seconds, 'address_space': self.address_space,
+                'nice': self.nice if self.nice is not None else nice}
+
+
+class LaunchTicket:
+    __slots__ = ('id', 'app_path', 'args', 'platform', 'priority', 'limits',
+                 'state', 'pid', 'result', 'submitted', 'started', 'rank')
+
+    def __init__(self, ticket_id, app_path, args, platform, priority, limits):
+        self.id = ticket_id
+        self.app_path = app_path
+        self.args = args
+        self.platform = platform
+        self.priority = priority
+        self.limits = limits
+        self.state = 'queued'
+        self.pid = None
+        self.result = None
+        self.submitted = time.time()
+        self.started = None
+        self.rank = PRIORITY_CLASSES[priority][0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ticket': self.id,
+            'path': self.app_path,
+            'platform': self.platform,
+            'priority': self.priority,
+            'state': self.state,
+            'pid': self.pid,
+            'queued_for': (self.started or time.time()) - self.submitted
+        }
+
+
+class LaunchScheduler:
+    def __init__(self, compat_layer, supervisor, platform_limits=None,
+                 default_limits: Optional[ResourceLimits] = None, aging_seconds: float = 10.0):
+        self.compat = compat_layer
+        self.supervisor = supervisor
+        self.platform_limits = dict(DEFAULT_PLATFORM_LIMITS, **(platform_limits or {}))
+        self.default_limits = default_limits or ResourceLimits()
+        self.aging_seconds = aging_seconds
+
+        # One FIFO per (priority rank, platform)
+        self.queues: Dict[tuple, deque] = {}
+        self.active: Dict[str, int] = {platform: 0 for platform in self.platform_limits}
+        self.tickets: Dict[int, LaunchTicket] = {}
+        self.finished = deque(maxlen=256)
+        self.by_pid: Dict[int, LaunchTicket] = {}
+        self.platform_cycle = deque(self.platform_limits)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        # Set by the kernel loop: runs exit handling (and the launches it frees up) off the loop thread
+        self.handoff: Optional[Callable] = None
+
+        self.supervisor.on_exit(self.process_exited)
+
+    def submit(self, app_path: str, args=None, platform: Optional[str] = None,
+               priority: str = 'normal', limits: Optional[ResourceLimits] = None) -> LaunchTicket:
+        """Queue an app launch; it starts as soon as its platform has a free slot"""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        platform = platform or self.compat.detect_platform(app_path)
+        ticket = LaunchTicket(next(self.ids), app_path, args, platform, priority,
+                              limits or self.default_limits)
+
+        with self.lock:
+            self.tickets[ticket.id] = ticket
+            self.queues.setdefault((ticket.rank, platform), deque()).append(ticket)
+            self.active.setdefault(platform, 0)
+            if platform not in self.platform_cycle:
+                self.platform_cycle.append(platform)
+            picked = self.dispatch()
+
+        self.launch(picked)
+        return ticket
+
+    def cancel(self, ticket_id: int) -> bool:
+        """Remove a queued launch"""
+        with self.lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None or ticket.state != 'queued':
+                return False
+            self.queues[(ticket.rank, ticket.platform)].remove(ticket)
+            ticket.state = 'cancelled'
+            self.retire(ticket)
+            return True
+
+    def has_slot(self, platform: str) -> bool:
+        return self.active.get(platform, 0) < self.platform_limits.get(platform, 1)
+
+    def age_queues(self):
+        """Promote long-waiting launches one class so low priorities can't starve"""
+        now = time.time()
+        for (rank, platform), queue in list(self.queues.items()):
+            if rank == 0:
+                continue
+            while queue and now - queue[0].submitted > self.aging_seconds * rank:
+                ticket = queue.popleft()
+                ticket.rank = rank - 1
+                self.queues.setdefault((ticket.rank, platform), deque()).append(ticket)
+
+    def next_ticket(self) -> Optional[LaunchTicket]:
+        """Highest priority first; round-robin across platforms within a class"""
+        ranks = sorted({rank for (rank, _), queue in self.queues.items() if queue})
+        for rank in ranks:
+            for _ in range(len(self.platform_cycle)):
+                platform = self.platform_cycle[0]
+                self.platform_cycle.rotate(-1)
+                queue = self.queues.get((rank, platform))
+                if queue and self.has_slot(platform):
+                    return queue.popleft()
+        return None
+
+    def dispatch(self) -> List[LaunchTicket]:
+        """Pick as many queued launches as the limits allow (caller holds the lock).
+
+        Picked tickets hold their platform slot; the caller starts them with
+        launch() once it has released the lock, since building the command,
+        preflight, preparing a Wine environment and spawning can take seconds.
+        """
+        self.age_queues()
+        picked = []
+        while True:
+            ticket = self.next_ticket()
+            if ticket is None:
+                return picked
+            ticket.state = 'starting'
+            ticket.started = time.time()
+            self.active[ticket.platform] += 1
+            picked.append(ticket)
+
+    def launch(self, tickets: List[LaunchTicket]):
+        """Start picked tickets without holding the lock; each one that ends frees its slot for the next"""
+        pending = deque(tickets)
+        while pending:
+            ticket = pending.popleft()
+            entry, result, outcome = self.start(ticket)
+            with self.lock:
+                ticket.result = result
+                if entry is None:
+                    ticket.state = 'done' if result.get('success') else 'failed'
+                    self.active[ticket.platform] -= 1
+                    self.retire(ticket)
+                else:
+                    ticket.pid = entry.pid
+                    ticket.state = 'running'
+                    self.by_pid[entry.pid] = ticket
+                    LAUNCH_LATENCY.labels(ticket.platform).observe(time.time() - ticket.submitted)
+                if outcome in ('started', 'in_process'):
+                    LAUNCH_RATE.mark()
+                LAUNCHES.labels(ticket.platform, outcome).inc()
+                pending.extend(self.dispatch())
+            if entry is not None and entry.returncode is not None:
+                # Exited before it was registered, so its exit callback found no ticket
+                self.finish(entry)
+
+    def start(self, ticket: LaunchTicket) -> Tuple[Any, Dict[str, Any], str]:
+        """(process entry or None, result, outcome) for one launch; never raises"""
+        platform = ticket.platform
+        try:
+            cmd = self.compat.build_command(ticket.app_path, ticket.args, platform)
+        except Exception as e:
+            return None, {"success": False, "error": str(e), "platform": platform}, 'spawn_failed'
+
+        if cmd is None:
+            # Not a process launch (package, disk image, text file)
+            try:
+                result = self.compat.run_application(ticket.app_path, ticket.args, platform)
+            except Exception as e:
+                result = {"success": False, "error": str(e), "platform": platform}
+            return None, result, 'in_process'
+
+        try:
+            check = self.compat.preflight(ticket.app_path, platform)
+        except Exception as e:
+            check = {"success": False, "error": str(e)}
+        if not check['success']:
+            # Fail fast instead of spawning a binary the dynamic loader will reject
+            return None, dict(check, platform=platform), 'preflight_failed'
+
+        nice = PRIORITY_CLASSES[ticket.priority][1]
+        try:
+            # Limits travel as data: pooled .py launches are forked by the pool, not by us
+            entry = self.compat.spawn_process(cmd, path=ticket.app_path, platform=platform,
+                                              limits=ticket.limits.settings(nice),
+                                              env=self.compat.launch_env(ticket.app_path, platform),
+                                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            return None, {"success": False, "error": str(e), "platform": platform}, 'spawn_failed'
+        return entry, {"success": True, "pid": entry.pid, "platform": platform}, 'started'
+
+    def tick(self):
+        """Periodic re-dispatch so aging applies while nothing exits"""
+        with self.lock:
+            picked = self.dispatch()
+        self.launch(picked)
+
+    def process_exited(self, entry):
+        """Supervisor callback, on the kernel loop when one is attached: the work happens in finish()"""
+        if self.handoff is not None:
+            self.handoff(self.finish, entry)
+        else:
+            self.finish(entry)
+
+    def finish(self, entry):
+        """Free a scheduled process's slot and start the next launch"""
+        with self.lock:
+            ticket = self.by_pid.pop(entry.pid, None)
+            if ticket is None:
+                return
+            ticket.state = 'done' if entry.returncode == 0 else 'failed'
+            ticket.result = dict(ticket.result, success=entry.returncode == 0, return_code=entry.returncode)
+            self.active[ticket.platform] -= 1
+            APP_EXITS.labels(ticket.platform, ticket.state).inc()
+            self.retire(ticket)
+            picked = self.dispatch()
+        self.launch(picked)
+
+    def retire(self, ticket: LaunchTicket):
+        """Move a finished ticket to the bounded history"""
+        self.tickets.pop(ticket.id, None)
+        self.finished.append(ticket)
+
+    def get(self, ticket_id: int) -> Optional[LaunchTicket]:
+        ticket = self.tickets.get(ticket_id)
+        if ticket is None:
+            ticket = next((t for t in self.finished if t.id == ticket_id), None)
+        return ticket
+
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in list(self.queues.values()))
+
+    def queued(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [ticket.to_dict() for queue in self.queues.values() for ticket in queue]
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'queued': self.queue_depth(),
+                'active': dict(self.active),
+                'limits': dict(self.platform_limits)
+            }
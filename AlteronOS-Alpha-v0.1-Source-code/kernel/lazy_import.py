@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Lazy Imports
+Deferred module proxies and a built-in import-time report
+"""
+
+import importlib
+import importlib.abc
+import sys
+import threading
+import time
+from typing import Dict, List, Any
+
+# Every proxy created, so the kernel can report what was actually loaded
+LAZY_MODULES: Dict[str, "LazyModule"] = {}
+
+
+class LazyModule:
+    """Stands in for a module until the first attribute access"""
+
+    def __init__(self, name: str):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+        object.__setattr__(self, '_load_time', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _load(self):
+        module = object.__getattribute__(self, '_module')
+        if module is not None:
+            return module
+
+        with object.__getattribute__(self, '_lock'):
+            module = object.__getattribute__(self, '_module')
+            if module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(object.__getattribute__(self, '_name'))
+                object.__setattr__(self, '_load_time', time.perf_counter() - started)
+                object.__setattr__(self, '_module', module)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        name = object.__getattribute__(self, '_name')
+        state = "loaded" if object.__getattribute__(self, '_module') is not None else "deferred"
+        return f"<lazy module '{name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy that imports `name` on first use"""
+    if name in LAZY_MODULES:
+        return LAZY_MODULES[name]
+    proxy = LazyModule(name)
+    LAZY_MODULES[name] = proxy
+    return proxy
+
+
+def is_loaded(proxy: LazyModule) -> bool:
+    return object.__getattribute__(proxy, '_module') is not None
+
+
+def lazy_module_status() -> List[Dict[str, Any]]:
+    """Which deferred modules were loaded, and what the first use cost"""
+    status = []
+    for name, proxy in LAZY_MODULES.items():
+        load_time = object.__getattribute__(proxy, '_load_time')
+        status.append({
+            "module": name,
+            "loaded": is_loaded(proxy),
+            "load_ms": load_time * 1000 if load_time is not None else None
+        })
+    return status
+
+
+class TimedLoader:
+    """Wraps a real loader and reports create/exec time to the ImportTimer"""
+
+    def __init__(self, timer, loader, name):
+        self._timer = timer
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        self._timer.enter(self._name)
+        create = getattr(self._loader, 'create_module', None)
+        try:
+            return create(spec) if create else None
+        except BaseException:
+            self._timer.exit(self._name)
+            raise
+
+    def exec_module(self, module):
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.exit(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """In-process equivalent of `python -X importtime`"""
+
+    def __init__(self):
+        self.records = []
+        self.local = threading.local()
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self.installed = True
+        return self
+
+    def uninstall(self):
+        if self.installed:
+            sys.meta_path.remove(self)
+            self.installed = False
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = TimedLoader(self, spec.loader, fullname)
+            return spec
+        return None
+
+    def stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def enter(self, name):
+        self.stack().append([name, time.perf_counter(), 0.0])
+
+    def exit(self, name):
+        stack = self.stack()
+        if not stack or stack[-1][0] != name:
+            return
+        _, started, children = stack.pop()
+        cumulative = time.perf_counter() - started
+        if stack:
+            stack[-1][2] += cumulative
+        self.records.append({
+            "module": name,
+            "self_us": int((cumulative - children) * 1e6),
+            "cumulative_us": int(cumulative * 1e6),
+            "depth": len(stack)
+        })
+
+    def format_report(self) -> str:
+        """Render records in the `-X importtime` layout"""
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for record in self.records:
+            lines.append(f"import time: {record['self_us']:>9} | {record['cumulative_us']:>10} | "
+                         f"{'  ' * record['depth']}{record['module']}")
+        return "\n".join(lines)
+
+    def slowest(self, count: int = 10) -> List[Dict[str, Any]]:
+        top_level = [record for record in self.records if record['depth'] == 0]
+        return sorted(top_level, key=lambda record: record['cumulative_us'], reverse=True)[:count]
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Metrics
+Low-overhead counters, gauges and histograms with Prometheus export
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class ThreadCells:
+    """Per-thread value cells: writers never share a cell, readers sum them.
+
+    A thread's cell outlives it until the next new thread folds it into
+    base, so totals survive while the cell list stays bounded by live threads.
+    """
+
+    def __init__(self, factory: Callable[[], list]):
+        self.factory = factory
+        self.local = threading.local()
+        self.base = factory()
+        self.cells = []  # (thread, cell)
+        self.lock = threading.Lock()
+
+    def cell(self) -> list:
+        try:
+            return self.local.cell
+        except AttributeError:
+            cell = self.factory()
+            self.local.cell = cell
+            with self.lock:
+                self.fold_dead()
+                self.cells.append((threading.current_thread(), cell))
+            return cell
+
+    def fold_dead(self):
+        """Add finished threads' cells into base (caller holds the lock)"""
+        live = []
+        for thread, cell in self.cells:
+            if thread.is_alive():
+                live.append((thread, cell))
+            else:
+                for index, value in enumerate(cell):
+                    self.base[index] += value
+        self.cells = live
+
+    def values(self) -> list:
+        """Every cell to sum, base included"""
+        with self.lock:
+            return [self.base] + [cell for _, cell in self.cells]
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self):
+        self.cells = ThreadCells(lambda: [0])
+
+    def inc(self, amount=1):
+        self.cells.cell()[0] += amount
+
+    def value(self):
+        return sum(cell[0] for cell in self.cells.values())
+
+
+class Gauge:
+    kind = 'gauge'
+
+    def __init__(self, func: Optional[Callable[[], float]] = None):
+        self.current = 0
+        self.func = func
+
+    def set(self, value):
+        self.current = value
+
+    def set_function(self, func: Callable[[], float]):
+        """Compute the value at read time (e.g. len of a table)"""
+        self.func = func
+
+    def value(self):
+        return self.func() if self.func else self.current
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        size = len(self.buckets) + 1
+        # [bucket counts..., +Inf count, sum]
+        self.cells = ThreadCells(lambda: [0] * size + [0.0])
+
+    def observe(self, value):
+        cell = self.cells.cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def time(self):
+        """Context manager observing the elapsed seconds"""
+        return HistogramTimer(self)
+
+    def value(self):
+        size = len(self.buckets) + 1
+        counts = [0] * size
+        total = 0.0
+        for cell in self.cells.values():
+            for index in range(size):
+                counts[index] += cell[index]
+            total += cell[-1]
+
+        cumulative = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return {
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], cumulative)),
+            'count': running,
+            'sum': total
+        }
+
+
+class RateMeter:
+    """Events per second over a sliding window of one-second slots (exported as a gauge)"""
+    kind = 'gauge'
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self.seconds = [0] * window
+        self.counts = [0] * window
+        # The slot reset and the add must not interleave across threads
+        self.lock = threading.Lock()
+
+    def mark(self, amount=1):
+        now = int(time.time())
+        slot = now % self.window
+        with self.lock:
+            if self.seconds[slot] != now:
+                self.seconds[slot] = now
+                self.counts[slot] = 0
+            self.counts[slot] += amount
+
+    def value(self):
+        oldest = int(time.time()) - self.window
+        return sum(count for second, count in zip(self.seconds, self.counts) if second > oldest) / self.window
+
+
+class HistogramTimer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricFamily:
+    """A named metric with optional labels; children are created on first use"""
+
+    def __init__(self, name, help_text, metric_class, labelnames=(), **options):
+        self.name = name
+        self.help = help_text
+        self.metric_class = metric_class
+        self.kind = metric_class.kind
+        self.labelnames = tuple(labelnames)
+        self.options = options
+        self.children: Dict[tuple, Any] = {}
+        self.lock = threading.Lock()
+        if not self.labelnames:
+            self.children[()] = metric_class(**options)
+
+    def labels(self, *values, **kwargs):
+        key = tuple(str(value) for value in (values or [kwargs[name] for name in self.labelnames]))
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(key, self.metric_class(**self.options))
+        return child
+
+    # Unlabelled shortcuts
+    def inc(self, amount=1):
+        self.children[()].inc(amount)
+
+    def set(self, value):
+        self.children[()].set(value)
+
+    def set_function(self, func):
+        self.children[()].set_function(func)
+
+    def observe(self, value):
+        self.children[()].observe(value)
+
+    def mark(self, amount=1):
+        self.children[()].mark(amount)
+
+    def time(self):
+        return self.children[()].time()
+
+    def value(self):
+        return self.children[()].value()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.families: Dict[str, MetricFamily] = {}
+        self.lock = threading.Lock()
+
+    def get_or_create(self, name, help_text, metric_class, labelnames=(), **options):
+        family = self.families.get(name)
+        if family is None:
+            with self.lock:
+                family = self.families.get(name)
+                if family is None:
+                    family = MetricFamily(name, help_text, metric_class, labelnames, **options)
+                    self.families[name] = family
+        return family
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.get_or_create(name, help_text, Counter, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self.get_or_create(name, help_text, Gauge, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.get_or_create(name, help_text, Histogram, labelnames, buckets=buckets)
+
+    def meter(self, name, help_text, labelnames=(), window: int = 60):
+        return self.get_or_create(name, help_text, RateMeter, labelnames, window=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view of every metric"""
+        result = {}
+        for name, family in list(self.families.items()):
+            if not family.labelnames:
+                result[name] = family.children[()].value()
+                continue
+            result[name] = {
+                ','.join(f"{label}={value}" for label, value in zip(family.labelnames, key)): child.value()
+                for key, child in list(family.children.items())
+            }
+        return result
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, family in sorted(self.families.items()):
+            lines.append(f"# HELP {name} {family.help}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            for key, child in sorted(list(family.children.items())):
+                labels = [f'{label}="{escape_label(value)}"' for label, value in zip(family.labelnames, key)]
+                if family.kind == 'histogram':
+                    data = child.value()
+                    for bound, count in data['buckets'].items():
+                        bucket_labels = ','.join(labels + [f'le="{bound}"'])
+                        lines.append(f"{name}_bucket{{{bucket_labels}}} {count}")
+                    suffix = '{' + ','.join(labels) + '}' if labels else ''
+                    lines.append(f"{name}_sum{suffix} {data['sum']}")
+                    lines.append(f"{name}_count{suffix} {data['count']}")
+                else:
+                    suffix = '{' + ','.join(labels) + '}' if labels else ''
+                    lines.append(f"{name}{suffix} {child.value()}")
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsServer:
+    """Serves /metrics (Prometheus) and /snapshot (JSON) on a local port"""
+
+    def __init__(self, registry, port: int = 9464, host: str = '127.0.0.1'):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd = None
+
+    def start(self):
+        # http.server pulls in email and friends; only a kernel serving metrics pays for it
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/metrics'):
+                    body = registry.to_prometheus().encode()
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path.startswith('/snapshot'):
+                    import json
+                    body = json.dumps(registry.snapshot(), default=str).encode()
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, name="alteron-metrics", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
+
+CACHE_REQUESTS = REGISTRY.counter('alteron_cache_requests_total',
+                                  'Cache lookups by cache and result', ('cache', 'result'))
+
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc(count)
+
+
+def cache_hit_rates() -> Dict[str, float]:
+    """Hit ratio per cache from the lookup counters"""
+    totals: Dict[str, list] = {}
+    for (cache, result), child in list(CACHE_REQUESTS.children.items()):
+        counts = totals.setdefault(cache, [0, 0])
+        counts[0 if result == 'hit' else 1] += child.value()
+    return {cache: hits / (hits + misses) for cache, (hits, misses) in totals.items() if hits + misses}
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Sampling Profiler
+Wall-clock stack sampling of every kernel thread with folded-stack output
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+def default_profile_path() -> str:
+    profile_dir = Path.home() / '.alteronos' / 'profiles'
+    return str(profile_dir / time.strftime('kernel-%Y%m%d-%H%M%S.folded'))
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Dict[tuple, int] = {}
+        self.labels: Dict[Any, str] = {}
+        self.sample_count = 0
+        self.started = None
+        self.stopped = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None
+
+    def start(self) -> bool:
+        """Begin sampling (clears the previous profile)"""
+        with self.lock:
+            if self.thread is not None:
+                return False
+            self.samples = {}
+            self.sample_count = 0
+            self.started = time.time()
+            self.stopped = None
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.sample_loop, name="alteron-profiler", daemon=True)
+            self.thread.start()
+            return True
+
+    def stop(self) -> bool:
+        with self.lock:
+            if self.thread is None:
+                return False
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+            self.stopped = time.time()
+            return True
+
+    def sample_loop(self):
+        own_ident = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                # Code objects are cheap to collect; names are resolved when writing
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                key = (names.get(ident, str(ident)), tuple(reversed(stack)))
+                self.samples[key] = self.samples.get(key, 0) + 1
+            self.sample_count += 1
+
+    def frame_label(self, code) -> str:
+        label = self.labels.get(code)
+        if label is None:
+            module = Path(code.co_filename).stem
+            label = f"{module}:{code.co_name}".replace(';', ':').replace(' ', '_')
+            self.labels[code] = label
+        return label
+
+    def folded(self) -> List[str]:
+        """Folded stacks ("thread;frame;frame count"), ready for flamegraph.pl or speedscope"""
+        lines = {}
+        for (thread_name, stack), count in list(self.samples.items()):
+            line = ';'.join([thread_name.replace(' ', '_')] + [self.frame_label(code) for code in stack])
+            lines[line] = lines.get(line, 0) + count
+        return [f"{line} {count}" for line, count in sorted(lines.items())]
+
+    def write_folded(self, path: Optional[str] = None) -> str:
+        path = path or default_profile_path()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(self.folded()) + '\n')
+        os.replace(tmp_path, path)
+        return path
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Functions with the most samples on top of the stack"""
+        leaves = {}
+        total = 0
+        for (_, stack), count in list(self.samples.items()):
+            if stack:
+                label = self.frame_label(stack[-1])
+                leaves[label] = leaves.get(label, 0) + count
+                total += count
+        ranked = sorted(leaves.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [{'function': label, 'samples': count, 'percent': 100.0 * count / total}
+                for label, count in ranked]
+
+    def status(self) -> Dict[str, Any]:
+        end = self.stopped or time.time()
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'samples': self.sample_count,
+            'duration': end - self.started if self.started else 0.0
+        }
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Service Manager
+Service units with dependencies, health checks and restart backoff
+"""
+
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional
+
+
+class ServiceUnit:
+    def __init__(self, name: str, title: str, start: Callable[[], bool],
+                 stop: Optional[Callable[[], None]] = None,
+                 health: Optional[Callable[[], bool]] = None,
+                 deps=(), lazy: bool = False, health_interval: float = 10.0,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self.name = name
+        self.title = title
+        self.start_hook = start
+        self.stop_hook = stop
+        self.health_hook = health
+        self.deps = list(deps)
+        self.lazy = lazy
+        self.health_interval = health_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.state = 'stopped'
+        self.failures = 0
+        self.restarts = 0
+        self.started_at = None
+        self.next_check = 0.0
+        self.next_restart = None
+        self.last_error = None
+
+    def backoff(self) -> float:
+        """Exponential delay before the next restart attempt"""
+        return min(self.backoff_max, self.backoff_base * (2 ** max(0, self.failures - 1)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'title': self.title,
+            'state': self.state,
+            'lazy': self.lazy,
+            'deps': self.deps,
+            'restarts': self.restarts,
+            'failures': self.failures,
+            'uptime': time.time() - self.started_at if self.state == 'running' else 0.0,
+            'last_error': self.last_error
+        }
+
+
+class ServiceManager:
+    def __init__(self, stable_after: float = 30.0):
+        self.units: Dict[str, ServiceUnit] = {}
+        self.stable_after = stable_after
+        self.lock = threading.RLock()
+
+    def register(self, unit: ServiceUnit) -> ServiceUnit:
+        self.units[unit.name] = unit
+        return unit
+
+    def start_order(self, names=None) -> List[str]:
+        """Dependency order for the given units (and everything they need)"""
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Service dependency cycle at '{name}'")
+            if name not in self.units:
+                raise ValueError(f"Unknown service: {name}")
+            visiting.add(name)
+            for dep in self.units[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in names or self.units:
+            visit(name)
+        return order
+
+    def start_all(self) -> bool:
+        """Start every non-lazy unit; lazy units wait for require()"""
+        eager = [name for name, unit in self.units.items() if not unit.lazy]
+        ok = True
+        for name in self.start_order(eager):
+            unit = self.units[name]
+            if unit.lazy:
+                # An eager unit depends on it, so it can't stay lazy
+                print(f"   🛡️ Starting (needed by dependents): {unit.title}")
+            else:
+                print(f"   🛡️ Starting: {unit.title}")
+            ok = self.start_unit(unit) and ok
+        for unit in self.units.values():
+            if unit.lazy and unit.state == 'stopped':
+                print(f"   💤 Deferred until first use: {unit.title}")
+        return ok
+
+    def start_unit(self, unit: ServiceUnit) -> bool:
+        with self.lock:
+            if unit.state == 'running':
+                return True
+            for dep in unit.deps:
+                if self.units[dep].state != 'running':
+                    unit.last_error = f"dependency {dep} not running"
+                    self.schedule_restart(unit)
+                    return False
+
+            unit.state = 'starting'
+            try:
+                ok = bool(unit.start_hook())
+                unit.last_error = None if ok else "start hook returned False"
+            except Exception as e:
+                ok = False
+                unit.last_error = str(e)
+
+            if ok:
+                unit.state = 'running'
+                unit.started_at = time.time()
+                unit.next_check = unit.started_at + unit.health_interval
+                unit.next_restart = None
+            else:
+                self.schedule_restart(unit)
+            return ok
+
+    def stop_unit(self, unit: ServiceUnit):
+        with self.lock:
+            if unit.state not in ('running', 'failed', 'backoff'):
+                return
+            # Dependents go down first
+            for other in self.units.values():
+                if unit.name in other.deps and other.state == 'running':
+                    self.stop_unit(other)
+            if unit.stop_hook and unit.state == 'running':
+                try:
+                    unit.stop_hook()
+                except Exception as e:
+                    print(f"⚠️ Stopping {unit.title} failed: {e}")
+            unit.state = 'stopped'
+            unit.next_restart = None
+
+    def stop_all(self):
+        for name in reversed(self.start_order()):
+            self.stop_unit(self.units[name])
+
+    def require(self, name: str) -> bool:
+        """Start a unit (and its dependencies) on first demand"""
+        unit = self.units[name]
+        if unit.state == 'running':
+            return True
+        with self.lock:
+            for dep_name in self.start_order([name]):
+                dep = self.units[dep_name]
+                if dep.state != 'running' and not self.start_unit(dep):
+                    return False
+        return True
+
+    def schedule_restart(self, unit: ServiceUnit):
+        unit.failures += 1
+        unit.state = 'backoff'
+        unit.next_restart = time.time() + unit.backoff()
+
+    def tick(self):
+        """Run due health checks and restarts; call periodically"""
+        now = time.time()
+        for name in self.start_order():
+            unit = self.units[name]
+
+            if unit.state == 'backoff' and unit.next_restart is not None and now >= unit.next_restart:
+                if self.start_unit(unit):
+                    unit.restarts += 1
+                    print(f"🔁 Restarted service: {unit.title}")
+                continue
+
+            if unit.state != 'running':
+                continue
+
+            if unit.failures and now - unit.started_at >= self.stable_after:
+                unit.failures = 0
+
+            if unit.health_hook is None or now < unit.next_check:
+                continue
+            unit.next_check = now + unit.health_interval
+
+            try:
+                healthy = bool(unit.health_hook())
+            except Exception as e:
+                healthy = False
+                unit.last_error = str(e)
+
+            if not healthy:
+                print(f"⚠️ Service unhealthy: {unit.title}")
+                with self.lock:
+                    dependents = [other for other in self.units.values()
+                                  if name in other.deps and other.state == 'running']
+                    self.stop_unit(unit)
+                    unit.state = 'failed'
+                    self.schedule_restart(unit)
+                    # Bring dependents back once the unit is up again
+                    for other in dependents:
+                        other.state = 'backoff'
+                        other.next_restart = unit.next_restart
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [unit.to_dict() for unit in self.units.values()]
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+AlteronOS Kernel Tracing
+Nested timing spans exported as Chrome/Perfetto trace JSON
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Any
+
+
+class Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=repr(exc))
+        tid = threading.get_ident()
+        if tid not in self.tracer.threads:
+            # Boot pool threads are gone by export time, so remember names now
+            self.tracer.threads[tid] = threading.current_thread().name
+        # list.append is atomic, so recording needs no lock
+        self.tracer.events.append((self.name, self.cat, self.start, end - self.start, tid, self.args))
+        return False
+
+    def set(self, **args):
+        """Attach extra arguments to the span"""
+        self.args = dict(self.args or {}, **args)
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.events = []
+        self.threads = {}
+        self.origin = time.perf_counter_ns()
+
+    def span(self, name: str, cat: str = 'kernel', **args):
+        """Time a block: `with tracer.span("Mounting AOSFS", cat="boot"):`"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, cat, args or None)
+
+    def instant(self, name: str, cat: str = 'kernel', **args):
+        """Record a zero-length marker event"""
+        if self.enabled:
+            self.events.append((name, cat, time.perf_counter_ns(), None, threading.get_ident(), args or None))
+
+    def clear(self):
+        self.events = []
+        self.origin = time.perf_counter_ns()
+
+    def thread_names(self) -> Dict[int, str]:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        names.update(self.threads)
+        return names
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome/Perfetto `traceEvents` document"""
+        pid = os.getpid()
+        names = self.thread_names()
+        trace_events = []
+        seen_threads = set()
+
+        for name, cat, start, duration, tid, args in list(self.events):
+            event = {
+                "name": name,
+                "cat": cat,
+                "ts": (start - self.origin) / 1000.0,
+                "pid": pid,
+                "tid": tid
+            }
+            if duration is None:
+                event.update({"ph": "i", "s": "t"})
+            else:
+                event.update({"ph": "X", "dur": duration / 1000.0})
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            trace_events.append(event)
+            seen_threads.add(tid)
+
+        for tid in seen_threads:
+            trace_events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": names.get(tid, f"thread-{tid}")}
+            })
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Write trace JSON loadable in chrome://tracing or ui.perfetto.dev"""
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate spans by name, slowest total first"""
+        stats = {}
+        for name, cat, start, duration, tid, args in list(self.events):
+            if duration is None:
+                continue
+            entry = stats.setdefault(name, {"name": name, "cat": cat, "count": 0,
+                                            "total_ms": 0.0, "max_ms": 0.0})
+            ms = duration / 1e6
+            entry["count"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+
+        rows = sorted(stats.values(), key=lambda row: row["total_ms"], reverse=True)
+        for row in rows:
+            row["mean_ms"] = row["total_ms"] / row["count"]
+        return rows
+
+    def format_summary(self) -> str:
+        """Render the summary as a text table"""
+        lines = [f"{'Span':<42} {'Cat':<8} {'Count':>5} {'Total ms':>10} {'Mean ms':>9} {'Max ms':>9}",
+                 "-" * 88]
+        for row in self.summary():
+            lines.append(f"{row['name'][:42]:<42} {row['cat'][:8]:<8} {row['count']:>5} "
+                         f"{row['total_ms']:>10.2f} {row['mean_ms']:>9.2f} {row['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+
+# Shared disabled tracer: span() returns NULL_SPAN without allocating
+NULL_TRACER = Tracer(enabled=False)
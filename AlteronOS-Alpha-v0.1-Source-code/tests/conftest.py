@@ -0,0 +1,8 @@
+"""Modules are imported by bare name, as the kernel does, from their own directories"""
+
+import sys
+from pathlib import Path
+
+SOURCE = Path(__file__).resolve().parent.parent
+for directory in ('compatibility-cross', 'kernel'):
+    sys.path.insert(0, str(SOURCE / directory))
@@ -0,0 +1,197 @@
+"""DebInstaller against hand-built packages: layout, traversal, symlinks and conflicts"""
+
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+
+import pytest
+
+import deb_package
+from deb_package import DebError, DebInstaller
+
+needs_zstd = pytest.mark.skipif(shutil.which('zstd') is None, reason="no zstd command")
+zst = pytest.param('zst', marks=pytest.mark.skipif(
+    importlib.util.find_spec('zstandard') is None and shutil.which('zstd') is None, reason="no zstd support"))
+
+
+def zstd_compress(data: bytes) -> bytes:
+    if importlib.util.find_spec('zstandard') is not None:
+        import zstandard
+        return zstandard.ZstdCompressor().compress(data)
+    return subprocess.run(['zstd', '-cq'], input=data, stdout=subprocess.PIPE, check=True).stdout
+
+
+def tar_bytes(entries, compression='gz') -> bytes:
+    """entries: (name, kind, payload) with kind 'file', 'dir', 'sym' or 'hard'"""
+    if compression == 'zst':
+        return zstd_compress(tar_bytes(entries, ''))
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=f'w:{compression}') as tar:
+        for name, kind, payload in entries:
+            info = tarfile.TarInfo(name)
+            info.mtime = 1700000000
+            if kind == 'file':
+                data = payload.encode() if isinstance(payload, str) else payload
+                info.size, info.mode = len(data), 0o755
+                tar.addfile(info, io.BytesIO(data))
+                continue
+            if kind == 'dir':
+                info.type, info.mode = tarfile.DIRTYPE, 0o755
+            elif kind == 'sym':
+                info.type, info.linkname = tarfile.SYMTYPE, payload
+            elif kind == 'hard':
+                info.type, info.linkname = tarfile.LNKTYPE, payload
+            tar.addfile(info)
+    return buffer.getvalue()
+
+
+def build_deb(path, entries, package='demo', compression='gz'):
+    control = f"Package: {package}\nVersion: 1.0-1\nArchitecture: all\nDescription: test\n"
+    members = [
+        ('debian-binary', b'2.0\n'),
+        ('control.tar.gz', tar_bytes([('./control', 'file', control)])),
+        (f'data.tar.{compression}', tar_bytes(entries, compression))
+    ]
+    with open(path, 'wb') as f:
+        f.write(b'!<arch>\n')
+        for name, data in members:
+            f.write(f"{name + '/':<16}{0:<12}{0:<6}{0:<6}{'100644':<8}{len(data):<10}`\n".encode())
+            f.write(data + (b'\n' if len(data) & 1 else b''))
+    return str(path)
+
+
+@pytest.fixture
+def installer(tmp_path):
+    return DebInstaller(root=tmp_path / 'root', db_dir=tmp_path / 'db')
+
+
+@pytest.mark.parametrize('compression', ['gz', 'xz', 'bz2', zst])
+def test_install_layout_and_manifest(tmp_path, installer, compression):
+    deb = build_deb(tmp_path / 'demo.deb', [
+        ('./usr/', 'dir', None),
+        ('./usr/bin/', 'dir', None),
+        ('./usr/bin/demo', 'file', '#!/bin/sh\necho hi\n'),
+        ('./usr/bin/demo-hard', 'hard', './usr/bin/demo'),
+        ('./usr/bin/demo-link', 'sym', 'demo'),
+        ('./etc/demo.conf', 'file', 'x=1\n'),
+    ], compression=compression)
+    result = installer.install(deb)
+
+    root = tmp_path / 'root'
+    assert (root / 'bin' / 'demo').read_text() == '#!/bin/sh\necho hi\n'
+    assert os.stat(root / 'bin' / 'demo').st_mode & 0o777 == 0o755
+    assert os.stat(root / 'bin' / 'demo').st_mtime == 1700000000
+    assert os.path.samefile(root / 'bin' / 'demo', root / 'bin' / 'demo-hard')
+    assert os.readlink(root / 'bin' / 'demo-link') == 'demo'
+    assert (root / 'etc' / 'demo.conf').read_text() == 'x=1\n'
+    assert not [name for name in os.listdir(root / 'bin') if '.alteron-' in name]
+
+    manifest = json.loads((tmp_path / 'db' / 'demo.json').read_text())
+    assert manifest['package'] == result['package'] == 'demo'
+    assert manifest['version'] == '1.0-1'
+    assert str(root / 'bin' / 'demo') in manifest['files']
+    assert manifest['skipped'] == manifest['conflicts'] == []
+
+
+def test_reinstall_replaces_files(tmp_path, installer):
+    installer.install(build_deb(tmp_path / 'a.deb', [('./usr/bin/demo', 'file', 'old')]))
+    installer.install(build_deb(tmp_path / 'b.deb', [('./usr/bin/demo', 'file', 'new')]))
+    assert (tmp_path / 'root' / 'bin' / 'demo').read_text() == 'new'
+
+
+@pytest.mark.parametrize('name', ['../../escaped', './usr/../../escaped', 'usr/lib/../../../escaped'])
+def test_traversal_entries_are_skipped(tmp_path, installer, name):
+    result = installer.install(build_deb(tmp_path / 'demo.deb', [(name, 'file', 'x'), ('./usr/ok', 'file', 'ok')]))
+    assert result['skipped'] == [name]
+    assert (tmp_path / 'root' / 'ok').read_text() == 'ok'
+    assert not list(tmp_path.rglob('escaped'))
+
+
+@pytest.mark.parametrize('package', ['../../../escaped', 'a/b', 'Demo', 'x', '-demo', ''])
+def test_invalid_package_name_is_rejected(tmp_path, installer, package):
+    deb = build_deb(tmp_path / 'demo.deb', [('./usr/ok', 'file', 'ok')], package=package)
+    with pytest.raises(DebError):
+        installer.install(deb)
+    assert not (tmp_path / 'root' / 'ok').exists()
+    assert not list(tmp_path.rglob('escaped*'))
+
+
+def test_symlink_from_same_package_is_not_followed(tmp_path, installer):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    result = installer.install(build_deb(tmp_path / 'demo.deb', [
+        ('./usr/lib', 'sym', str(outside)),
+        ('./usr/lib/pwn', 'file', 'x'),
+        ('./usr/lib/sub/pwn', 'file', 'x'),
+    ]))
+    assert result['skipped'] == ['./usr/lib/pwn', './usr/lib/sub/pwn']
+    assert os.listdir(outside) == []
+
+
+def test_symlink_from_earlier_package_is_not_followed(tmp_path, installer):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    installer.install(build_deb(tmp_path / 'a.deb', [('./usr/lib', 'sym', str(outside))], package='pkg-a'))
+    result = installer.install(build_deb(tmp_path / 'b.deb', [
+        ('./usr/lib/', 'dir', None),
+        ('./usr/lib/pwn', 'file', 'x'),
+        ('./usr/lib/deeper/pwn', 'file', 'x'),
+    ], package='pkg-b'))
+    assert './usr/lib/pwn' in result['skipped'] and './usr/lib/deeper/pwn' in result['skipped']
+    assert result['conflicts'] == ['./usr/lib']
+    assert os.listdir(outside) == []
+
+
+def test_conflicts_are_reported_not_fatal(tmp_path, installer):
+    root = tmp_path / 'root'
+    (root / 'share' / 'doc').mkdir(parents=True)
+    (root / 'bin').mkdir()
+    (root / 'bin' / 'tool').write_text('existing file')
+    result = installer.install(build_deb(tmp_path / 'demo.deb', [
+        ('./usr/share', 'sym', '/tmp'),
+        ('./usr/share/doc', 'file', 'over a directory'),
+        ('./usr/bin/tool/', 'dir', None),
+        ('./usr/bin/after', 'file', 'still installed'),
+    ]))
+    assert result['conflicts'] == ['./usr/share', './usr/share/doc', './usr/bin/tool']
+    assert (root / 'share' / 'doc').is_dir() and not (root / 'share').is_symlink()
+    assert (root / 'bin' / 'tool').read_text() == 'existing file'
+    assert (root / 'bin' / 'after').read_text() == 'still installed'
+    assert json.loads((tmp_path / 'db' / 'demo.json').read_text())['conflicts'] == result['conflicts']
+
+
+def test_corrupt_data_records_partial_manifest(tmp_path, installer):
+    deb = build_deb(tmp_path / 'demo.deb', [('./usr/bin/demo', 'file', os.urandom(1 << 20))])
+    data = open(deb, 'rb').read()
+    with open(deb, 'wb') as f:
+        f.write(data[:len(data) // 2] + b'\0' * (len(data) - len(data) // 2))
+    with pytest.raises(DebError):
+        installer.install(deb)
+    manifest = json.loads((tmp_path / 'db' / 'demo.json').read_text())
+    assert manifest['error'] and manifest['files'] == []
+
+
+@needs_zstd
+def test_zst_without_module_uses_zstd_command(tmp_path, installer, monkeypatch):
+    monkeypatch.setattr(deb_package, 'zstandard', None)
+    payload = os.urandom(3 << 20)  # several pipe buffers, in both directions
+    installer.install(build_deb(tmp_path / 'demo.deb', [('./usr/bin/demo', 'file', payload)], compression='zst'))
+    assert (tmp_path / 'root' / 'bin' / 'demo').read_bytes() == payload
+
+    deb = build_deb(tmp_path / 'bad.deb', [('./usr/bin/bad', 'file', payload)], package='bad', compression='zst')
+    data = open(deb, 'rb').read()
+    with open(deb, 'wb') as f:
+        f.write(data[:len(data) // 2] + b'\0' * (len(data) - len(data) // 2))
+    with pytest.raises(DebError):
+        installer.install(deb)
+
+
+def test_not_a_deb(tmp_path, installer):
+    path = tmp_path / 'junk.deb'
+    path.write_bytes(b'not an archive')
+    with pytest.raises(DebError):
+        installer.install(str(path))
@@ -0,0 +1,89 @@
+"""WineServerManager.acquire against stand-in wine/wineserver scripts"""
+
+import threading
+from collections import deque
+
+import pytest
+
+from wine_server import WineServerManager
+
+FAKE_WINE = """#!/bin/sh
+case "$1" in
+    --version) echo wine-9.0-fake ;;
+    wineboot) mkdir -p "$WINEPREFIX/drive_c" && echo reg > "$WINEPREFIX/system.reg" ;;
+esac
+"""
+
+# -f serves in the foreground until -k, unless the prefix already has a server
+FAKE_WINESERVER = """#!/bin/sh
+case "$1" in
+    -f) kill -0 "$(cat "$WINEPREFIX/.fake-server" 2>/dev/null)" 2>/dev/null && exit 0
+        echo $$ > "$WINEPREFIX/.fake-server"; exec sleep 60 ;;
+    -k) kill "$(cat "$WINEPREFIX/.fake-server")" 2>/dev/null ;;
+esac
+exit 0
+"""
+
+
+@pytest.fixture
+def fake_wine(tmp_path):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    for name, script in (('wine', FAKE_WINE), ('wineserver', FAKE_WINESERVER)):
+        (bin_dir / name).write_text(script)
+        (bin_dir / name).chmod(0o755)
+    return str(bin_dir / 'wine'), str(bin_dir / 'wineserver')
+
+
+@pytest.fixture
+def managers(tmp_path, fake_wine):
+    created = []
+
+    def make():
+        wine, wineserver = fake_wine
+        # No pool refills or template: spares are added by hand so the counts are exact
+        manager = WineServerManager(wine, wineserver, base_dir=tmp_path / 'wine', pool_size=0, template=False)
+        created.append(manager)
+        return manager
+
+    yield make
+    for manager in created:
+        manager.shutdown()
+
+
+def test_concurrent_acquire_spends_one_spare(managers):
+    manager = managers()
+    spares = [manager.boot_spare() for _ in range(2)]
+    manager.pool.extend(spares)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.acquire('app'))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results[0] is results[1]
+    assert results[0].prefix == manager.base_dir / 'prefixes' / 'app'
+    assert list(manager.pool) == [spare for spare in spares if spare is not results[0]]
+    assert all(spare.alive() for spare in spares)
+
+
+def test_acquire_losing_rename_to_another_process_keeps_its_spare(managers):
+    winner, loser = managers(), managers()
+    winner.pool.append(winner.boot_spare())
+    spare = loser.boot_spare()
+
+    class RacingPool(deque):
+        def popleft(self):
+            # The other process renames its spare into place after our exists() check
+            winner.acquire('app')
+            return super().popleft()
+
+    loser.pool = RacingPool([spare])
+    server = loser.acquire('app')
+
+    target = loser.base_dir / 'prefixes' / 'app'
+    assert server.prefix == target and server is not spare
+    assert list(loser.pool) == [spare]
+    assert spare.prefix.exists() and spare.alive()
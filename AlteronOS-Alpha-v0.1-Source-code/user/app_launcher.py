@@ -1,18 +1,45 @@
 #!/usr/bin/env python3
 import tkinter as tk
-from compatibility import UniversalCompatibility
+from tkinter import filedialog
+
+try:
+    from ipc_bus import connect_kernel
+except ImportError:
+    connect_kernel = None
 
 class UniversalAppLauncher:
     def __init__(self, parent):
         self.window = tk.Toplevel(parent)
         self.window.title("App Launcher")
         self.window.geometry("500x400")
-        self.compat = UniversalCompatibility()
+        self.compat = self.connect_compat()
         self.setup_launcher()
         
+    def connect_compat(self):
+        """Share the running kernel's compat layer, else start a local one"""
+        kernel = connect_kernel() if connect_kernel else None
+        if kernel:
+            return kernel
+        from universal_compat import RealUniversalCompatibility
+        return RealUniversalCompatibility()
+        
     def setup_launcher(self):
         tk.Label(self.window, text="Supported formats: .exe, .deb, .dmg, .txt").pack()
         tk.Button(self.window, text="Launch App", command=self.launch_app).pack()
+        tk.Button(self.window, text="Scan Folder", command=self.scan_folder).pack()
+        self.app_list = tk.Listbox(self.window)
+        self.app_list.pack(fill=tk.BOTH, expand=True)
+        
+    def scan_folder(self):
+        """List the runnable apps in a folder, grouped by platform"""
+        folder = filedialog.askdirectory(parent=self.window)
+        if not folder:
+            return
+        results = self.compat.classify_many([folder], recursive=True)
+        self.app_list.delete(0, tk.END)
+        for path, platform in sorted(results.items(), key=lambda item: (item[1], item[0])):
+            if platform != 'unknown':
+                self.app_list.insert(tk.END, f"[{platform}] {path}")
         
     def launch_app(self):
         print("Launching app...")
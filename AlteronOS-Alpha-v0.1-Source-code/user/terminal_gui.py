@@ -2,18 +2,31 @@
 import tkinter as tk
 from terminals import TerminalManager
 
+try:
+    from ipc_bus import connect_kernel
+except ImportError:
+    connect_kernel = None
+
 class MultiTerminalGUI:
     def __init__(self):
         self.window = tk.Tk()
         self.window.title("AlteronOS Multi-Terminal")
         self.window.geometry("800x600")
-        self.terminal_mgr = TerminalManager()
+        
+        # Use the kernel's terminals when it is running
+        self.kernel = connect_kernel() if connect_kernel else None
+        if self.kernel:
+            self.terminal_names = self.kernel.terminal_names()
+        else:
+            self.terminal_mgr = TerminalManager()
+            self.terminal_names = list(self.terminal_mgr.terminals.keys())
+            
         self.setup_gui()
         
     def setup_gui(self):
         # Terminal selection
         self.terminal_var = tk.StringVar()
-        terminal_combo = tk.OptionMenu(self.window, self.terminal_var, *self.terminal_mgr.terminals.keys())
+        terminal_combo = tk.OptionMenu(self.window, self.terminal_var, *self.terminal_names)
         terminal_combo.pack()
         
         # Terminal output